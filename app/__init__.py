@@ -3,7 +3,7 @@ from flask import Flask
 from flask_migrate import Migrate
 from flask_cors import CORS
 from config import Config
-from .models import db
+from .models import db, apply_sqlite_pragmas
 
 migrate = Migrate()
 
@@ -22,6 +22,11 @@ def create_app(config_class=Config):
    db.init_app(app)
    migrate.init_app(app, db)
 
+   # SQLite: 연결마다 WAL / busy_timeout 등 적용 (config.sqlite_pragmas)
+   if app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+       with app.app_context():
+           apply_sqlite_pragmas(db.engine, app.config.get('SQLITE_PRAGMAS', {}))
+
    # 인증 블루프린트 등록
    from .auth.routes import auth_bp
    app.register_blueprint(auth_bp, url_prefix='/auth')
@@ -34,6 +39,10 @@ def create_app(config_class=Config):
    from .notification.routes import notification_bp
    app.register_blueprint(notification_bp, url_prefix='/notification')
 
+   # Prometheus 지표 (/metrics)
+   from .metrics import metrics_bp
+   app.register_blueprint(metrics_bp)
+
    @app.route("/")
    def index():
        return "코드 변경 테스트 성공!"
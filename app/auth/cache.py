@@ -0,0 +1,118 @@
+# app/auth/cache.py
+# 인증 캐시 - 검증된 토큰 -> 사용자(id, email)를 프로세스 메모리에 보관
+#
+# 대시보드 폴링마다 JWT 디코드 + User 조회를 반복하지 않도록, 같은 토큰은 AUTH_CACHE_TTL 동안
+# (토큰 만료가 더 빠르면 그때까지) 검증 없이 통과시킨다. 사용자가 수정/삭제되면 커밋 시점에
+# 그 사용자의 항목을 모두 지운다. 캐시는 워커 프로세스별이므로 다른 워커의 변경은 TTL 안에 반영된다.
+
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from app.models import User
+
+AUTH_CACHE_TTL = float(os.environ.get('AUTH_CACHE_TTL', 300))
+AUTH_CACHE_SIZE = int(os.environ.get('AUTH_CACHE_SIZE', 2048))
+
+_PENDING_KEY = 'auth_cache_invalidate'
+
+
+class AuthUser(namedtuple('AuthUser', 'id email')):
+    """라우트에 넘기는 인증 사용자 - DB 세션과 무관한 불변 값"""
+    __slots__ = ()
+
+
+class TokenCache:
+    """토큰별 인증 결과 TTL/LRU 캐시 (스레드 안전)
+
+    generation: 사용자별 변경 횟수. 조회 전에 읽은 값과 저장 시점 값이 다르면
+    (조회 도중 사용자가 바뀌었으면) 저장하지 않는다.
+    """
+
+    def __init__(self, ttl=AUTH_CACHE_TTL, maxsize=AUTH_CACHE_SIZE, clock=time.monotonic, wall=time.time):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.clock = clock
+        self.wall = wall
+        self._entries = OrderedDict()  # token -> (AuthUser, 만료 시각(clock 기준))
+        self._generations = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token):
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            user, expires_at = entry
+            if self.clock() >= expires_at:
+                del self._entries[token]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return user
+
+    def generation(self, user_id):
+        with self._lock:
+            return self._generations.get(user_id, 0)
+
+    def put(self, token, user, exp=None, generation=None):
+        """exp: JWT exp (epoch 초) - 남은 유효 시간이 TTL보다 짧으면 그만큼만 보관"""
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return
+        ttl = self.ttl
+        if exp is not None:
+            ttl = min(ttl, float(exp) - self.wall())
+            if ttl <= 0:
+                return
+        with self._lock:
+            if generation is not None and self._generations.get(user.id, 0) != generation:
+                return
+            self._entries[token] = (user, self.clock() + ttl)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id):
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            stale = [token for token, (user, _) in self._entries.items() if user.id == user_id]
+            for token in stale:
+                del self._entries[token]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'size': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+token_cache = TokenCache()
+
+
+# --- 사용자 변경 시 무효화 (커밋된 뒤에만 반영) ---
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _mark_user_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None and target.id is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(target.id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed(session):
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        token_cache.invalidate_user(user_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,134 @@
+# app/auth/google_certs.py
+# 구글 ID 토큰 검증용 서명 인증서 캐시
+#
+# id_token.verify_oauth2_token 은 로그인마다 구글 인증서를 새로 받아온다. 여기서는 인증서를
+# 응답의 Cache-Control max-age 동안 메모리에 두고, 만료 전에 백그라운드에서 미리 갱신한다.
+# 갱신이 실패해도(구글/네트워크 장애) GOOGLE_CERTS_MAX_STALE 동안은 기존 인증서로 계속 검증한다.
+# 토큰의 kid 가 캐시에 없으면(키 교체 직후) 바로 다시 받아온다 (MIN_REFRESH_INTERVAL 간격 제한).
+
+import os
+import re
+import threading
+import time
+import requests
+from google.auth import jwt as google_jwt
+
+GOOGLE_CERTS_URL = os.environ.get('GOOGLE_CERTS_URL', 'https://www.googleapis.com/oauth2/v1/certs')
+GOOGLE_ISSUERS = ('accounts.google.com', 'https://accounts.google.com')
+# max-age 가 없을 때 보관 시간 (초)
+DEFAULT_MAX_AGE = 3600
+# 만료까지 이 비율만큼 남으면 백그라운드 갱신 시작
+REFRESH_AHEAD = 0.2
+# 만료 후에도 갱신 실패 시 기존 인증서를 쓰는 최대 시간 (초)
+MAX_STALE = float(os.environ.get('GOOGLE_CERTS_MAX_STALE', 86400))
+# 모르는 kid 로 인한 강제 갱신 최소 간격 (초)
+MIN_REFRESH_INTERVAL = 30
+FETCH_TIMEOUT = 5
+CLOCK_SKEW_SECONDS = 10
+
+_MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+
+
+def parse_max_age(cache_control, default=DEFAULT_MAX_AGE):
+    match = _MAX_AGE_RE.search(cache_control or '')
+    return int(match.group(1)) if match else default
+
+
+class GoogleCertStore:
+    """구글 인증서 {kid: x509 PEM} 캐시 - session 은 연결을 재사용하는 requests.Session"""
+
+    def __init__(self, url=GOOGLE_CERTS_URL, session=None, clock=time.time, max_stale=MAX_STALE,
+                 background=True):
+        self.url = url
+        self.session = session or requests.Session()
+        self.clock = clock
+        self.max_stale = max_stale
+        self.background = background
+        self._certs = {}
+        self._fetched_at = 0.0
+        self._expires_at = 0.0
+        self._last_attempt = 0.0
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._refreshing = False
+
+    def _fetch(self):
+        resp = self.session.get(self.url, timeout=FETCH_TIMEOUT)
+        resp.raise_for_status()
+        certs = resp.json()
+        if not isinstance(certs, dict) or not certs or 'keys' in certs:
+            raise ValueError('인증서 응답 형식이 올바르지 않습니다 ({kid: x509 PEM} 형식만 지원)')
+        return certs, parse_max_age(resp.headers.get('Cache-Control'))
+
+    def refresh(self, if_older_than=None):
+        """인증서 다시 받기 - 실패하면 기존 인증서 유지하고 False
+
+        if_older_than: 그 사이 다른 스레드가 이미 받아왔으면 건너뜀
+        """
+        with self._fetch_lock:
+            if if_older_than is not None and self._fetched_at > if_older_than:
+                return True
+            self._last_attempt = self.clock()
+            try:
+                certs, max_age = self._fetch()
+            except Exception as e:
+                print(f"[구글 인증서] 갱신 실패 (기존 인증서 {len(self._certs)}개 유지): {e}")
+                return False
+            now = self.clock()
+            with self._lock:
+                self._certs = certs
+                self._fetched_at = now
+                self._expires_at = now + max_age
+            return True
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def _run():
+            try:
+                self.refresh()
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=_run, daemon=True, name='google-certs').start()
+
+    def certs(self, kid=None):
+        """검증에 쓸 인증서 - 필요하면 갱신 (만료 전 백그라운드 / 만료·모르는 kid 는 즉시)"""
+        now = self.clock()
+        with self._lock:
+            certs, fetched_at, expires_at = self._certs, self._fetched_at, self._expires_at
+        if not certs or now >= expires_at:
+            # 만료됨 - 바로 받아오되, 실패하면 MAX_STALE 안에서는 기존 인증서 사용
+            usable = certs and now < expires_at + self.max_stale
+            if not usable or now - self._last_attempt >= MIN_REFRESH_INTERVAL:
+                self.refresh(if_older_than=fetched_at)
+            with self._lock:
+                certs, expires_at = self._certs, self._expires_at
+            if not certs or now >= expires_at + self.max_stale:
+                raise ValueError('구글 인증서를 가져올 수 없습니다.')
+        elif now >= expires_at - (expires_at - fetched_at) * REFRESH_AHEAD:
+            if self.background:
+                self._refresh_in_background()
+            else:
+                self.refresh(if_older_than=fetched_at)
+        if kid and kid not in certs and now - self._last_attempt >= MIN_REFRESH_INTERVAL:
+            if self.refresh(if_older_than=fetched_at):
+                with self._lock:
+                    certs = self._certs
+        return certs
+
+    def verify(self, token, audience=None):
+        """구글 ID 토큰 검증 - verify_oauth2_token 과 같은 검사, 실패 시 ValueError"""
+        header = google_jwt.decode_header(token)
+        idinfo = google_jwt.decode(token, certs=self.certs(header.get('kid')), audience=audience,
+                                   clock_skew_in_seconds=CLOCK_SKEW_SECONDS)
+        if idinfo.get('iss') not in GOOGLE_ISSUERS:
+            raise ValueError(f"Wrong issuer: {idinfo.get('iss')}")
+        return idinfo
+
+
+google_certs = GoogleCertStore()
@@ -7,9 +7,9 @@ import jwt
 from datetime import datetime, timedelta
 from functools import wraps
 from app.utils import json_response
+from .cache import token_cache, AuthUser
+from .google_certs import google_certs
 import os
-from google.oauth2 import id_token
-from google.auth.transport import requests
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -21,11 +21,19 @@ def token_required(f):
             token = request.headers['Authorization'].split(" ")[1]
         if not token:
             return json_response({'message': 'Token is missing!'}, status=401)
-        try:
-            data = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=["HS256"])
-            current_user = User.query.filter_by(id=data['user_id']).first()
-        except:
-            return json_response({'message': 'Token is invalid!'}, status=401)
+        # 최근 검증한 토큰이면 디코드/DB 조회 생략
+        current_user = token_cache.get(token)
+        if current_user is None:
+            try:
+                data = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=["HS256"])
+                generation = token_cache.generation(data['user_id'])
+                user = User.query.filter_by(id=data['user_id']).first()
+            except:
+                return json_response({'message': 'Token is invalid!'}, status=401)
+            if not user:
+                return json_response({'message': 'Token is invalid!'}, status=401)
+            current_user = AuthUser(user.id, user.email)
+            token_cache.put(token, current_user, data.get('exp'), generation)
         return f(current_user, *args, **kwargs)
     return decorated
 
@@ -68,12 +76,8 @@ def google_login():
         data = request.get_json()
         token = data.get('credential')  # Google에서 받은 ID 토큰
         
-        # Google ID 토큰 검증
-        idinfo = id_token.verify_oauth2_token(
-            token, 
-            requests.Request(), 
-            os.getenv('GOOGLE_CLIENT_ID')
-        )
+        # Google ID 토큰 검증 (캐시된 인증서로 로컬 검증)
+        idinfo = google_certs.verify(token, os.getenv('GOOGLE_CLIENT_ID'))
         
         # 사용자 정보 추출
         email = idinfo['email']
@@ -0,0 +1,179 @@
+# app/keyword/botwall.py
+# 네이버 봇 차단 감지 + 적응형 서킷 브레이커
+
+import os
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+# 응답 분류
+NORMAL = 'normal'    # 정상 SERP (검색결과 없음 포함)
+CAPTCHA = 'captcha'  # 자동입력 방지 / 비정상 접근 안내
+EMPTY = 'empty'      # SERP 없이 빈 페이지 (차단 시 흔함)
+ERROR = 'error'      # 오류 페이지 / 로딩 타임아웃
+LOADING = 'loading'  # 아직 판단 불가
+
+BLOCKED_KINDS = (CAPTCHA, EMPTY, ERROR)
+
+# 호스트+경로에만 적용 (검색어 ?query= 에 들어간 단어로 오판하지 않도록)
+CAPTCHA_URL_MARKERS = ('captcha', 'nid.naver.com/login', 'sorry')
+CAPTCHA_TEXT_MARKERS = (
+    '자동입력 방지', '보안 절차', '비정상적인 접근', '비정상적인 검색', '정상적인 이용',
+    'captcha', '로봇이 아닙니다'
+)
+ERROR_TEXT_MARKERS = (
+    '일시적인 오류', '서비스 접속이 원활하지 않습니다', '페이지를 찾을 수 없습니다',
+    '잠시 후 다시', '502 Bad Gateway', '503 Service', '429 Too Many'
+)
+# 본문이 이 길이보다 짧고 SERP도 없으면 빈 페이지로 판단
+EMPTY_TEXT_LENGTH = 30
+
+
+def classify_serp(url, text, has_main_pack, loaded=True):
+    """페이지 URL/본문/SERP 존재 여부로 응답 분류
+
+    본문 문구는 SERP 가 없을 때만 본다 - 정상 SERP 의 스니펫에 '보안 절차' 같은 문구가 있을 수 있음
+    """
+    parts = urlsplit((url or '').lower())
+    location = parts.netloc + parts.path
+    if any(m in location for m in CAPTCHA_URL_MARKERS):
+        return CAPTCHA
+    if has_main_pack:
+        return NORMAL
+    text = text or ''
+    lowered = text.lower()
+    if any(m.lower() in lowered for m in CAPTCHA_TEXT_MARKERS):
+        return CAPTCHA
+    if any(m.lower() in lowered for m in ERROR_TEXT_MARKERS):
+        return ERROR
+    if loaded and len(text.strip()) < EMPTY_TEXT_LENGTH:
+        return EMPTY
+    return LOADING if not loaded else ERROR
+
+
+# --- 서킷 브레이커 ---
+WINDOW = int(os.environ.get('BOTWALL_WINDOW', 20))
+SLOW_THRESHOLD = float(os.environ.get('BOTWALL_SLOW_THRESHOLD', 0.2))
+OPEN_THRESHOLD = float(os.environ.get('BOTWALL_OPEN_THRESHOLD', 0.5))
+CONSECUTIVE_OPEN = int(os.environ.get('BOTWALL_CONSECUTIVE_OPEN', 3))
+SLOW_MULTIPLIER = float(os.environ.get('BOTWALL_SLOW_MULTIPLIER', 3.0))
+COOLDOWN_SECONDS = float(os.environ.get('BOTWALL_COOLDOWN_SECONDS', 300))
+MAX_COOLDOWN_SECONDS = float(os.environ.get('BOTWALL_MAX_COOLDOWN_SECONDS', 3600))
+# 차단률 계산에 필요한 최소 표본 수
+MIN_SAMPLES = 5
+
+CLOSED = 'closed'        # 정상 속도
+THROTTLED = 'throttled'  # 차단률 상승 - 딜레이 늘림
+OPEN = 'open'            # 차단 - 쿨다운 동안 체크 중지
+HALF_OPEN = 'half_open'  # 쿨다운 후 탐색 체크 1건만 허용
+
+
+class CircuitBreaker:
+    """최근 응답의 차단률로 체크 속도를 조절
+
+    - 차단률 >= SLOW_THRESHOLD: 딜레이 SLOW_MULTIPLIER 배
+    - 차단률 >= OPEN_THRESHOLD 또는 연속 차단 CONSECUTIVE_OPEN회: 쿨다운 동안 중지
+    - 쿨다운 후 탐색 체크 1건 - 정상이면 복구, 또 차단이면 쿨다운 2배 (최대 MAX_COOLDOWN_SECONDS)
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._window = deque(maxlen=WINDOW)
+        self._consecutive = 0
+        self._state = CLOSED
+        self._cooldown = COOLDOWN_SECONDS
+        self._open_until = 0.0
+        self._probing = False
+        self.trips = 0
+
+    def _block_rate(self):
+        if len(self._window) < MIN_SAMPLES:
+            return 0.0
+        return sum(self._window) / len(self._window)
+
+    def _trip(self):
+        self._state = OPEN
+        self._open_until = self._clock() + self._cooldown
+        self._probing = False
+        self.trips += 1
+        print(f"[차단 감지] 서킷 OPEN - {self._cooldown:.0f}초 동안 체크 중지 (차단률 {self._block_rate():.0%})")
+
+    def wait_time(self):
+        """다음 체크까지 기다려야 할 시간 (초) - 0 이면 바로 체크 가능"""
+        with self._lock:
+            if self._state == OPEN:
+                remaining = self._open_until - self._clock()
+                if remaining > 0:
+                    return remaining
+                self._state = HALF_OPEN
+                print("[차단 감지] 서킷 HALF_OPEN - 탐색 체크 시도")
+            if self._state == HALF_OPEN and self._probing:
+                return 1.0
+            return 0.0
+
+    def allow(self):
+        """지금 체크해도 되는지 - HALF_OPEN 에서는 탐색 1건만 허용"""
+        if self.wait_time() > 0:
+            return False
+        with self._lock:
+            if self._state == HALF_OPEN:
+                if self._probing:
+                    return False
+                self._probing = True
+            return True
+
+    def record(self, kind):
+        """체크 결과 반영"""
+        blocked = kind in BLOCKED_KINDS
+        with self._lock:
+            self._window.append(1 if blocked else 0)
+            self._consecutive = self._consecutive + 1 if blocked else 0
+
+            if self._state == HALF_OPEN:
+                self._probing = False
+                if blocked:
+                    self._cooldown = min(self._cooldown * 2, MAX_COOLDOWN_SECONDS)
+                    self._trip()
+                else:
+                    self._state = CLOSED
+                    self._cooldown = COOLDOWN_SECONDS
+                    self._window.clear()
+                    print("[차단 감지] 서킷 CLOSED - 정상 응답으로 복구")
+                return
+
+            if self._state == OPEN:
+                return
+
+            rate = self._block_rate()
+            if self._consecutive >= CONSECUTIVE_OPEN or rate >= OPEN_THRESHOLD:
+                self._trip()
+            elif rate >= SLOW_THRESHOLD:
+                if self._state != THROTTLED:
+                    print(f"[차단 감지] 차단률 {rate:.0%} - 체크 속도 낮춤")
+                self._state = THROTTLED
+            else:
+                self._state = CLOSED
+
+    def delay_multiplier(self):
+        """작업 간 딜레이 배수"""
+        return SLOW_MULTIPLIER if self._state == THROTTLED else 1.0
+
+    def snapshot(self):
+        """상태 조회용 dict"""
+        with self._lock:
+            return {
+                'state': self._state,
+                'block_rate': round(self._block_rate(), 3),
+                'samples': len(self._window),
+                'consecutive_blocks': self._consecutive,
+                'cooldown_seconds': self._cooldown,
+                'open_remaining_seconds': max(round(self._open_until - self._clock(), 1), 0)
+                if self._state == OPEN else 0,
+                'trips': self.trips
+            }
+
+
+# 프로세스 공용 브레이커 (스크래핑 경로 전체가 같은 출구 IP를 공유)
+breaker = CircuitBreaker()
@@ -0,0 +1,185 @@
+# app/keyword/egress.py
+# 스크래핑 출구(프록시) 풀 - 출구별 토큰 버킷 속도 제한, 건강도 점수, 자동 격리
+
+import os
+import threading
+import time
+import requests
+from app.metrics import SERP_RESPONSES
+from .botwall import CircuitBreaker, BLOCKED_KINDS, NORMAL, ERROR, OPEN, HALF_OPEN, breaker as direct_breaker
+
+# 쉼표 구분 프록시 목록, 'direct' 는 프록시 없이 직접 연결
+# 예) SCRAPER_PROXIES=direct,http://10.0.0.2:3128,http://10.0.0.3:3128
+# Chrome --proxy-server 는 인증을 지원하지 않으므로 IP 허용 방식 프록시를 사용
+PROXIES_ENV = 'SCRAPER_PROXIES'
+RATE_PER_MINUTE = float(os.environ.get('SCRAPER_EGRESS_RATE_PER_MINUTE', 6))
+BURST = float(os.environ.get('SCRAPER_EGRESS_BURST', 2))
+# 건강도 = 정상 응답 비율의 EWMA (1.0 = 모두 정상)
+HEALTH_ALPHA = 0.2
+ACQUIRE_TIMEOUT = float(os.environ.get('SCRAPER_EGRESS_ACQUIRE_TIMEOUT', 120))
+HTTP_TIMEOUT = 10
+
+
+class TokenBucket:
+    """분당 rate 개, 최대 burst 개까지 쌓이는 토큰 버킷"""
+
+    def __init__(self, rate_per_minute, burst, clock=time.monotonic):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(burst, 1.0)
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, cost=1.0):
+        """토큰 cost 개가 생길 때까지 남은 시간 (초)"""
+        self._refill()
+        if self.tokens >= cost or self.rate <= 0:
+            return 0.0
+        return (cost - self.tokens) / self.rate
+
+    def take(self, cost=1.0):
+        self._refill()
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return True
+        return False
+
+
+class Egress:
+    """출구 1개 (직접 연결 또는 프록시)"""
+
+    def __init__(self, proxy=None, rate_per_minute=RATE_PER_MINUTE, burst=BURST,
+                 breaker=None, clock=time.monotonic):
+        self.proxy = proxy
+        self.name = proxy or 'direct'
+        self.bucket = TokenBucket(rate_per_minute, burst, clock)
+        self.breaker = breaker or CircuitBreaker(clock=clock)
+        self.health = 1.0
+        self.used = 0
+        self.blocked = 0
+
+    def wait_time(self, cost=1.0):
+        return max(self.breaker.wait_time(), self.bucket.wait_time(cost))
+
+    @property
+    def quarantined(self):
+        return self.breaker.snapshot()['state'] in (OPEN, HALF_OPEN)
+
+    def record(self, kind):
+        """응답 분류 반영 - 차단이 이어지면 브레이커가 열리며 격리됨"""
+        blocked = kind in BLOCKED_KINDS
+        self.health = HEALTH_ALPHA * (0.0 if blocked else 1.0) + (1 - HEALTH_ALPHA) * self.health
+        self.blocked += 1 if blocked else 0
+        self.breaker.record(kind)
+        SERP_RESPONSES.labels(kind).inc()
+
+    def requests_proxies(self):
+        if not self.proxy:
+            return None
+        return {'http': self.proxy, 'https': self.proxy}
+
+    def snapshot(self):
+        state = self.breaker.snapshot()
+        return {
+            'name': self.name,
+            'health': round(self.health, 3),
+            'used': self.used,
+            'blocked': self.blocked,
+            'quarantined': state['state'] in (OPEN, HALF_OPEN),
+            'breaker': state
+        }
+
+
+class EgressPool:
+    """건강한 출구들에 체크를 분산 - 출구 수만큼 시간당 처리량이 늘어남"""
+
+    def __init__(self, egresses, sleep=time.sleep):
+        self.egresses = list(egresses)
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+
+    @classmethod
+    def from_env(cls):
+        raw = os.environ.get(PROXIES_ENV, '')
+        names = [p.strip() for p in raw.split(',') if p.strip()] or ['direct']
+        egresses = []
+        for name in names:
+            proxy = None if name == 'direct' else name
+            # 직접 연결은 기존 전역 브레이커를 그대로 사용
+            egresses.append(Egress(proxy, breaker=direct_breaker if proxy is None else None))
+        return cls(egresses)
+
+    def _pick(self, cost=1.0):
+        """바로 쓸 수 있는 출구 중 건강도가 가장 높고 덜 쓴 곳"""
+        ready = [e for e in self.egresses if e.wait_time(cost) == 0]
+        ready.sort(key=lambda e: (-e.health, e.used))
+        for egress in ready:
+            if egress.breaker.allow() and egress.bucket.take(cost):
+                egress.used += 1
+                return egress
+        return None
+
+    def wait_time(self):
+        """가장 빨리 쓸 수 있는 출구까지 남은 시간 (초)"""
+        with self._lock:
+            return min((e.wait_time() for e in self.egresses), default=0.0)
+
+    def acquire(self, timeout=ACQUIRE_TIMEOUT, cost=1.0):
+        """출구 1개 확보 - 모두 속도 제한/격리 중이면 기다리고, timeout 초과 시 None
+
+        cost 는 소모할 토큰 수 (가벼운 요청은 1보다 작게)
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                egress = self._pick(cost)
+                if egress:
+                    return egress
+                wait = min((e.wait_time(cost) for e in self.egresses), default=1.0) or 0.2
+            if timeout is not None and waited + wait > timeout:
+                return None
+            self._sleep(min(wait, 5.0))
+            waited += min(wait, 5.0)
+
+    def delay_multiplier(self):
+        """작업 간 딜레이 배수 - 건강한 출구 기준"""
+        healthy = [e for e in self.egresses if not e.quarantined]
+        if not healthy:
+            return 1.0
+        return min(e.breaker.delay_multiplier() for e in healthy)
+
+    def request(self, method, url, acquire_timeout=ACQUIRE_TIMEOUT, classify=None, session=None, cost=1.0,
+                **kwargs):
+        """출구를 거쳐 HTTP 요청 - 결과를 출구 건강도에 반영
+
+        classify(resp) 로 응답 분류를 직접 지정할 수 있다 (기본은 상태 코드 기준).
+        session 을 주면 공용 세션 대신 사용 (쿠키 없는 새 세션 등).
+        """
+        egress = self.acquire(timeout=acquire_timeout, cost=cost)
+        if egress is None:
+            raise requests.ConnectionError('사용 가능한 출구가 없습니다 (모두 격리됨)')
+        kwargs.setdefault('timeout', HTTP_TIMEOUT)
+        try:
+            resp = (session or self._session).request(method, url, proxies=egress.requests_proxies(), **kwargs)
+        except requests.RequestException:
+            egress.record(ERROR)
+            raise
+        if classify:
+            egress.record(classify(resp))
+        else:
+            egress.record(ERROR if resp.status_code in (403, 429) or resp.status_code >= 500 else NORMAL)
+        return resp
+
+    def snapshot(self):
+        with self._lock:
+            return [e.snapshot() for e in self.egresses]
+
+
+# 프로세스 공용 출구 풀
+egress_pool = EgressPool.from_env()
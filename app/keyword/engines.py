@@ -0,0 +1,81 @@
+# app/keyword/engines.py
+# 검색 엔진 선택 - 키워드별로 PC / 모바일 / 둘 다 체크 (+ 블로그/카페 탭 심층 확인)
+
+from concurrent.futures import ThreadPoolExecutor
+from .policy import FAILED_STATUS
+
+PC = 'pc'
+MOBILE = 'mobile'
+BOTH = 'both'
+ENGINES = (PC, MOBILE, BOTH)
+DEFAULT_ENGINE = PC
+# 블로그/카페 탭 심층 확인 결과 키
+VERTICAL = 'vertical'
+
+# 탭 심층 확인을 통합검색 체크와 병렬로 돌리는 스레드
+_vertical_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='deep-check')
+
+
+def engines_for(engine):
+    """키워드 engine 설정 -> 체크할 엔진 목록"""
+    if engine == BOTH:
+        return (PC, MOBILE)
+    if engine == MOBILE:
+        return (MOBILE,)
+    return (PC,)
+
+
+def check_keyword(kw, fresh_session=False, mobile_fallback=False):
+    """키워드의 엔진 설정대로 순위 체크
+
+    deep_check 키워드는 블로그/카페 탭 심층 확인을 통합검색 체크와 동시에 돌려
+    체크 시간이 늘어나지 않게 한다.
+    mobile_fallback=True (마지막 재시도) 면 PC 차단이 반복되는 경우 모바일 순위로 PC 결과를 대신한다 -
+    PC 전용 키워드는 PC 체크를 건너뛰고 모바일로 확인하고, 둘 다 보는 키워드는 PC 가 실패했을 때만
+    이번에 체크한 모바일 결과를 쓴다.
+    반환: {'pc': (상태, 순위, 섹션), 'mobile': (...), 'vertical': (탭, 순위)} - 체크한 것만
+    """
+    from .scraper import run_check
+    from .mobile import run_mobile_check
+    from .vertical import run_vertical_check
+
+    deep = None
+    if kw.deep_check:
+        deep = _vertical_executor.submit(run_vertical_check, kw.keyword_text, kw.post_url, kw.post_title)
+
+    engines = engines_for(kw.engine)
+    results = {}
+    for engine in engines:
+        if engine == MOBILE:
+            results[MOBILE] = run_mobile_check(kw.keyword_text, kw.post_url, kw.post_title,
+                                               fresh_session=fresh_session)
+        elif mobile_fallback and MOBILE not in engines:
+            print(f"[재시도] '{kw.keyword_text}' PC 확인 실패 반복 - 모바일 순위로 대신 확인")
+            results[PC] = run_mobile_check(kw.keyword_text, kw.post_url, kw.post_title,
+                                           fresh_session=fresh_session)
+        else:
+            results[PC] = run_check(kw.keyword_text, kw.post_url, kw.post_title,
+                                    fresh_session=fresh_session)
+    if (mobile_fallback and PC in results and MOBILE in results
+            and results[PC][0] == FAILED_STATUS and results[MOBILE][0] != FAILED_STATUS):
+        print(f"[재시도] '{kw.keyword_text}' PC 확인 실패 - 모바일 순위로 대신함")
+        results[PC] = results[MOBILE]
+
+    if deep is not None:
+        try:
+            vertical = deep.result()
+        except Exception as e:
+            print(f"[탭 심층 확인] '{kw.keyword_text}' 실패: {e}")
+            vertical = None
+        if vertical:
+            results[VERTICAL] = vertical
+    return results
+
+
+def primary_engine(engine):
+    """리포트/스케줄 기준이 되는 엔진 (모바일 전용이면 모바일, 그 외 PC)"""
+    return MOBILE if engine == MOBILE else PC
+
+
+def any_failed(results):
+    return any(results[e][0] == FAILED_STATUS for e in (PC, MOBILE) if e in results)
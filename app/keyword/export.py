@@ -0,0 +1,240 @@
+# app/keyword/export.py
+# 키워드 / 순위 이력 내보내기 (CSV, XLSX)
+#
+# 서버 쪽 커서(yield_per)로 읽은 행을 바로 응답 본문 조각으로 흘려보내므로
+# 계정 크기나 이력 기간과 무관하게 메모리가 일정하다. 구글 시트 할당량과도 무관.
+# XLSX 는 추가 의존성 없이 zipfile 스트리밍으로 직접 만든다 (문자열은 inline, 공유 문자열 표 없음).
+
+import os
+import re
+import csv
+import io
+import zipfile
+from datetime import datetime, timedelta
+from xml.sax.saxutils import escape
+from sqlalchemy import select
+from app.models import db, Keyword, CheckRun, CheckTask
+from app.utils import utcnow
+
+# 서버 커서에서 한 번에 가져올 행 수
+EXPORT_FETCH_ROWS = int(os.environ.get('EXPORT_FETCH_ROWS', 1000))
+# 이만큼 쌓이면 클라이언트로 내보냄
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+# 앞 5개 열은 업로드(/keywords/upload) 형식과 같음 - 내려받은 파일을 그대로 다시 올릴 수 있음
+KEYWORD_COLUMNS = (
+    ('키워드', Keyword.keyword_text), ('URL', Keyword.post_url), ('제목', Keyword.post_title),
+    ('중요도', Keyword.priority), ('엔진', Keyword.engine),
+    ('상태', Keyword.ranking_status), ('순위', Keyword.ranking), ('섹션', Keyword.section),
+    ('이전 상태', Keyword.prev_ranking_status), ('이전 순위', Keyword.prev_ranking), ('이전 섹션', Keyword.prev_section),
+    ('모바일 상태', Keyword.mobile_status), ('모바일 순위', Keyword.mobile_ranking),
+    ('모바일 섹션', Keyword.mobile_section),
+    ('탭', Keyword.vertical_section), ('탭 순위', Keyword.vertical_ranking),
+    ('마지막 확인', Keyword.last_checked_at),
+)
+# 체크 작업(CheckTask) 결과 = 실행 회차별 순위 기록
+HISTORY_COLUMNS = (
+    ('확인 시각', CheckTask.finished_at), ('키워드', Keyword.keyword_text), ('엔진', Keyword.engine),
+    ('실행', CheckRun.kind),
+    ('상태', CheckTask.result_status), ('순위', CheckTask.result_ranking), ('섹션', CheckTask.result_section),
+    ('모바일 상태', CheckTask.result_mobile_status), ('모바일 순위', CheckTask.result_mobile_ranking),
+    ('모바일 섹션', CheckTask.result_mobile_section),
+    ('탭', CheckTask.result_vertical_section), ('탭 순위', CheckTask.result_vertical_ranking),
+)
+
+# XML 에 넣을 수 없는 제어 문자
+_XML_ILLEGAL = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def history_since(value, now=None):
+    """?history= 값 -> 이력 시작 시각 ('all' 이면 None = 전체). 일수가 아니면 ValueError"""
+    if value == 'all':
+        return None
+    days = int(value)
+    if days <= 0:
+        raise ValueError(value)
+    return (now or utcnow()) - timedelta(days=days)
+
+
+def keyword_export(user_id):
+    """현재 키워드 목록 (헤더, 쿼리)"""
+    query = (select(*(col for _, col in KEYWORD_COLUMNS))
+             .where(Keyword.user_id == user_id)
+             .order_by(Keyword.id))
+    return [name for name, _ in KEYWORD_COLUMNS], query
+
+
+def history_export(user_id, since=None):
+    """체크 실행별 순위 이력 (헤더, 쿼리) - 오래된 순, 삭제된 키워드는 제외"""
+    query = (select(*(col for _, col in HISTORY_COLUMNS))
+             .join(Keyword, Keyword.id == CheckTask.keyword_id)
+             .join(CheckRun, CheckRun.id == CheckTask.run_id)
+             .where(CheckTask.user_id == user_id, CheckTask.status == 'done'))
+    if since is not None:
+        query = query.where(CheckTask.finished_at >= since)
+    return [name for name, _ in HISTORY_COLUMNS], query.order_by(CheckTask.finished_at, CheckTask.id)
+
+
+def stream_rows(query):
+    """서버 쪽 커서로 한 번에 EXPORT_FETCH_ROWS 행씩 읽음"""
+    return db.session.execute(query.execution_options(yield_per=EXPORT_FETCH_ROWS))
+
+
+def _text(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return str(value)
+
+
+def iter_csv(header, rows):
+    """CSV 조각 제너레이터 (UTF-8 BOM - 엑셀에서 한글이 깨지지 않도록)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow([_text(v) for v in row])
+        if buffer.tell() >= EXPORT_CHUNK_BYTES:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+# --- XLSX ---
+class _Sink:
+    """zipfile 출력 대상 (seek 불가) - 쓰인 바이트를 제너레이터가 꺼내 감"""
+
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        self.size = 0
+        return data
+
+
+_MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_XML_DECL = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+_SHEET_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml'
+# 엑셀 시트당 최대 행 수 (헤더 포함) - 넘으면 다음 시트로
+XLSX_MAX_ROWS = 1048576
+
+_STYLES_XML = (
+    _XML_DECL + f'<styleSheet xmlns="{_MAIN_NS}">'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>'
+    '</styleSheet>'
+)
+# 첫 행(헤더) 고정
+_SHEET_HEAD = (
+    _XML_DECL + f'<worksheet xmlns="{_MAIN_NS}">'
+    '<sheetViews><sheetView workbookViewId="0"><pane ySplit="1" topLeftCell="A2" state="frozen"/>'
+    '</sheetView></sheetViews><sheetData>'
+).encode('utf-8')
+_SHEET_TAIL = b'</sheetData></worksheet>'
+
+
+def _package_parts(sheet_names):
+    """시트 수가 정해진 뒤 쓰는 워크북/관계/콘텐츠 형식 파트"""
+    count = len(sheet_names)
+    sheets = ''.join(f'<sheet name="{escape(name)}" sheetId="{i}" r:id="rId{i}"/>'
+                     for i, name in enumerate(sheet_names, 1))
+    sheet_rels = ''.join(f'<Relationship Id="rId{i}" Type="{_REL_NS}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+                         for i in range(1, count + 1))
+    sheet_types = ''.join(f'<Override PartName="/xl/worksheets/sheet{i}.xml" ContentType="{_SHEET_TYPE}"/>'
+                          for i in range(1, count + 1))
+    return {
+        'xl/workbook.xml': (
+            _XML_DECL + f'<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}"><sheets>{sheets}</sheets></workbook>'
+        ),
+        'xl/_rels/workbook.xml.rels': (
+            _XML_DECL + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            + sheet_rels
+            + f'<Relationship Id="rId{count + 1}" Type="{_REL_NS}/styles" Target="styles.xml"/>'
+            '</Relationships>'
+        ),
+        'xl/styles.xml': _STYLES_XML,
+        '_rels/.rels': (
+            _XML_DECL + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+            '</Relationships>'
+        ),
+        '[Content_Types].xml': (
+            _XML_DECL + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            + sheet_types + '</Types>'
+        ),
+    }
+
+
+def _xlsx_row(values, style=0):
+    cells = []
+    for value in values:
+        if value is None:
+            cells.append('<c/>')
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            cells.append(f'<c t="n"><v>{value}</v></c>')
+        else:
+            text = escape(_XML_ILLEGAL.sub('', _text(value)))
+            attr = f' s="{style}"' if style else ''
+            cells.append(f'<c t="inlineStr"{attr}><is><t xml:space="preserve">{text}</t></is></c>')
+    return f'<row>{"".join(cells)}</row>'.encode('utf-8')
+
+
+def iter_xlsx(header, rows, sheet_name='Sheet1'):
+    """XLSX 조각 제너레이터 - 시트 XML 을 zip 에 스트리밍으로 압축하며 내보냄
+
+    행이 시트 한도를 넘으면 '이름 (2)' 시트로 이어 쓴다. 시트 수는 끝나야 알 수 있으므로
+    워크북/관계 파트는 시트 뒤에 쓴다 (zip 안의 순서는 상관없음).
+    """
+    sink = _Sink()
+    sheet_names = []
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED) as archive:
+        rows = iter(rows)
+        row = next(rows, None)
+        while row is not None or not sheet_names:
+            sheet_names.append(sheet_name if not sheet_names else f'{sheet_name} ({len(sheet_names) + 1})')
+            with archive.open(f'xl/worksheets/sheet{len(sheet_names)}.xml', 'w') as sheet:
+                sheet.write(_SHEET_HEAD)
+                sheet.write(_xlsx_row(header, style=1))
+                written = 1
+                while row is not None and written < XLSX_MAX_ROWS:
+                    sheet.write(_xlsx_row(row))
+                    written += 1
+                    if sink.size >= EXPORT_CHUNK_BYTES:
+                        yield sink.drain()
+                    row = next(rows, None)
+                sheet.write(_SHEET_TAIL)
+        for name, xml in _package_parts(sheet_names).items():
+            archive.writestr(name, xml)
+    yield sink.drain()
@@ -0,0 +1,108 @@
+# app/keyword/matching.py
+# 게시물 제목 유사도 매칭 (문자 n-gram 인덱스)
+
+import re
+import unicodedata
+from functools import lru_cache
+
+NGRAM_SIZE = 2
+# 대상 제목 n-gram 중 링크 제목에 있는 비율의 기준값 - 말줄임/이모지/태그 차이는 허용
+TITLE_MATCH_THRESHOLD = 0.8
+# 링크 제목/대상 제목 n-gram 개수 비율 하한 - 대상 제목 일부만 담은 짧은 경쟁 글 제외
+MIN_LENGTH_RATIO = 0.75
+# 너무 짧은 제목은 오탐이 많아 비교하지 않음
+MIN_NGRAMS = 3
+
+_BRACKET_TAG_RE = re.compile(r"[\[\(【〔<][^\]\)】〕>]{0,20}[\]\)】〕>]")
+_ELLIPSIS_RE = re.compile(r"(\.{2,}|…)+")
+
+
+def normalize_title(text):
+    """제목 정규화 - [태그], 말줄임, 이모지/기호, 공백 제거 후 소문자화"""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKC", text)
+    text = _BRACKET_TAG_RE.sub("", text)
+    text = _ELLIPSIS_RE.sub("", text)
+    # 글자/숫자만 남김 (이모지, 특수문자, 공백 제거)
+    return "".join(ch for ch in text if ch.isalnum()).lower()
+
+
+@lru_cache(maxsize=4096)
+def title_signature(text):
+    """제목의 문자 n-gram 집합 (정규화 포함, 결과 캐시)"""
+    norm = normalize_title(text)
+    if len(norm) < NGRAM_SIZE:
+        return frozenset()
+    return frozenset(norm[i:i + NGRAM_SIZE] for i in range(len(norm) - NGRAM_SIZE + 1))
+
+
+def _length_ok(target_size, link_size):
+    return min(target_size, link_size) >= max(target_size, link_size) * MIN_LENGTH_RATIO
+
+
+def overlap_score(target, other):
+    """대상 제목 n-gram 중 다른 제목에 있는 비율 (길이 차이가 크면 0)
+
+    SERP 제목에는 늘 키워드가 들어 있으므로 짧은 쪽 기준으로 나누면
+    대상 제목의 일부 단어만 담은 경쟁 글도 높은 점수를 받는다.
+    """
+    if len(target) < MIN_NGRAMS or len(other) < MIN_NGRAMS:
+        return 0.0
+    if not _length_ok(len(target), len(other)):
+        return 0.0
+    return len(target & other) / len(target)
+
+
+class TitleIndex:
+    """여러 대상 제목을 한 번만 정규화해 n-gram 역색인으로 보관
+
+    링크 하나당 자신의 n-gram 목록만 훑으므로 대상 수와 무관하게
+    (링크 n-gram 수 + 후보 수)에 비례하는 비용으로 점수를 계산한다.
+    """
+
+    def __init__(self, threshold=TITLE_MATCH_THRESHOLD):
+        self.threshold = threshold
+        self._sizes = {}      # key -> n-gram 개수
+        self._postings = {}   # n-gram -> [key, ...]
+
+    def add(self, key, title):
+        sig = title_signature(title)
+        if len(sig) < MIN_NGRAMS:
+            return
+        self._sizes[key] = len(sig)
+        for gram in sig:
+            self._postings.setdefault(gram, []).append(key)
+
+    def __len__(self):
+        return len(self._sizes)
+
+    def scores(self, link_text):
+        """링크 텍스트에 대한 후보별 점수 {key: score}"""
+        sig = title_signature(link_text)
+        if len(sig) < MIN_NGRAMS or not self._sizes:
+            return {}
+        hits = {}
+        for gram in sig:
+            for key in self._postings.get(gram, ()):
+                hits[key] = hits.get(key, 0) + 1
+        link_size = len(sig)
+        return {key: count / self._sizes[key] for key, count in hits.items()
+                if _length_ok(self._sizes[key], link_size)}
+
+    def match(self, link_text):
+        """기준값 이상인 대상 key 목록 (점수 높은 순)"""
+        scored = [(s, k) for k, s in self.scores(link_text).items() if s >= self.threshold]
+        scored.sort(key=lambda x: -x[0])
+        return [k for _, k in scored]
+
+    def match_links(self, links):
+        """SERP 링크 목록 [(href, text), ...] 과 대상 전체를 한 번에 매칭
+
+        반환: {key: 처음 매칭된 링크 인덱스}
+        """
+        found = {}
+        for idx, (_, text) in enumerate(links):
+            for key in self.match(text):
+                found.setdefault(key, idx)
+        return found
@@ -0,0 +1,157 @@
+# app/keyword/mobile.py
+# 모바일 통합검색(m.search.naver.com) 순위 확인 - 브라우저 없이 HTTP 1회로 가져와 파싱
+
+import random
+import time
+import traceback
+import urllib.parse
+import requests
+from bs4 import BeautifulSoup
+from .botwall import classify_serp, ERROR, NORMAL
+from .egress import egress_pool
+from app.metrics import phase, record_check
+from .scraper import is_content_url, match_first, SKIP_SECTION_TITLES, MOBILE_SEARCH_BASE_URL
+
+MOBILE_SEARCH_URL = f'{MOBILE_SEARCH_BASE_URL}/search.naver'
+MOBILE_USER_AGENTS = [
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_5 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.5 Mobile/15E148 Safari/604.1",
+    "Mozilla/5.0 (Linux; Android 14; SM-S921N) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Mobile Safari/537.36",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 18_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) CriOS/130.0.6723.90 Mobile/15E148 Safari/604.1",
+]
+MOBILE_HEADERS = {'Accept-Language': 'ko-KR,ko;q=0.9'}
+
+# 모바일 노출 상태 - 모바일은 윗탭/아랫탭 구분 없이 카드가 한 줄로 쌓임
+MOBILE_FOUND = '모바일'
+
+MOBILE_HOSTS = {
+    'm.blog.naver.com': 'blog.naver.com',
+    'm.cafe.naver.com': 'cafe.naver.com',
+    'm.post.naver.com': 'post.naver.com',
+    'm.kin.naver.com': 'kin.naver.com',
+}
+
+
+def desktop_url(href):
+    """모바일 게시물 URL을 PC URL로 변환 (등록된 URL과 비교하기 위해)"""
+    try:
+        p = urllib.parse.urlparse(href)
+    except Exception:
+        return href
+    host = p.netloc.lower()
+    if host == 'm.blog.naver.com' and 'PostView' in p.path:
+        qs = urllib.parse.parse_qs(p.query)
+        blog_id, log_no = qs.get('blogId', [''])[0], qs.get('logNo', [''])[0]
+        if blog_id and log_no:
+            return f"https://blog.naver.com/{blog_id}/{log_no}"
+    if host in MOBILE_HOSTS:
+        return p._replace(netloc=MOBILE_HOSTS[host]).geturl()
+    return href
+
+
+def section_title(section):
+    """모바일 섹션(카드) 제목"""
+    for sel in ('h2', 'h3', '.api_title', "[class*='headline']"):
+        for el in section.select(sel):
+            text = el.get_text('\n', strip=True).split('\n')[0].strip()
+            if '더보기' in text:
+                text = text.split('더보기')[0].strip()
+            if 1 < len(text) < 50:
+                return text
+
+    classes = section.get('class') or []
+    if 'sp_nblog' in classes:
+        return '블로그'
+    if 'sp_ncafe' in classes:
+        return '카페'
+    if 'ntalk_wrap' in classes:
+        return '오픈톡'
+    return '검색결과'
+
+
+def post_links(section):
+    """섹션 내 게시물 링크 [(PC URL, 제목), ...] - 처음 나온 순서 유지"""
+    results, seen = [], set()
+    for a in section.select('a[href]'):
+        href = desktop_url(a['href'])
+        text = a.get_text(' ', strip=True)
+        if not is_content_url(href) or href in seen or len(text) <= 5:
+            continue
+        seen.add(href)
+        results.append((href, text))
+    return results
+
+
+def parse_mobile_sections(html):
+    """모바일 SERP -> [(섹션 제목, 링크 목록), ...] (광고/쇼핑 등 제외)"""
+    soup = BeautifulSoup(html, 'html.parser')
+    sections = []
+    for section in soup.select('.sc_new'):
+        if 'ad_section' in (section.get('class') or []) or section.find_parent(class_='sc_new'):
+            continue
+        title = section_title(section)
+        if any(sk in title for sk in SKIP_SECTION_TITLES):
+            continue
+        sections.append((title, post_links(section)))
+    return soup, sections
+
+
+def find_mobile_rank(sections, post_url, post_title):
+    """카드 순서 = 모바일 순위 (카드의 첫 번째 링크만 인정), 섹션은 카드 제목"""
+    cards = [(rank, title, links[0]) for rank, (title, links) in enumerate(sections, start=1) if links]
+    idx = match_first(post_url, post_title, [link for _, _, link in cards])
+    if idx is None:
+        return None
+    rank, title, _ = cards[idx]
+    return (MOBILE_FOUND, rank, title)
+
+
+def run_mobile_check(keyword, post_url, post_title=None, fresh_session=False):
+    """모바일 통합검색 순위 확인 - 반환 형식은 run_check와 같음 (상태, 순위, 섹션)
+
+    모바일 SERP는 서버 렌더링이라 브라우저 없이 HTTP 요청 한 번으로 충분하다.
+    fresh_session=True 면 쿠키 없는 새 세션과 다른 User-Agent로 요청한다.
+    """
+    started = time.perf_counter()
+    result = _run_mobile_check(keyword, post_url, post_title, fresh_session)
+    record_check('mobile', result[0], time.perf_counter() - started)
+    return result
+
+
+def _run_mobile_check(keyword, post_url, post_title, fresh_session):
+    print(f"--- [모바일] '{keyword}' 순위 확인 시작{' (재시도)' if fresh_session else ''} ---")
+    parsed = {}
+
+    def _classify(resp):
+        parsed['kind'] = ERROR
+        if resp.status_code in (403, 429) or resp.status_code >= 500:
+            return ERROR
+        soup, sections = parse_mobile_sections(resp.text)
+        parsed['sections'] = sections
+        text = '' if sections else soup.get_text(' ', strip=True)[:3000]
+        parsed['kind'] = classify_serp(resp.url, text, bool(sections) or bool(soup.select_one('#ct')))
+        return parsed['kind']
+
+    try:
+        headers = dict(MOBILE_HEADERS)
+        headers['User-Agent'] = random.choice(MOBILE_USER_AGENTS) if fresh_session else MOBILE_USER_AGENTS[0]
+        with phase('mobile_fetch'):
+            resp = egress_pool.request('GET', MOBILE_SEARCH_URL, params={'query': keyword}, headers=headers,
+                                       classify=_classify, session=requests.Session() if fresh_session else None)
+        if parsed.get('kind') != NORMAL:
+            print(f"[모바일] [{keyword}] 정상 검색결과 아님 ({parsed.get('kind')}, HTTP {resp.status_code})")
+            return ("확인 실패", 999, None)
+
+        print(f"[모바일] [{keyword}] {len(parsed['sections'])}개 섹션 발견")
+        with phase('match'):
+            result = find_mobile_rank(parsed['sections'], post_url, post_title)
+        if result:
+            print(f"[모바일] [{keyword}] {result[2]} 카드, 모바일 {result[1]}위에서 발견!")
+            return result
+        return ("노출X", 999, None)
+
+    except Exception as e:
+        print(f"[모바일] [{keyword}] 순위 확인 중 오류 발생: {str(e)}")
+        traceback.print_exc()
+        return ("확인 실패", 999, None)
+    finally:
+        print(f"--- [모바일] '{keyword}' 순위 확인 완료 ---\n")
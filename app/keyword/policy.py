@@ -0,0 +1,72 @@
+# app/keyword/policy.py
+# 키워드별 체크 주기 정책 - 우선순위 + 최근 순위 변동성으로 다음 체크 시각 계산
+
+import os
+from datetime import timedelta
+
+# 우선순위별 기본 주기 (시간)
+BASE_INTERVAL_HOURS = {
+    '상': float(os.environ.get('CHECK_INTERVAL_HIGH_HOURS', 12)),
+    '중': float(os.environ.get('CHECK_INTERVAL_MID_HOURS', 24)),
+    '하': float(os.environ.get('CHECK_INTERVAL_LOW_HOURS', 72)),
+}
+MIN_INTERVAL_HOURS = float(os.environ.get('CHECK_INTERVAL_MIN_HOURS', 3))
+MAX_INTERVAL_HOURS = float(os.environ.get('CHECK_INTERVAL_MAX_HOURS', 168))
+# 일일(리포트) 실행은 이만큼 뒤에 주기가 돌아올 키워드까지 체크 - 전날 실행 도중(08:05 등) 체크된
+# '중'(24시간) 키워드가 다음 날 08:00 실행에서 빠져 리포트에 오래된 값이 나가지 않도록 (실행 마감 시간 정도)
+DUE_TOLERANCE_MINUTES = float(os.environ.get('CHECK_DUE_TOLERANCE_MINUTES', 120))
+
+# 변동성 = |순위 변화|의 지수이동평균 (EWMA)
+VOLATILITY_ALPHA = 0.3
+# 노출/미노출 전환, 윗탭/아랫탭 이동은 큰 변화로 취급
+FLIP_WEIGHT = 10.0
+# 변동성이 이 값만큼 오르면 주기가 절반으로 줄어듦
+VOLATILITY_SCALE = 2.0
+
+FAILED_STATUS = '확인 실패'
+NOT_RANKED = 999
+
+
+def _is_ranked(status, rank):
+    return status not in (FAILED_STATUS, '노출X', '확인 대기', None) and rank is not None and rank < NOT_RANKED
+
+
+def rank_change(prev_status, prev_rank, prev_section, status, rank, section):
+    """직전 체크 대비 변화량 (순위 차이, 전환 시 FLIP_WEIGHT) - 비교 불가면 None"""
+    if status == FAILED_STATUS or prev_status in (FAILED_STATUS, '확인 대기', None):
+        return None
+    was, now = _is_ranked(prev_status, prev_rank), _is_ranked(status, rank)
+    if was != now:
+        return FLIP_WEIGHT
+    if not now:
+        return 0.0
+    if prev_section != section:
+        return FLIP_WEIGHT
+    return float(abs(prev_rank - rank))
+
+
+def update_volatility(volatility, change):
+    """변동성 EWMA 갱신"""
+    if change is None:
+        return volatility or 0.0
+    return VOLATILITY_ALPHA * change + (1 - VOLATILITY_ALPHA) * (volatility or 0.0)
+
+
+def check_interval(priority, volatility):
+    """다음 체크까지의 간격"""
+    base = BASE_INTERVAL_HOURS.get(priority, BASE_INTERVAL_HOURS['중'])
+    hours = base / (1 + (volatility or 0.0) / VOLATILITY_SCALE)
+    hours = min(max(hours, MIN_INTERVAL_HOURS), MAX_INTERVAL_HOURS)
+    return timedelta(hours=hours)
+
+
+def next_check_at(priority, volatility, status, checked_at):
+    """다음 체크 시각 - 실패한 키워드는 최소 주기 후 바로 다시 체크"""
+    if status == FAILED_STATUS:
+        return checked_at + timedelta(hours=MIN_INTERVAL_HOURS)
+    return checked_at + check_interval(priority, volatility)
+
+
+def due_cutoff(now, tolerance=True):
+    """이 시각 이전에 주기가 돌아오는 키워드가 체크 대상"""
+    return now + timedelta(minutes=DUE_TOLERANCE_MINUTES) if tolerance else now
@@ -0,0 +1,169 @@
+# app/keyword/progress.py
+# 순위 체크 진행 이벤트 - 체크 파이프라인(워커/단건 체크)이 발행, SSE 구독자(GET /keyword/events)가 수신
+#
+# 구독자마다 크기가 정해진 버퍼를 두고, 넘치면 오래된 이벤트부터 버린 뒤 'resync' 로 알려
+# 클라이언트가 목록을 한 번 다시 읽게 한다 - 느린 클라이언트가 워커를 막거나 메모리를 키우지 않음.
+# 이벤트는 같은 프로세스 안에서만 전달된다. 다른 프로세스(worker.py, 다른 gunicorn 워커)의
+# 진행은 스트림이 주기적으로 보내는 실행 진행 현황(progress)으로 반영된다.
+
+import os
+import json
+import time
+import threading
+from collections import deque
+
+# 구독자당 버퍼 크기 (이벤트 수)
+PROGRESS_BUFFER = int(os.environ.get('PROGRESS_BUFFER', 256))
+# 유저당 동시 구독 수 - SSE 연결은 요청 처리 스레드를 계속 점유함
+PROGRESS_MAX_CLIENTS = int(os.environ.get('PROGRESS_MAX_CLIENTS', 3))
+# 실행 진행 현황(DB) 확인 주기 (초) - 다른 프로세스에서 도는 체크 반영
+PROGRESS_POLL_SECONDS = float(os.environ.get('PROGRESS_POLL_SECONDS', 5))
+# 연결 유지용 빈 메시지 간격 (초) - 끊긴 클라이언트도 이때 정리됨
+PROGRESS_HEARTBEAT_SECONDS = 15
+# 연결 최대 유지 시간 (초) - 끝나면 클라이언트(EventSource)가 retry 후 다시 연결
+PROGRESS_MAX_SECONDS = int(os.environ.get('PROGRESS_MAX_SECONDS', 300))
+PROGRESS_RETRY_MS = 3000
+
+# 키워드 이벤트 종류
+QUEUED, RUNNING, RESULT, FAILED = 'queued', 'running', 'result', 'failed'
+
+
+class Subscription:
+    """구독자 1명의 이벤트 버퍼"""
+
+    def __init__(self, user_id, size=PROGRESS_BUFFER):
+        self.user_id = user_id
+        self.events = deque(maxlen=max(size, 1))
+        self.dropped = 0
+        self._cond = threading.Condition()
+
+    def put(self, event, data):
+        with self._cond:
+            if len(self.events) == self.events.maxlen:
+                self.dropped += 1
+            self.events.append((event, data))
+            self._cond.notify()
+
+    def drain(self, timeout):
+        """이벤트가 올 때까지 최대 timeout 초 대기 -> (이벤트 목록, 버린 개수)"""
+        with self._cond:
+            if not self.events and not self.dropped:
+                self._cond.wait(timeout)
+            events, dropped = list(self.events), self.dropped
+            self.events.clear()
+            self.dropped = 0
+        return events, dropped
+
+
+class ProgressBus:
+    """유저별 구독자에게 이벤트 배포 (스레드 안전)"""
+
+    def __init__(self, buffer_size=PROGRESS_BUFFER, max_clients=PROGRESS_MAX_CLIENTS):
+        self.buffer_size = buffer_size
+        self.max_clients = max_clients
+        self._lock = threading.Lock()
+        self._subs = {}  # user_id -> [Subscription]
+
+    def can_subscribe(self, user_id):
+        return len(self._subs.get(user_id, ())) < self.max_clients
+
+    def subscribe(self, user_id):
+        """구독 시작 - 유저당 구독 수를 넘으면 None"""
+        with self._lock:
+            subs = self._subs.setdefault(user_id, [])
+            if len(subs) >= self.max_clients:
+                return None
+            sub = Subscription(user_id, self.buffer_size)
+            subs.append(sub)
+            return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            subs = self._subs.get(sub.user_id, [])
+            if sub in subs:
+                subs.remove(sub)
+            if not subs:
+                self._subs.pop(sub.user_id, None)
+
+    def has_subscribers(self, user_id):
+        return user_id in self._subs
+
+    def publish(self, user_id, event, data):
+        """구독자가 없으면 아무것도 하지 않음 (워커 쪽 비용 없음)"""
+        subs = self._subs.get(user_id)
+        if not subs:
+            return
+        for sub in list(subs):
+            sub.put(event, data)
+
+    def publish_many(self, user_id, event, items):
+        if self.has_subscribers(user_id):
+            for data in items:
+                self.publish(user_id, event, data)
+
+    def stats(self):
+        with self._lock:
+            return {'users': len(self._subs), 'clients': sum(len(s) for s in self._subs.values())}
+
+
+def result_payload(results):
+    """엔진별 체크 결과 튜플 -> 이벤트용 dict"""
+    payload = {}
+    for engine, value in results.items():
+        if not value:
+            continue
+        if len(value) == 3:
+            payload[engine] = {'status': value[0], 'ranking': value[1], 'section': value[2]}
+        else:
+            payload[engine] = {'section': value[0], 'ranking': value[1]}
+    return payload
+
+
+def format_event(event, data):
+    """SSE 메시지 1개"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+progress_bus = ProgressBus()
+
+
+def iter_events(user_id, snapshot=None, bus=progress_bus, poll=PROGRESS_POLL_SECONDS,
+                heartbeat=PROGRESS_HEARTBEAT_SECONDS, max_seconds=PROGRESS_MAX_SECONDS, clock=time.monotonic):
+    """SSE 스트림 제너레이터 - 구독 이벤트 + 실행 진행 현황(바뀐 것만), 끝나면 구독 해제
+
+    snapshot: 유저의 진행 중 실행 현황 목록을 돌려주는 함수 ([{'run_id': ..., ...}])
+    버퍼가 넘쳐 이벤트를 버렸으면 'resync' 를 보낸다.
+    구독은 첫 조각을 보낼 때 시작한다 (시작도 안 된 응답은 정리 시점이 없어 구독이 남으므로).
+    """
+    yield f"retry: {PROGRESS_RETRY_MS}\n\n"
+    sub = bus.subscribe(user_id)
+    if sub is None:
+        return
+    start = last_write = next_poll = clock()
+    runs = {}
+    try:
+        while clock() - start < max_seconds:
+            if snapshot is not None and clock() >= next_poll:
+                current = {run['run_id']: run for run in snapshot()}
+                changed = [run for run_id, run in current.items() if runs.get(run_id) != run]
+                changed += [{'run_id': run_id, 'status': 'finished'} for run_id in runs.keys() - current.keys()]
+                for run in changed:
+                    yield format_event('progress', run)
+                if changed:
+                    last_write = clock()
+                runs = current
+                next_poll = clock() + poll
+
+            wait = heartbeat if snapshot is None else min(heartbeat, max(next_poll - clock(), 0.1))
+            events, dropped = sub.drain(wait)
+            if dropped:
+                yield format_event('resync', {'dropped': dropped})
+            for event, data in events:
+                yield format_event(event, data)
+            if events or dropped:
+                last_write = clock()
+            elif clock() - last_write >= heartbeat:
+                yield ': keepalive\n\n'
+                last_write = clock()
+    finally:
+        bus.unsubscribe(sub)
@@ -0,0 +1,104 @@
+# app/keyword/results.py
+# 순위 체크 결과 반영 / 시트용 행 변환 (라우트, 스케줄러, 워커 공용)
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from app.utils import utcnow
+from .policy import rank_change, update_volatility, next_check_at, FAILED_STATUS
+from .engines import PC, MOBILE, VERTICAL, primary_engine
+from .summary import last_change
+
+
+# 체크 결과로 바뀌는 컬럼 (일괄 반영 시 한 문장으로 쓰도록 항상 전부 채움)
+RESULT_COLUMNS = (
+    'ranking_status', 'ranking', 'section', 'prev_ranking_status', 'prev_ranking', 'prev_section',
+    'mobile_status', 'mobile_ranking', 'mobile_section',
+    'prev_mobile_status', 'prev_mobile_ranking', 'prev_mobile_section',
+    'vertical_section', 'vertical_ranking', 'prev_vertical_ranking',
+    'rank_volatility', 'next_check_at', 'last_checked_at', 'last_change',
+)
+# result_values 계산에 필요한 현재 값 (위 컬럼 + 우선순위, 엔진)
+RESULT_INPUT_COLUMNS = RESULT_COLUMNS + ('priority', 'engine')
+
+
+def _shift_pc(values, status, rank, section):
+    change = rank_change(values['ranking_status'], values['ranking'], values['section'], status, rank, section)
+
+    # 이전 값 저장
+    values['prev_ranking'] = values['ranking']
+    values['prev_section'] = values['section']
+    values['prev_ranking_status'] = values['ranking_status']
+
+    # 새 값 업데이트
+    values['ranking_status'] = status
+    values['ranking'] = rank
+    values['section'] = section
+    return change
+
+
+def _shift_mobile(values, status, rank, section):
+    change = rank_change(values['mobile_status'], values['mobile_ranking'], values['mobile_section'],
+                         status, rank, section)
+
+    values['prev_mobile_status'] = values['mobile_status']
+    values['prev_mobile_ranking'] = values['mobile_ranking']
+    values['prev_mobile_section'] = values['mobile_section']
+
+    values['mobile_status'] = status
+    values['mobile_ranking'] = rank
+    values['mobile_section'] = section
+    return change
+
+
+def result_values(kw, results, now=None):
+    """엔진별 체크 결과 -> 반영 후 컬럼 값 dict (RESULT_COLUMNS 전부, 바뀌지 않은 값은 그대로)
+
+    kw: 현재 값을 가진 키워드 (ORM 객체 또는 RESULT_INPUT_COLUMNS 를 가진 행)
+    results: {'pc': (상태, 순위, 섹션), 'mobile': (...), 'vertical': (탭, 순위)} - 체크한 것만
+    현재 값은 prev_* 로 이동하고 다음 체크 시각을 갱신한다.
+    PC/모바일을 함께 보면 더 크게 움직인 쪽 기준으로 변동성을 갱신한다.
+    대표 엔진 결과가 있으면 대시보드 상승/하락 순위용 last_change 도 갱신한다.
+    """
+    values = {col: getattr(kw, col) for col in RESULT_COLUMNS}
+    if results.get(VERTICAL):
+        values['prev_vertical_ranking'] = values['vertical_ranking']
+        values['vertical_section'], values['vertical_ranking'] = results[VERTICAL]
+
+    changes = []
+    if results.get(PC):
+        changes.append(_shift_pc(values, *results[PC]))
+    if results.get(MOBILE):
+        changes.append(_shift_mobile(values, *results[MOBILE]))
+    if not changes:
+        return values
+
+    if results.get(primary_engine(kw.engine)):
+        values['last_change'] = last_change(SimpleNamespace(**values, engine=kw.engine))
+    known = [c for c in changes if c is not None]
+    values['rank_volatility'] = update_volatility(values['rank_volatility'], max(known) if known else None)
+    failed = any(results[e][0] == FAILED_STATUS for e in (PC, MOBILE) if results.get(e))
+    values['next_check_at'] = next_check_at(kw.priority, values['rank_volatility'],
+                                            FAILED_STATUS if failed else None, now or utcnow())
+    values['last_checked_at'] = datetime.now(timezone.utc)
+    return values
+
+
+def apply_results(kw, results):
+    """엔진별 체크 결과를 키워드 객체에 반영 (단건용 - 일괄 반영은 worker.queue.complete_tasks)"""
+    for col, value in result_values(kw, results).items():
+        setattr(kw, col, value)
+
+
+def keyword_sheet_row(kw):
+    """스프레드시트 동기화용 dict"""
+    return {
+        'priority': kw.priority, 'keyword_text': kw.keyword_text,
+        'post_title': kw.post_title, 'post_url': kw.post_url,
+        'ranking_status': kw.ranking_status, 'ranking': kw.ranking,
+        'section': kw.section, 'prev_ranking': kw.prev_ranking,
+        'prev_section': kw.prev_section, 'prev_ranking_status': kw.prev_ranking_status,
+        'engine': kw.engine, 'mobile_status': kw.mobile_status,
+        'mobile_ranking': kw.mobile_ranking, 'mobile_section': kw.mobile_section,
+        'vertical_section': kw.vertical_section if kw.deep_check else None,
+        'vertical_ranking': kw.vertical_ranking
+    }
@@ -1,20 +1,25 @@
 # app/keyword/routes.py
 
-from flask import Blueprint, request
+from flask import Blueprint, Response, request, stream_with_context
 from app.models import db, Keyword
 from app.auth.routes import token_required
-from .scraper import run_check
-from datetime import datetime, timezone
-from app.utils import json_response
+from .results import apply_results, keyword_sheet_row
+from .summary import get_summary, rebuild_summary, TOP_MOVERS
+from .progress import progress_bus, iter_events, result_payload, RUNNING, RESULT, FAILED
+from .export import (EXPORT_FORMATS, history_since, keyword_export, history_export, stream_rows,
+                     iter_csv, iter_xlsx)
+from .engines import check_keyword, primary_engine, ENGINES, DEFAULT_ENGINE, MOBILE
+from app.utils import json_response, utcnow
 from app.spreadsheet.sync import sync_to_spreadsheet
 import traceback
 import io
 import csv
 import requests as http_requests
+from .egress import egress_pool
 
 
 def resolve_short_url(url):
-    """naver.me 등 단축 URL을 실제 URL로 변환"""
+    """naver.me 등 단축 URL을 실제 URL로 변환 (검색이 아니므로 스크래퍼 출구 풀/차단 집계와 무관)"""
     if not url:
         return url
     try:
@@ -44,12 +49,17 @@ def create_keyword(current_user):
     data = request.get_json()
     if not data or not 'keyword_text' in data or not 'post_url' in data:
         return json_response({'message': 'Required fields are missing!'}, status=400)
+    engine = data.get('engine', DEFAULT_ENGINE)
+    if engine not in ENGINES:
+        return json_response({'message': f"engine은 {', '.join(ENGINES)} 중 하나여야 합니다."}, status=400)
     new_keyword = Keyword(
         user_id=current_user.id,
         keyword_text=data['keyword_text'],
         post_url=resolve_short_url(data['post_url']),
         post_title=data.get('post_title'),
-        priority=data.get('priority', '중')
+        priority=data.get('priority', '중'),
+        engine=engine,
+        deep_check=bool(data.get('deep_check', False))
     )
     db.session.add(new_keyword)
     db.session.commit()
@@ -101,6 +111,7 @@ def upload_keywords(current_user):
             post_url = row[1].strip()
             post_title = row[2].strip() if len(row) > 2 else None
             priority = row[3].strip() if len(row) > 3 else '중'
+            engine = row[4].strip().lower() if len(row) > 4 else DEFAULT_ENGINE
 
             # 헤더 행 스킵
             if keyword_text in ('키워드', 'keyword', ''):
@@ -118,7 +129,8 @@ def upload_keywords(current_user):
                 keyword_text=keyword_text,
                 post_url=resolve_short_url(post_url),
                 post_title=post_title if post_title else None,
-                priority=priority if priority in ('상', '중', '하') else '중'
+                priority=priority if priority in ('상', '중', '하') else '중',
+                engine=engine if engine in ENGINES else DEFAULT_ENGINE
             )
             db.session.add(new_keyword)
             created_count += 1
@@ -154,12 +166,48 @@ def get_keywords(current_user):
             'prev_ranking': keyword.prev_ranking,
             'prev_section': keyword.prev_section,
             'prev_ranking_status': keyword.prev_ranking_status,
+            'engine': keyword.engine,
+            'mobile_status': keyword.mobile_status,
+            'mobile_ranking': keyword.mobile_ranking,
+            'mobile_section': keyword.mobile_section,
+            'prev_mobile_ranking': keyword.prev_mobile_ranking,
+            'deep_check': keyword.deep_check,
+            'vertical_section': keyword.vertical_section,
+            'vertical_ranking': keyword.vertical_ranking,
+            'prev_vertical_ranking': keyword.prev_vertical_ranking,
             'last_checked_at': keyword.last_checked_at.isoformat() if keyword.last_checked_at else None
         }
         output.append(keyword_data)
     return json_response({'keywords': output})
 
 
+@keyword_bp.route('/keywords/export', methods=['GET'])
+@token_required
+def export_keywords(current_user):
+    """키워드 내려받기 - ?format=csv|xlsx, ?history=일수|all 이면 체크 실행별 순위 이력 (스트리밍)"""
+    fmt = request.args.get('format', 'csv').lower()
+    if fmt not in EXPORT_FORMATS:
+        return json_response({'message': "format 은 csv 또는 xlsx 입니다."}, status=400)
+
+    history = request.args.get('history')
+    if history:
+        try:
+            since = history_since(history)
+        except ValueError:
+            return json_response({'message': "history 는 일수(양의 정수) 또는 all 입니다."}, status=400)
+        header, query = history_export(current_user.id, since)
+        name, sheet_name = 'rank-history', '순위 이력'
+    else:
+        header, query = keyword_export(current_user.id)
+        name, sheet_name = 'keywords', '키워드'
+
+    rows = stream_rows(query)
+    body = iter_csv(header, rows) if fmt == 'csv' else iter_xlsx(header, rows, sheet_name)
+    filename = f"{name}-{utcnow().strftime('%Y%m%d')}.{fmt}"
+    return Response(stream_with_context(body), mimetype=EXPORT_FORMATS[fmt],
+                    headers={'Content-Disposition': f'attachment; filename="{filename}"'})
+
+
 @keyword_bp.route('/keywords/<int:keyword_id>/check', methods=['POST'])
 @token_required
 def check_keyword_ranking(current_user, keyword_id):
@@ -167,28 +215,25 @@ def check_keyword_ranking(current_user, keyword_id):
     if not keyword:
         return json_response({'message': 'Keyword not found or permission denied'}, status=404)
 
+    event = {'run_id': None, 'keyword_id': keyword.id}
     try:
         print(f"키워드 '{keyword.keyword_text}' 순위 확인 시작...")
+        progress_bus.publish(current_user.id, RUNNING, dict(event, keyword_text=keyword.keyword_text))
 
-        status, rank, section = run_check(keyword.keyword_text, keyword.post_url, keyword.post_title)
+        results = check_keyword(keyword)
+        status, rank, section = results[primary_engine(keyword.engine)]
 
         print(f"스크래핑 결과 - 상태: {status}, 순위: {rank}, 섹션: {section}")
 
-        # 현재 값을 이전 값으로 저장
-        keyword.prev_ranking = keyword.ranking
-        keyword.prev_section = keyword.section
-        keyword.prev_ranking_status = keyword.ranking_status
-
-        # 새 값으로 업데이트
-        keyword.ranking_status = status
-        keyword.ranking = rank
-        keyword.section = section
-        keyword.last_checked_at = datetime.now(timezone.utc)
+        apply_results(keyword, results)
 
         db.session.commit()
         print("DB 업데이트 완료")
+        progress_bus.publish(current_user.id, RESULT, dict(event, results=result_payload(results)))
 
-        if rank and rank > 0:
+        if rank and 0 < rank < 999 and keyword.engine == MOBILE:
+            response_message = f'순위 확인 완료. 모바일 {section} 카드로 {rank}위에 노출되고 있습니다.'
+        elif rank and 0 < rank < 999:
             response_message = f'순위 확인 완료. {section} 섹션에서 {rank}위에 노출되고 있습니다.'
         elif status == "노출X":
             response_message = f'순위 확인 완료. 현재 노출되지 않고 있습니다.'
@@ -198,13 +243,7 @@ def check_keyword_ranking(current_user, keyword_id):
         # 스프레드시트 동기화 (해당 유저의 전체 키워드)
         try:
             all_keywords = Keyword.query.filter_by(user_id=current_user.id).all()
-            kw_data = [{
-                'priority': k.priority, 'keyword_text': k.keyword_text,
-                'post_title': k.post_title, 'post_url': k.post_url,
-                'ranking_status': k.ranking_status, 'ranking': k.ranking,
-                'section': k.section, 'prev_ranking': k.prev_ranking,
-                'prev_section': k.prev_section, 'prev_ranking_status': k.prev_ranking_status
-            } for k in all_keywords]
+            kw_data = [keyword_sheet_row(k) for k in all_keywords]
             sync_to_spreadsheet(kw_data, current_user.email)
         except Exception as e:
             print(f"[스프레드시트] 동기화 오류 (무시): {e}")
@@ -213,12 +252,19 @@ def check_keyword_ranking(current_user, keyword_id):
             'message': response_message,
             'status': status,
             'ranking': rank,
-            'section': section
+            'section': section,
+            'engine': keyword.engine,
+            'mobile_status': keyword.mobile_status,
+            'mobile_ranking': keyword.mobile_ranking,
+            'mobile_section': keyword.mobile_section,
+            'vertical_section': keyword.vertical_section,
+            'vertical_ranking': keyword.vertical_ranking
         })
 
     except Exception as e:
         print(f"순위 확인 중 오류 발생: {str(e)}")
         traceback.print_exc()
+        progress_bus.publish(current_user.id, FAILED, dict(event, error=str(e)[:200]))
         return json_response({'message': f'순위 확인 중 오류가 발생했습니다: {str(e)}'}, status=500)
 
 
@@ -233,11 +279,22 @@ def update_keyword(current_user, keyword_id):
     if not data:
         return json_response({'message': 'Request body is missing!'}, status=400)
 
+    engine = data.get('engine', keyword.engine)
+    if engine not in ENGINES:
+        return json_response({'message': f"engine은 {', '.join(ENGINES)} 중 하나여야 합니다."}, status=400)
+
+    before = (keyword.keyword_text, keyword.post_url, keyword.post_title, keyword.engine)
     keyword.keyword_text = data.get('keyword_text', keyword.keyword_text)
     keyword.post_title = data.get('post_title', keyword.post_title)
     new_url = data.get('post_url')
     keyword.post_url = resolve_short_url(new_url) if new_url else keyword.post_url
     keyword.priority = data.get('priority', keyword.priority)
+    keyword.engine = engine
+    keyword.deep_check = bool(data.get('deep_check', keyword.deep_check))
+
+    # 검색 대상/엔진이 바뀌면 다음 스케줄 체크에 바로 포함
+    if (keyword.keyword_text, keyword.post_url, keyword.post_title, keyword.engine) != before:
+        keyword.next_check_at = None
 
     db.session.commit()
 
@@ -246,6 +303,8 @@ def update_keyword(current_user, keyword_id):
         'keyword_text': keyword.keyword_text,
         'post_url': keyword.post_url,
         'priority': keyword.priority,
+        'engine': keyword.engine,
+        'deep_check': keyword.deep_check,
     }
     return json_response({'message': 'Keyword updated successfully!', 'keyword': updated_keyword_data})
 
@@ -261,3 +320,45 @@ def delete_keyword(current_user, keyword_id):
     db.session.commit()
 
     return json_response({'message': f'Keyword with ID {keyword_id} has been deleted.'})
+
+
+@keyword_bp.route('/summary', methods=['GET'])
+@token_required
+def keyword_summary(current_user):
+    """대시보드 요약 - 미리 집계된 상태/섹션/우선순위별 개수, 순위 구간, 상승/하락 상위 (?top=10, ?refresh=1)"""
+    if request.args.get('refresh') == '1':
+        rebuild_summary(current_user.id)
+    return json_response(get_summary(current_user.id, request.args.get('top', TOP_MOVERS, type=int)))
+
+
+@keyword_bp.route('/events', methods=['GET'])
+@token_required
+def keyword_events(current_user):
+    """순위 체크 진행 스트림 (SSE) - 키워드별 queued / running / result / failed, 실행별 progress
+
+    버퍼가 넘치면 resync 이벤트가 오므로 그때만 목록을 다시 읽으면 된다.
+    """
+    from app.worker.queue import user_run_progress
+
+    if not progress_bus.can_subscribe(current_user.id):
+        return json_response({'message': '동시에 열 수 있는 진행 스트림 수를 넘었습니다.'}, status=429)
+
+    def snapshot():
+        try:
+            return user_run_progress(current_user.id)
+        finally:
+            # 스트림이 열려 있는 동안 트랜잭션/커넥션을 붙잡지 않도록
+            db.session.rollback()
+
+    return Response(stream_with_context(iter_events(current_user.id, snapshot)), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@keyword_bp.route('/scraper/status', methods=['GET'])
+@token_required
+def scraper_status(current_user):
+    """스크래퍼 차단 감지 서킷 브레이커 + 출구별 건강도/격리 상태 (이 프로세스 기준)"""
+    from .botwall import breaker
+    status = breaker.snapshot()
+    status['egresses'] = egress_pool.snapshot()
+    return json_response(status)
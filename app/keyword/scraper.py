@@ -1,5 +1,6 @@
 # app/keyword/scraper.py
 
+import os
 import time
 import random
 import urllib.parse
@@ -11,10 +12,23 @@ from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+from .matching import TitleIndex
+from .botwall import classify_serp, NORMAL, ERROR, LOADING
+from .egress import egress_pool
+from app.metrics import phase, observe_phase, record_check
+from app.profiling import profiled
+
+# 검색 주소 (벤치마크/테스트 시 로컬 목 서버로 교체)
+SEARCH_BASE_URL = os.environ.get('NAVER_SEARCH_BASE_URL', 'https://search.naver.com').rstrip('/')
+MOBILE_SEARCH_BASE_URL = os.environ.get('NAVER_MOBILE_SEARCH_BASE_URL', 'https://m.search.naver.com').rstrip('/')
 
 # --- 보조 함수들 ---
 CAFE_HOSTS = {"cafe.naver.com", "m.cafe.naver.com"}
 
+# 순위 카운트에서 제외할 섹션 (제목 기반)
+SKIP_SECTION_TITLES = ["광고", "AI 브리핑", "브랜드", "가격비교", "쇼핑", "스토어"]
+
 def extract_cafe_ids(url: str):
     """카페 URL에서 ID 추출"""
     try:
@@ -47,21 +61,27 @@ def url_matches(target_url: str, candidate_url: str) -> bool:
             return True
     return candidate_url.startswith(target_url[: min(len(target_url), 60)])
 
-def url_or_title_matches(target_url, target_title, href, link_text):
-    """URL 또는 제목으로 매칭"""
-    # URL 매칭
-    if url_matches(target_url, href):
-        return True
+def match_targets(targets, links):
+    """여러 대상 [(key, url, title), ...]을 SERP 링크 [(href, text), ...]와 한 번에 매칭
 
-    # 제목 매칭 (공백 등 정규화 후 비교)
-    if target_title and link_text:
-        normalized_target = "".join(target_title.split()).lower()
-        normalized_link = "".join(link_text.split()).lower()
-        if len(normalized_target) > 3 and len(normalized_link) > 3:
-            if normalized_target in normalized_link or normalized_link in normalized_target:
-                return True
+    제목은 n-gram 역색인으로 한 번에 점수를 매기고, URL은 제목 매칭 위치 앞쪽 링크만 비교한다.
+    반환: {key: URL/제목 중 처음 매칭된 링크 인덱스}
+    """
+    index = TitleIndex()
+    for key, _, title in targets:
+        index.add(key, title)
+    found = index.match_links(links) if len(index) else {}
 
-    return False
+    for key, url, _ in targets:
+        for idx, (href, _) in enumerate(links[:found.get(key, len(links))]):
+            if url_matches(url, href):
+                found[key] = idx
+                break
+    return found
+
+def match_first(post_url, post_title, links):
+    """대상 1개 매칭 - 처음 매칭된 링크 인덱스, 없으면 None"""
+    return match_targets([(0, post_url, post_title)], links).get(0)
 
 def human_sleep(a=0.8, b=1.8):
     """사람처럼 랜덤 대기"""
@@ -100,17 +120,59 @@ def is_content_url(href):
 
     return False
 
-def create_driver():
-    """Chrome WebDriver 생성"""
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36"
+
+# 재시도용 대체 User-Agent (차단/오류 후 다른 브라우저 지문으로 새 세션)
+RETRY_USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36 Edg/130.0.0.0",
+]
+
+# 브라우저 프로필 - default: 기존 설정 / lite: 이미지 차단 + DOM 로드 시점에 진행 (가벼운 렌더링)
+BROWSER_PROFILES = ('default', 'lite')
+BROWSER_PROFILE = os.environ.get('SCRAPER_BROWSER_PROFILE', 'default')
+
+def create_driver(user_agent=None, proxy=None, profile=None):
+    """Chrome WebDriver 생성 - proxy 지정 시 해당 출구로 접속"""
+    profile = profile or BROWSER_PROFILE
     options = webdriver.ChromeOptions()
     options.add_argument("--headless=new")
     options.add_argument("--window-size=1280,2200")
     options.add_argument("--disable-gpu")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-blink-features=AutomationControlled")
-    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36")
+    options.add_argument(f"user-agent={user_agent or DEFAULT_USER_AGENT}")
+    if proxy:
+        options.add_argument(f"--proxy-server={proxy}")
+    if profile == 'lite':
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.page_load_strategy = 'eager'
     return webdriver.Chrome(options=options)
 
+def classify_page(driver, loaded=False):
+    """현재 페이지 분류 (정상 SERP / 캡차 / 빈 페이지 / 오류 / 로딩 중)"""
+    has_main_pack = bool(driver.find_elements(By.ID, "main_pack"))
+    text = ""
+    if not has_main_pack:
+        text = driver.execute_script("return document.body ? document.body.innerText.slice(0, 3000) : ''") or ""
+    return classify_serp(driver.current_url, text, has_main_pack, loaded=loaded)
+
+def wait_for_serp(driver, timeout=10):
+    """main_pack 로딩 또는 차단/오류 페이지 판별까지 대기 - 캡차면 타임아웃을 기다리지 않고 바로 반환"""
+    try:
+        kind = None
+
+        def _ready(d):
+            nonlocal kind
+            kind = classify_page(d)
+            return kind != LOADING
+
+        WebDriverWait(driver, timeout, poll_frequency=0.25).until(_ready)
+        return kind
+    except TimeoutException:
+        return classify_page(driver, loaded=True)
+
 def extract_section_title(section):
     """섹션 제목 추출 - 2026 네이버 구조 대응"""
     try:
@@ -194,29 +256,61 @@ def extract_post_links(section):
     return results
 
 # --- 메인 실행 함수 ---
-def run_check(keyword: str, post_url: str, post_title: str = None) -> tuple:
-    """키워드 순위 확인 - 2026 네이버 통합검색 대응"""
-    print(f"--- '{keyword}' 순위 확인 시작 ---")
+@profiled('run_check', label=lambda keyword, *args, **kwargs: keyword)
+def run_check(keyword: str, post_url: str, post_title: str = None, fresh_session: bool = False) -> tuple:
+    """키워드 순위 확인 - 2026 네이버 통합검색 대응
+
+    fresh_session=True 면 재시도용으로 다른 User-Agent의 새 브라우저 세션을 사용
+    출구(프록시) 풀에서 속도 제한에 여유가 있는 건강한 출구를 골라 접속한다.
+    단계별 소요 시간과 결과는 /metrics 지표로 남긴다.
+    """
+    started = time.perf_counter()
+    result = _run_check(keyword, post_url, post_title, fresh_session)
+    record_check('pc', result[0], time.perf_counter() - started)
+    return result
+
+def _run_check(keyword, post_url, post_title, fresh_session):
+    print(f"--- '{keyword}' 순위 확인 시작{' (재시도)' if fresh_session else ''} ---")
+
+    # 모든 출구가 차단 감지로 격리 중이면 페이지를 열지 않고 바로 실패 처리 (재시도 패스로 넘어감)
+    with phase('acquire_egress'):
+        egress = egress_pool.acquire()
+    if egress is None:
+        print(f"[{keyword}] 차단 감지로 체크 보류 (사용 가능한 출구 없음)")
+        print(f"--- '{keyword}' 순위 확인 완료 ---\n")
+        return ("확인 실패", 999, None)
 
     driver = None
+    recorded = False
     try:
-        driver = create_driver()
+        with phase('driver_start'):
+            driver = create_driver(random.choice(RETRY_USER_AGENTS) if fresh_session else None, proxy=egress.proxy)
         q = urllib.parse.quote(keyword)
 
         # === 1단계: 통합검색(기본) 페이지에서 확인 ===
-        print(f"[{keyword}] 통합검색 페이지 접근 중...")
-        driver.get(f"https://search.naver.com/search.naver?query={q}")
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "main_pack")))
-        human_sleep()
+        print(f"[{keyword}] 통합검색 페이지 접근 중... (출구: {egress.name})")
+        with phase('navigate'):
+            driver.get(f"{SEARCH_BASE_URL}/search.naver?query={q}")
+        with phase('wait_serp'):
+            page_kind = wait_for_serp(driver)
+        egress.record(page_kind)
+        recorded = True
+        if page_kind != NORMAL:
+            print(f"[{keyword}] 정상 검색결과 아님 ({page_kind})")
+            return ("확인 실패", 999, None)
+        with phase('human_delay'):
+            human_sleep()
 
         # 페이지 끝까지 스크롤 (lazy-load 콘텐츠 로딩)
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight)")
-        time.sleep(1.5)
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight)")
-        time.sleep(1)
+        with phase('scroll'):
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight)")
+            time.sleep(1.5)
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight)")
+            time.sleep(1)
 
         # 통합검색에서 섹션별 확인
-        result = check_sections(driver, keyword, post_url, post_title)
+        with phase('sections'):
+            result = check_sections(driver, keyword, post_url, post_title)
         if result:
             return result
 
@@ -226,10 +320,13 @@ def run_check(keyword: str, post_url: str, post_title: str = None) -> tuple:
     except Exception as e:
         print(f"[{keyword}] 순위 확인 중 오류 발생: {str(e)}")
         traceback.print_exc()
+        if not recorded:
+            egress.record(ERROR)
         return ("확인 실패", 999, None)
     finally:
         if driver:
-            driver.quit()
+            with phase('driver_quit'):
+                driver.quit()
         print(f"--- '{keyword}' 순위 확인 완료 ---\n")
 
 def get_divider_y(driver):
@@ -247,21 +344,34 @@ def get_divider_y(driver):
             continue
     return None
 
+@profiled('check_sections', label=lambda driver, keyword, *args, **kwargs: keyword)
 def check_sections(driver, keyword, post_url, post_title):
-    """통합검색 페이지에서 윗탭/아랫탭 구분, 섹션(카드) 단위로 순위 확인"""
+    """통합검색 페이지에서 윗탭/아랫탭 구분, 섹션(카드) 단위로 순위 확인
+
+    DOM 추출(extract)과 매칭(match) 소요 시간을 나눠 지표로 남긴다.
+    """
+    timings = {'extract': 0.0, 'match': 0.0}
+    try:
+        return _check_sections(driver, keyword, post_url, post_title, timings)
+    finally:
+        for name, seconds in timings.items():
+            observe_phase(name, seconds)
+
+def _check_sections(driver, keyword, post_url, post_title, timings):
+    t = time.perf_counter()
     sections = driver.find_elements(By.CSS_SELECTOR, "#main_pack .sc_new")
     print(f"[{keyword}] {len(sections)}개 섹션 발견")
 
     divider_y = get_divider_y(driver)
     print(f"[{keyword}] 윗탭/아랫탭 경계 Y: {divider_y}")
-
-    # 순위 카운트에서 제외할 섹션 (제목 기반)
-    skip_titles = ["광고", "AI 브리핑", "브랜드", "가격비교", "쇼핑", "스토어"]
+    timings['extract'] += time.perf_counter() - t
 
     upper_rank = 0
     lower_rank = 0
 
     for section in sections:
+        t = time.perf_counter()
+        match_seconds = 0.0
         try:
             if not section.is_displayed() or section.size['height'] < 50:
                 continue
@@ -272,35 +382,38 @@ def check_sections(driver, keyword, post_url, post_title):
                 continue
 
             section_title = extract_section_title(section)
-            if any(sk in section_title for sk in skip_titles):
+            if any(sk in section_title for sk in SKIP_SECTION_TITLES):
                 continue
 
             section_y = section.location['y']
             is_upper = divider_y is not None and section_y < divider_y
 
+            # 윗탭/아랫탭 모두 보이는 섹션을 1개 카드=1순위로 카운트
             if is_upper:
-                # 윗탭: 모든 보이는 섹션을 1개 카드=1순위로 카운트
                 upper_rank += 1
-                post_links = extract_post_links(section)
-                if post_links:
-                    # 첫 번째(메인) 링크만 순위로 인정
-                    # 섹션 카드 안의 서브 링크(작은 관련글)는 무시
-                    href, text = post_links[0]
-                    if url_or_title_matches(post_url, post_title, href, text):
-                        print(f"[{keyword}] 윗탭 {upper_rank}위에서 발견!")
-                        return ("윗탭", upper_rank, "윗탭")
             else:
-                # 아랫탭: 모든 보이는 섹션을 1개 카드=1순위로 카운트
                 lower_rank += 1
-                post_links = extract_post_links(section)
-                if post_links:
-                    href, text = post_links[0]
-                    if url_or_title_matches(post_url, post_title, href, text):
-                        print(f"[{keyword}] 아랫탭 {lower_rank}위에서 발견!")
-                        return ("아랫탭", lower_rank, "아랫탭")
+            post_links = extract_post_links(section)
+            if not post_links:
+                continue
+
+            # 첫 번째(메인) 링크만 순위로 인정
+            # 섹션 카드 안의 서브 링크(작은 관련글)는 무시
+            m = time.perf_counter()
+            matched = match_first(post_url, post_title, post_links[:1]) is not None
+            match_seconds = time.perf_counter() - m
+            if matched:
+                if is_upper:
+                    print(f"[{keyword}] 윗탭 {upper_rank}위에서 발견!")
+                    return ("윗탭", upper_rank, "윗탭")
+                print(f"[{keyword}] 아랫탭 {lower_rank}위에서 발견!")
+                return ("아랫탭", lower_rank, "아랫탭")
 
         except Exception:
             continue
+        finally:
+            timings['match'] += match_seconds
+            timings['extract'] += time.perf_counter() - t - match_seconds
 
     return None
 
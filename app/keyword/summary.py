@@ -0,0 +1,240 @@
+# app/keyword/summary.py
+# 대시보드 요약 - 유저별 집계(KeywordStat)를 키워드/결과가 바뀔 때 증감으로 갱신
+#
+# 키워드마다 자신이 속한 (집계 차원, 구간) 목록(contribution)이 있고, 바뀔 때 이전 목록은 -1,
+# 새 목록은 +1 한다. ORM 으로 바뀌는 키워드(등록/수정/삭제/단건 체크)는 flush 훅이,
+# 워커의 일괄 기록(queue.complete_tasks)은 record_changes 를 직접 호출해 같은 트랜잭션에서 반영한다.
+# 조회는 유저별 집계 행 수십 개 + 인덱스로 상승/하락 상위만 읽으므로 키워드 수와 무관하다.
+# 증감은 rebuild_summary 로 한 번 전체 계산된(준비 표시 행이 있는) 유저에게만 반영한다 -
+# 기존 키워드가 있는 유저에게 증감만 쌓이면 집계가 틀어지므로, 그런 유저는 첫 조회 때 다시 계산한다.
+
+from collections import Counter
+from sqlalchemy import event, select, delete, insert, inspect, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models import db, Keyword, KeywordStat
+from .engines import MOBILE, primary_engine
+from .policy import FAILED_STATUS, NOT_RANKED
+
+PENDING_STATUS = '확인 대기'
+# 노출로 치지 않는 상태 (텔레그램 리포트 요약과 같은 기준)
+NOT_EXPOSED = ('노출X', FAILED_STATUS, PENDING_STATUS)
+# 순위 구간 (리포트 이모지 기준 🔥 1~3, ✅ 4~7)
+RANK_BUCKETS = ((3, '1-3'), (7, '4-7'), (10, '8-10'))
+TOP_MOVERS = 10
+MAX_TOP_MOVERS = 50
+# 집계 계산에 필요한 키워드 컬럼
+STAT_COLUMNS = (
+    'user_id', 'priority', 'engine',
+    'ranking_status', 'ranking', 'section', 'prev_ranking_status', 'prev_ranking',
+    'mobile_status', 'mobile_ranking', 'mobile_section', 'prev_mobile_status', 'prev_mobile_ranking',
+)
+_UPSERT_DIALECTS = {'postgresql': postgresql, 'sqlite': sqlite}
+# 집계 준비 표시 행 (rebuild_summary 만 씀)
+READY = ('ready', '')
+
+
+def is_exposed(status):
+    return (status or PENDING_STATUS) not in NOT_EXPOSED
+
+
+def _ranked(status, rank):
+    return is_exposed(status) and rank is not None and 0 < rank < NOT_RANKED
+
+
+def primary_state(kw):
+    """대표 엔진 기준 (상태, 순위, 섹션, 이전 상태, 이전 순위)"""
+    if primary_engine(kw.engine) == MOBILE:
+        return (kw.mobile_status, kw.mobile_ranking, kw.mobile_section,
+                kw.prev_mobile_status, kw.prev_mobile_ranking)
+    return kw.ranking_status, kw.ranking, kw.section, kw.prev_ranking_status, kw.prev_ranking
+
+
+def rank_bucket(status, rank):
+    if not _ranked(status, rank):
+        return 'none'
+    for limit, name in RANK_BUCKETS:
+        if rank <= limit:
+            return name
+    return f'{RANK_BUCKETS[-1][0] + 1}+'
+
+
+def last_change(kw):
+    """직전 체크 대비 순위 변화 (+ 상승) - 두 번 모두 노출된 경우만, 아니면 None"""
+    status, rank, _, prev_status, prev_rank = primary_state(kw)
+    if _ranked(status, rank) and _ranked(prev_status, prev_rank):
+        return prev_rank - rank
+    return None
+
+
+def movement(kw):
+    """직전 체크 대비 움직임 - up / down / same / entered / dropped, 비교 불가면 None"""
+    status, rank, _, prev_status, prev_rank = primary_state(kw)
+    if status in (None, FAILED_STATUS, PENDING_STATUS) or prev_status in (None, FAILED_STATUS, PENDING_STATUS):
+        return None
+    now_ranked, was_ranked = _ranked(status, rank), _ranked(prev_status, prev_rank)
+    if now_ranked and was_ranked:
+        return 'up' if rank < prev_rank else ('down' if rank > prev_rank else 'same')
+    if now_ranked:
+        return 'entered'
+    if was_ranked:
+        return 'dropped'
+    return None
+
+
+def contribution(kw):
+    """키워드 1개가 더하는 (차원, 구간) 목록"""
+    status, rank, section, _, _ = primary_state(kw)
+    status = status or PENDING_STATUS
+    items = [('total', ''), ('priority', kw.priority or '중'), ('engine', kw.engine or 'pc'),
+             ('status', status), ('rank', rank_bucket(status, rank))]
+    if is_exposed(status) and section:
+        items.append(('section', section[:100]))
+    moved = movement(kw)
+    if moved:
+        items.append(('movement', moved))
+    return items
+
+
+def _add(deltas, kw, sign):
+    for dimension, bucket in contribution(kw):
+        deltas[(kw.user_id, dimension, bucket)] += sign
+
+
+def apply_deltas(connection, deltas):
+    """집계 증감 반영 - 행이 없으면 만들고 있으면 더함 (동시 갱신에도 원자적)"""
+    rows = [{'user_id': u, 'dimension': d, 'bucket': b, 'count': n}
+            for (u, d, b), n in sorted(deltas.items()) if n]
+    if not rows:
+        return
+    table = KeywordStat.__table__
+    dialect = _UPSERT_DIALECTS.get(connection.dialect.name)
+    if dialect is not None:
+        stmt = dialect.insert(table)
+        connection.execute(stmt.on_conflict_do_update(
+            index_elements=['user_id', 'dimension', 'bucket'],
+            set_={'count': table.c.count + stmt.excluded['count']}), rows)
+        return
+    for row in rows:
+        updated = connection.execute(
+            update(table)
+            .where(table.c.user_id == row['user_id'], table.c.dimension == row['dimension'],
+                   table.c.bucket == row['bucket'])
+            .values(count=table.c.count + row['count'])
+        ).rowcount
+        if not updated:
+            connection.execute(insert(table), row)
+
+
+def _ready_users(connection, user_ids):
+    if not user_ids:
+        return set()
+    table = KeywordStat.__table__
+    return set(connection.execute(
+        select(table.c.user_id)
+        .where(table.c.user_id.in_(user_ids), table.c.dimension == READY[0], table.c.bucket == READY[1])
+    ).scalars())
+
+
+def record_changes(connection, changes):
+    """키워드 변경 목록 반영 - changes: [(이전 값, 새 값), ...] (등록이면 이전 None, 삭제면 새 값 None)
+
+    집계가 준비되지 않은 유저는 건너뜀 (첫 조회 때 전체 계산)
+    """
+    deltas = Counter()
+    for before, after in changes:
+        if before is not None:
+            _add(deltas, before, -1)
+        if after is not None:
+            _add(deltas, after, +1)
+    ready = _ready_users(connection, sorted({user_id for user_id, _, _ in deltas}))
+    apply_deltas(connection, Counter({key: n for key, n in deltas.items() if key[0] in ready}))
+
+
+# --- ORM 변경 추적 ---
+class _Committed:
+    """flush 직전(DB에 있던) 값으로 읽는 키워드 보기"""
+
+    def __init__(self, obj):
+        state = inspect(obj)
+        for col in STAT_COLUMNS:
+            history = state.attrs[col].history
+            setattr(self, col, history.deleted[0] if history.deleted else getattr(obj, col))
+
+
+@event.listens_for(Session, 'after_flush')
+def _track_keyword_changes(session, flush_context):
+    changes = [(None, obj) for obj in session.new if isinstance(obj, Keyword)]
+    changes += [(_Committed(obj), None) for obj in session.deleted if isinstance(obj, Keyword)]
+    changes += [(_Committed(obj), obj) for obj in session.dirty
+                if isinstance(obj, Keyword) and session.is_modified(obj)]
+    if changes:
+        record_changes(session.connection(), changes)
+
+
+# --- 조회 ---
+def rebuild_summary(user_id):
+    """유저 집계를 키워드에서 다시 계산 (집계가 없거나 어긋났을 때)"""
+    deltas = Counter({(user_id, 'total', ''): 0, (user_id, *READY): 1})
+    rows = db.session.execute(
+        select(*(Keyword.__table__.c[col] for col in STAT_COLUMNS))
+        .where(Keyword.user_id == user_id)
+        .execution_options(yield_per=1000)
+    )
+    for row in rows:
+        _add(deltas, row, +1)
+    db.session.execute(delete(KeywordStat).where(KeywordStat.user_id == user_id))
+    db.session.execute(insert(KeywordStat), [
+        {'user_id': u, 'dimension': d, 'bucket': b, 'count': n} for (u, d, b), n in deltas.items()
+    ])
+    db.session.commit()
+
+
+def _movers(user_id, direction, limit):
+    order = Keyword.last_change.desc() if direction > 0 else Keyword.last_change.asc()
+    cond = Keyword.last_change > 0 if direction > 0 else Keyword.last_change < 0
+    rows = db.session.execute(
+        select(Keyword.id, Keyword.keyword_text, Keyword.last_change, *(Keyword.__table__.c[col] for col in STAT_COLUMNS))
+        .where(Keyword.user_id == user_id, cond)
+        .order_by(order, Keyword.id)
+        .limit(limit)
+    ).all()
+    movers = []
+    for kw in rows:
+        status, rank, section, _, prev_rank = primary_state(kw)
+        movers.append({'id': kw.id, 'keyword_text': kw.keyword_text, 'engine': kw.engine,
+                       'change': kw.last_change, 'ranking': rank, 'prev_ranking': prev_rank, 'section': section})
+    return movers
+
+
+def get_summary(user_id, top=TOP_MOVERS):
+    """대시보드 요약 - 상태/섹션/우선순위/엔진별 개수, 순위 구간, 움직임, 상승/하락 상위"""
+    query = select(KeywordStat.dimension, KeywordStat.bucket, KeywordStat.count).where(KeywordStat.user_id == user_id)
+    rows = db.session.execute(query).all()
+    if (*READY, 1) not in rows:
+        rebuild_summary(user_id)
+        rows = db.session.execute(query).all()
+
+    stats = {}
+    for dimension, bucket, count in rows:
+        if count > 0 and (dimension, bucket) != READY:
+            stats.setdefault(dimension, {})[bucket] = count
+    total = stats.get('total', {}).get('', 0)
+    by_status = stats.get('status', {})
+    exposed = sum(count for status, count in by_status.items() if is_exposed(status))
+    top = max(min(top, MAX_TOP_MOVERS), 0)
+    return {
+        'total': total,
+        'exposed': exposed,
+        'not_exposed': total - exposed,
+        'by_status': by_status,
+        'by_section': stats.get('section', {}),
+        'by_priority': stats.get('priority', {}),
+        'by_engine': stats.get('engine', {}),
+        'rank_buckets': stats.get('rank', {}),
+        'movement': stats.get('movement', {}),
+        'top_movers': {
+            'up': _movers(user_id, +1, top) if top else [],
+            'down': _movers(user_id, -1, top) if top else [],
+        },
+    }
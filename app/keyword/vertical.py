@@ -0,0 +1,153 @@
+# app/keyword/vertical.py
+# 블로그/카페 탭 심층 순위 확인 - 통합검색 1페이지 밖의 글도 탭 순위로 추적
+
+import os
+import threading
+import time
+import traceback
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import requests
+from bs4 import BeautifulSoup
+from .botwall import classify_serp, ERROR, NORMAL
+from .egress import egress_pool
+from app.metrics import phase, record_check
+from .scraper import is_content_url, match_first, DEFAULT_USER_AGENT, CAFE_HOSTS, SEARCH_BASE_URL
+
+VERTICAL_SEARCH_URL = f'{SEARCH_BASE_URL}/search.naver'
+# 탭별 검색 파라미터 / 표시 이름
+TABS = {
+    'blog': ('blog', '블로그탭'),
+    'cafe': ('article', '카페탭'),
+}
+# 확인할 최대 페이지 수 / 페이지당 글 수 (start 파라미터 계산용)
+MAX_PAGES = int(os.environ.get('VERTICAL_MAX_PAGES', 3))
+PAGE_SIZE = int(os.environ.get('VERTICAL_PAGE_SIZE', 30))
+# 동시에 가져올 페이지 수
+CONCURRENCY = int(os.environ.get('VERTICAL_CONCURRENCY', 3))
+# 페이지 1개가 소모하는 출구 토큰 (브라우저 체크 1건 = 1)
+PAGE_COST = float(os.environ.get('VERTICAL_PAGE_COST', 0.25))
+
+
+def tab_for_url(post_url):
+    """게시물 URL로 확인할 탭 결정 - 블로그/카페 글이 아니면 None"""
+    try:
+        host = urllib.parse.urlparse(post_url or '').netloc.split(':')[0].lower()
+    except Exception:
+        return None
+    if host in CAFE_HOSTS:
+        return 'cafe'
+    if host.endswith('blog.naver.com'):
+        return 'blog'
+    return None
+
+
+def parse_vertical_page(html):
+    """탭 검색결과 -> (soup, [(href, 제목), ...]) 게시물 순서대로"""
+    soup = BeautifulSoup(html, 'html.parser')
+    main = soup.select_one('#main_pack')
+    links, seen = [], set()
+    for a in (main.select('a[href]') if main else []):
+        href = a['href']
+        text = a.get_text(' ', strip=True)
+        if not is_content_url(href) or len(text) <= 5:
+            continue
+        if href in seen:
+            continue
+        seen.add(href)
+        links.append((href, text))
+    return soup, links
+
+
+def _fetch_page(keyword, where, start, session):
+    """페이지 1개 조회 - 반환: 게시물 링크 목록, 차단/오류면 None"""
+    parsed = {}
+
+    def _classify(resp):
+        parsed['kind'] = ERROR
+        if resp.status_code in (403, 429) or resp.status_code >= 500:
+            return ERROR
+        soup, links = parse_vertical_page(resp.text)
+        parsed['links'] = links
+        has_main_pack = soup.select_one('#main_pack') is not None
+        text = '' if has_main_pack else soup.get_text(' ', strip=True)[:3000]
+        parsed['kind'] = classify_serp(resp.url, text, has_main_pack)
+        return parsed['kind']
+
+    with phase('vertical_page'):
+        egress_pool.request('GET', VERTICAL_SEARCH_URL, classify=_classify, session=session, cost=PAGE_COST,
+                            params={'where': where, 'query': keyword, 'start': start},
+                            headers={'User-Agent': DEFAULT_USER_AGENT})
+    if parsed.get('kind') != NORMAL:
+        return None
+    return parsed['links']
+
+
+def run_vertical_check(keyword, post_url, post_title=None, max_pages=MAX_PAGES):
+    """블로그/카페 탭에서 1~max_pages 페이지까지 순위 확인
+
+    페이지들을 동시에 가져오고, 글을 찾으면 그보다 앞 페이지만 마저 확인한 뒤 나머지는 취소한다.
+    순위는 탭 전체 기준 (start + 페이지 내 순서).
+    반환: (탭 이름, 순위) - 못 찾으면 순위 999, 탭 대상이 아니거나 확인 실패면 None
+    """
+    if not tab_for_url(post_url) or max_pages <= 0:
+        return None
+    started = time.perf_counter()
+    result = _run_vertical_check(keyword, post_url, post_title, max_pages)
+    status = '확인 실패' if result is None else ('노출X' if result[1] >= 999 else result[0])
+    record_check('vertical', status, time.perf_counter() - started)
+    return result
+
+
+def _run_vertical_check(keyword, post_url, post_title, max_pages):
+    tab = tab_for_url(post_url)
+    where, tab_name = TABS[tab]
+    starts = [1 + page * PAGE_SIZE for page in range(max_pages)]
+    session = requests.Session()
+    pool = ThreadPoolExecutor(max_workers=max(CONCURRENCY, 1), thread_name_prefix='vertical')
+    found = {}  # start -> 순위
+    failed = set()
+    lock = threading.Lock()
+
+    def _check(start):
+        links = _fetch_page(keyword, where, start, session)
+        if links is None:
+            return False
+        idx = match_first(post_url, post_title, links)
+        if idx is not None:
+            with lock:
+                found[start] = start + idx
+        return True
+
+    try:
+        pending = {pool.submit(_check, start): start for start in starts}
+        done_starts = set()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                start = pending.pop(future)
+                done_starts.add(start)
+                try:
+                    if not future.result():
+                        failed.add(start)
+                except Exception as e:
+                    print(f"[{tab_name}] [{keyword}] {start}번째부터 조회 실패: {e}")
+                    failed.add(start)
+            # 찾은 페이지보다 앞 페이지가 모두 끝났으면 나머지는 볼 필요 없음
+            if found:
+                first = min(found)
+                if all(s in done_starts for s in starts if s < first):
+                    if any(s < first for s in failed):
+                        return None  # 앞 페이지를 못 봤으면 순위를 확정할 수 없음
+                    print(f"[{tab_name}] [{keyword}] {found[first]}위에서 발견!")
+                    return (tab_name, found[first])
+    except Exception as e:
+        print(f"[{tab_name}] [{keyword}] 순위 확인 중 오류 발생: {e}")
+        traceback.print_exc()
+        return None
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    if failed:
+        return None
+    return (tab_name, 999)
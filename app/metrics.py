@@ -0,0 +1,105 @@
+# app/metrics.py
+# Prometheus 지표 - 체크 단계별 소요 시간, 결과/시트/텔레그램 카운터, /metrics 엔드포인트
+#
+# gunicorn 워커가 여러 개면 PROMETHEUS_MULTIPROC_DIR 를 지정해 워커별 지표를 파일로 모은다
+# (gunicorn.conf.py 가 디렉터리 준비/종료된 워커 정리를 담당).
+
+import os
+import time
+from contextlib import contextmanager
+from flask import Blueprint, Response, request
+from prometheus_client import (
+    CollectorRegistry, Counter, Histogram, REGISTRY, CONTENT_TYPE_LATEST, generate_latest, multiprocess
+)
+
+# 체크 단계 (브라우저 기동 ~ 수십 초) 에 맞춘 버킷
+PHASE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 3, 5, 8, 13, 21, 34, 60)
+CHECK_BUCKETS = (1, 2, 5, 8, 13, 21, 34, 55, 90, 150, 300)
+
+CHECK_PHASE_SECONDS = Histogram(
+    'keyword_check_phase_seconds', '순위 체크 단계별 소요 시간',
+    ['phase'], buckets=PHASE_BUCKETS
+)
+CHECK_SECONDS = Histogram(
+    'keyword_check_seconds', '순위 체크 1건 전체 소요 시간',
+    ['engine'], buckets=CHECK_BUCKETS
+)
+CHECK_OUTCOMES = Counter(
+    'keyword_check_outcomes_total', '순위 체크 결과',
+    ['engine', 'outcome']
+)
+SERP_RESPONSES = Counter(
+    'keyword_serp_responses_total', '검색결과 페이지 응답 분류 (정상/캡차/빈 페이지/오류)',
+    ['kind']
+)
+SHEET_SYNCS = Counter(
+    'sheet_syncs_total', '스프레드시트 동기화',
+    ['result']
+)
+SHEET_HISTORY_APPENDS = Counter(
+    'sheet_history_appends_total', '스프레드시트 이력 탭 추가 (실행당 1회)',
+    ['result']
+)
+TELEGRAM_SENDS = Counter(
+    'telegram_sends_total', '텔레그램 발송',
+    ['result']
+)
+
+# 결과 상태 -> 지표 라벨
+OUTCOME_LABELS = {
+    '윗탭': 'upper',
+    '아랫탭': 'lower',
+    '모바일': 'found',
+    '블로그탭': 'found',
+    '카페탭': 'found',
+    '노출X': 'not_found',
+    '확인 실패': 'failed',
+}
+
+# 설정 시 Authorization: Bearer <토큰> 이 있어야 /metrics 조회 가능
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+
+@contextmanager
+def phase(name):
+    """단계 소요 시간 측정 - with phase('navigate'): ..."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        CHECK_PHASE_SECONDS.labels(name).observe(time.perf_counter() - start)
+
+
+def observe_phase(name, seconds):
+    """여러 번에 나눠 측정한 단계 시간을 한 번에 기록"""
+    CHECK_PHASE_SECONDS.labels(name).observe(seconds)
+
+
+def record_check(engine, status, seconds):
+    """체크 1건 결과/소요 시간 기록"""
+    CHECK_SECONDS.labels(engine).observe(seconds)
+    CHECK_OUTCOMES.labels(engine, OUTCOME_LABELS.get(status, 'other')).inc()
+
+
+def record_result(counter, ok):
+    counter.labels('success' if ok else 'failure').inc()
+
+
+def render_metrics():
+    """현재 지표를 Prometheus 텍스트 형식으로 - 멀티프로세스 모드면 전 워커 합산"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry)
+
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def metrics():
+    if METRICS_TOKEN and request.headers.get('Authorization') != f'Bearer {METRICS_TOKEN}':
+        return Response('unauthorized', status=401)
+    return Response(render_metrics(), content_type=CONTENT_TYPE_LATEST)
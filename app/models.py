@@ -1,8 +1,20 @@
 # app/models.py
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
 
 db = SQLAlchemy()
 
+
+def apply_sqlite_pragmas(engine, pragmas):
+    """SQLite 연결이 열릴 때마다 PRAGMA 실행 (WAL, synchronous, busy_timeout 등)"""
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+
+
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), unique=True, nullable=False)
@@ -21,4 +33,99 @@ class Keyword(db.Model):
     post_title = db.Column(db.String(200), nullable=True)
     prev_ranking = db.Column(db.Integer, nullable=True)
     prev_section = db.Column(db.String(100), nullable=True)
-    prev_ranking_status = db.Column(db.String(50), nullable=True)
\ No newline at end of file
+    prev_ranking_status = db.Column(db.String(50), nullable=True)
+    rank_volatility = db.Column(db.Float, nullable=False, default=0.0)  # 최근 순위 변동성 (EWMA)
+    next_check_at = db.Column(db.DateTime, nullable=True, index=True)  # NULL 이면 즉시 체크 대상
+    engine = db.Column(db.String(10), nullable=False, default='pc')  # pc / mobile / both
+    mobile_status = db.Column(db.String(50), nullable=True)
+    mobile_ranking = db.Column(db.Integer, nullable=True)  # 모바일 카드 순서
+    mobile_section = db.Column(db.String(100), nullable=True)  # 모바일 카드 제목
+    prev_mobile_status = db.Column(db.String(50), nullable=True)
+    prev_mobile_ranking = db.Column(db.Integer, nullable=True)
+    prev_mobile_section = db.Column(db.String(100), nullable=True)
+    deep_check = db.Column(db.Boolean, nullable=False, default=False)  # 블로그/카페 탭 심층 확인
+    vertical_section = db.Column(db.String(20), nullable=True)  # 블로그탭 / 카페탭
+    vertical_ranking = db.Column(db.Integer, nullable=True)  # 탭 전체 기준 순위 (999 = 확인 범위 밖)
+    prev_vertical_ranking = db.Column(db.Integer, nullable=True)
+    last_change = db.Column(db.Integer, nullable=True)  # 직전 체크 대비 순위 변화 (+ 상승), 대표 엔진 기준
+
+    __table_args__ = (
+        db.Index('ix_keyword_user_last_change', 'user_id', 'last_change'),  # 유저별 상승/하락 상위
+    )
+
+class CheckRun(db.Model):
+    """순위 체크 실행 단위 (스케줄/수동 실행 1회)"""
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), nullable=False, default='scheduled')
+    status = db.Column(db.String(20), nullable=False, default='running')  # running / finished / failed
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)  # 특정 유저로 범위 제한 시
+    total_tasks = db.Column(db.Integer, nullable=False, default=0)
+    deadline_at = db.Column(db.DateTime, nullable=True)  # 이 시각까지 못 끝낼 작업은 연기
+    est_check_seconds = db.Column(db.Float, nullable=True)  # 계획 시 추정한 체크 1건 소요 시간
+    created_at = db.Column(db.DateTime, nullable=False)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+
+class CheckTask(db.Model):
+    """키워드 1개 체크 작업 - 워커가 lease를 잡고 처리"""
+    id = db.Column(db.Integer, primary_key=True)
+    run_id = db.Column(db.Integer, db.ForeignKey('check_run.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    keyword_id = db.Column(db.Integer, nullable=False)  # 키워드 삭제와 무관하게 유지
+    status = db.Column(db.String(20), nullable=False, default='queued', index=True)  # queued / leased / retry / done / failed / deferred
+    seq = db.Column(db.Integer, nullable=False, default=0)  # 처리 순서 (작을수록 먼저)
+    lease_owner = db.Column(db.String(100), nullable=True)
+    lease_expires_at = db.Column(db.DateTime, nullable=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    started_at = db.Column(db.DateTime, nullable=True)
+    retries = db.Column(db.Integer, nullable=False, default=0)  # '확인 실패' 후 재시도 횟수
+    retry_at = db.Column(db.DateTime, nullable=True)  # 재시도 가능 시각 (지수 백오프)
+    result_status = db.Column(db.String(50), nullable=True)
+    result_ranking = db.Column(db.Integer, nullable=True)
+    result_section = db.Column(db.String(100), nullable=True)
+    result_mobile_status = db.Column(db.String(50), nullable=True)
+    result_mobile_ranking = db.Column(db.Integer, nullable=True)
+    result_mobile_section = db.Column(db.String(100), nullable=True)
+    result_vertical_section = db.Column(db.String(20), nullable=True)
+    result_vertical_ranking = db.Column(db.Integer, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        db.Index('ix_check_task_user_finished', 'user_id', 'finished_at'),  # 유저별 순위 이력 내보내기
+    )
+
+
+class CheckRunUser(db.Model):
+    """실행별 유저 집계 - 유저 작업이 모두 끝나면 시트/텔레그램 1회 발송"""
+    id = db.Column(db.Integer, primary_key=True)
+    run_id = db.Column(db.Integer, db.ForeignKey('check_run.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending / reporting / reported
+    reported_at = db.Column(db.DateTime, nullable=True)
+
+
+class KeywordStat(db.Model):
+    """유저별 키워드 집계 (대시보드 요약) - 결과 기록 시 증감으로 갱신"""
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    dimension = db.Column(db.String(20), nullable=False)  # total / status / section / priority / engine / rank / movement
+    bucket = db.Column(db.String(100), nullable=False, default='')
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'dimension', 'bucket', name='uq_keyword_stat_bucket'),
+    )
+
+
+class JobLock(db.Model):
+    """스케줄 작업 리더 lease - 프로세스가 여러 개여도 회차당 1곳만 실행"""
+    name = db.Column(db.String(50), primary_key=True)
+    owner = db.Column(db.String(100), nullable=True)
+    run_key = db.Column(db.String(40), nullable=True)  # 예정 실행 회차 (UTC 예정 시각)
+    run_id = db.Column(db.Integer, nullable=True)
+    status = db.Column(db.String(20), nullable=False, default='idle')  # running / finished / failed
+    expires_at = db.Column(db.DateTime, nullable=True)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    error = db.Column(db.Text, nullable=True)
@@ -1,5 +1,6 @@
 # app/notification/routes.py
 
+import os
 from flask import Blueprint, request
 from app.auth.routes import token_required
 from app.utils import json_response
@@ -7,6 +8,14 @@ from app.notification.telegram import send_telegram_message
 
 notification_bp = Blueprint('notification', __name__)
 
+# 전체 유저 수동 체크({"scope": "all"})를 허용할 관리자 이메일 (쉼표 구분, 비어 있으면 아무도 불가)
+ADMIN_EMAILS = {e.strip().lower() for e in os.environ.get('ADMIN_EMAILS', '').split(',') if e.strip()}
+
+
+def is_admin(user):
+    """전체 유저 실행을 시작/조회할 수 있는 관리자인지 (ADMIN_EMAILS)"""
+    return bool(user.email) and user.email.lower() in ADMIN_EMAILS
+
 
 @notification_bp.route('/telegram/test', methods=['POST'])
 @token_required
@@ -24,12 +33,66 @@ def test_telegram(current_user):
 @notification_bp.route('/telegram/report', methods=['POST'])
 @token_required
 def manual_report(current_user):
-    """수동으로 전체 순위 체크 + 텔레그램 리포트 발송"""
-    from app.scheduler import check_all_keywords_and_notify
+    """수동 순위 체크 + 텔레그램 리포트 - 백그라운드 실행 후 run_id 반환
+
+    기본은 내 키워드만 체크하고, {"scope": "all"} 이면 전체 유저를 체크한다 (ADMIN_EMAILS 만).
+    같은 범위의 실행이 진행 중이면 새로 시작하지 않고 기존 실행의 run_id를 돌려준다.
+    PROFILE_ALLOW_REQUEST 설정 시 {"profile": true} 로 이번 실행을 프로파일링할 수 있다.
+    """
+    from app.scheduler import start_manual_check
+    from app.profiling import PROFILE_ALLOW_REQUEST
     from flask import current_app
 
+    data = request.get_json(silent=True) or {}
+    if data.get('scope') == 'all' and not is_admin(current_user):
+        return json_response({'message': '전체 체크는 관리자만 실행할 수 있습니다.'}, status=403)
+    user_id = None if data.get('scope') == 'all' else current_user.id
+    profile = PROFILE_ALLOW_REQUEST and bool(data.get('profile'))
+
     try:
-        check_all_keywords_and_notify(current_app._get_current_object())
-        return json_response({'message': '전체 순위 체크 및 리포트 발송 완료!'})
+        run_id, attached = start_manual_check(current_app._get_current_object(), user_id=user_id,
+                                              profile=profile)
+        message = '이미 진행 중인 순위 체크가 있습니다.' if attached else '순위 체크를 시작했습니다.'
+        return json_response({'message': message, 'run_id': run_id, 'attached': attached}, status=202)
     except Exception as e:
         return json_response({'message': f'리포트 발송 실패: {str(e)}'}, status=500)
+
+
+@notification_bp.route('/telegram/report/<int:run_id>', methods=['GET'])
+@token_required
+def manual_report_progress(current_user, run_id):
+    """순위 체크 실행 진행 현황"""
+    from app.models import db, CheckRun
+    from app.worker.queue import run_progress
+
+    run = db.session.get(CheckRun, run_id)
+    # 전체 유저 실행(user_id 없음)은 관리자만 조회 가능
+    allowed = run and (run.user_id == current_user.id if run.user_id is not None else is_admin(current_user))
+    if not allowed:
+        return json_response({'message': 'Run not found or permission denied'}, status=404)
+
+    progress = run_progress(run_id)
+    done = progress.get('done', 0) + progress.get('failed', 0)
+    return json_response({
+        'run_id': run.id,
+        'kind': run.kind,
+        'status': run.status,
+        'total': run.total_tasks,
+        'completed': done,
+        'progress': progress,
+        'created_at': run.created_at.isoformat() if run.created_at else None,
+        'finished_at': run.finished_at.isoformat() if run.finished_at else None
+    })
+
+
+@notification_bp.route('/scheduler/status', methods=['GET'])
+@token_required
+def scheduler_status(current_user):
+    """일일 순위 체크 실행 상태 (리더, 회차, 진행 현황)"""
+    from app.worker.leader import DAILY_JOB, job_state
+    from app.worker.queue import run_progress
+
+    state = job_state(DAILY_JOB)
+    if state.get('run_id'):
+        state['progress'] = run_progress(state['run_id'])
+    return json_response(state)
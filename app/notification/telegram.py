@@ -2,6 +2,8 @@
 
 import os
 import requests
+from app.metrics import TELEGRAM_SENDS, record_result
+from app.keyword.summary import is_exposed
 
 TELEGRAM_BOT_TOKEN = os.environ.get('TELEGRAM_BOT_TOKEN')
 TELEGRAM_CHAT_ID = os.environ.get('TELEGRAM_CHAT_ID')
@@ -27,15 +29,27 @@ def send_telegram_message(text, chat_id=None, bot_token=None):
         resp = requests.post(url, json=payload, timeout=10)
         if resp.status_code == 200:
             print("텔레그램 발송 성공")
+            record_result(TELEGRAM_SENDS, True)
             return True
         else:
             print(f"텔레그램 발송 실패: {resp.status_code} {resp.text}")
+            record_result(TELEGRAM_SENDS, False)
             return False
     except Exception as e:
         print(f"텔레그램 발송 오류: {e}")
+        record_result(TELEGRAM_SENDS, False)
         return False
 
 
+def _engine_detail(status, rank, section):
+    """순위 결과 한 줄 표시"""
+    if status == '노출X':
+        return '미노출'
+    if rank and rank < 999:
+        return f'{section} {rank}위'
+    return status or '확인 대기'
+
+
 def format_ranking_report(results):
     """순위 체크 결과를 텔레그램 리포트 형식으로 변환"""
     now_str = __import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M')
@@ -62,7 +76,17 @@ def format_ranking_report(results):
             prev_rank = r.get('prev_ranking')
 
             # 상태 이모지
-            if status == '노출X':
+            if r.get('deferred'):
+                emoji = '⏳'
+                if status == '노출X':
+                    detail = '체크 연기 (이전: 미노출)'
+                elif rank and rank < 999:
+                    detail = f'체크 연기 (이전: {section} {rank}위)'
+                else:
+                    detail = '체크 연기'
+                lines.append(f"{emoji} <b>{keyword}</b> — {detail}")
+                continue
+            elif status == '노출X':
                 emoji = '❌'
                 detail = '미노출'
             elif status == '확인 실패':
@@ -86,13 +110,31 @@ def format_ranking_report(results):
                 else:
                     change = f' (▼{abs(diff)})'
 
-            lines.append(f"{emoji} <b>{keyword}</b> — {detail}{change}")
+            # 재시도 표시
+            retry_note = f' 🔁{r["retries"]}' if r.get('retries') else ''
+
+            # 모바일 순위 (PC+모바일 함께 체크하는 키워드)
+            extra_note = ''
+            if r.get('engine') == 'both':
+                extra_note = f' | 📱 {_engine_detail(r.get("mobile_status"), r.get("mobile_ranking"), r.get("mobile_section"))}'
+            elif r.get('engine') == 'mobile':
+                detail = f'📱 {detail}'
+
+            # 블로그/카페 탭 순위 (심층 확인 키워드)
+            if r.get('vertical_section'):
+                v_rank = r.get('vertical_ranking')
+                extra_note += f" | {r['vertical_section']} {f'{v_rank}위' if v_rank and v_rank < 999 else '순위 밖'}"
+
+            lines.append(f"{emoji} <b>{keyword}</b> — {detail}{change}{extra_note}{retry_note}")
 
         lines.append("")
 
     # 요약
     total = len(results)
-    exposed = sum(1 for r in results if r['status'] not in ('노출X', '확인 실패', '확인 대기'))
+    exposed = sum(1 for r in results if is_exposed(r['status']))
     lines.append(f"<b>총 {total}개 키워드 | 노출 {exposed}개 | 미노출 {total - exposed}개</b>")
+    deferred = sum(1 for r in results if r.get('deferred'))
+    if deferred:
+        lines.append(f"<i>⏳ 시간/할당량 초과로 {deferred}개 키워드 체크 연기 (다음 실행에서 우선 체크)</i>")
 
     return "\n".join(lines)
@@ -0,0 +1,194 @@
+# app/profiling.py
+# 선택적 프로파일링 - 느린 체크/실행의 cProfile 또는 스택 샘플 덤프를 로컬 디렉터리에 저장
+#
+# PROFILE_MODE
+#   ''   (기본) 꺼짐 - 데코레이터가 원래 함수를 그대로 돌려주므로 오버헤드 없음
+#   run  실행(check_all_keywords_and_notify) 단위로 덤프
+#   slow 체크(run_check/check_sections) 중 PROFILE_SLOW_SECONDS 넘는 것만 덤프
+#   all  run + 모든 체크 덤프
+# PROFILE_KIND: cprofile (함수별 호출/시간) / sample (스택 샘플링, flamegraph용 collapsed 형식)
+# 보고서: python profile_report.py [--dir profiles] [--top 30]
+
+import cProfile
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+
+PROFILE_MODE = os.environ.get('PROFILE_MODE', '').strip().lower()
+PROFILE_KIND = os.environ.get('PROFILE_KIND', 'cprofile').strip().lower()
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+PROFILE_SLOW_SECONDS = float(os.environ.get('PROFILE_SLOW_SECONDS', 60))
+# 수동 실행 요청의 {"profile": true} 허용 여부
+PROFILE_ALLOW_REQUEST = bool(os.environ.get('PROFILE_ALLOW_REQUEST'))
+SAMPLE_INTERVAL = float(os.environ.get('PROFILE_SAMPLE_INTERVAL', 0.005))
+
+CHECK_MODES = ('slow', 'all')
+RUN_MODES = ('run', 'all')
+
+# 스레드별 프로파일링 중 여부 (cProfile은 스레드당 하나만 켤 수 있음)
+_local = threading.local()
+
+
+class StackSampler:
+    """대상 스레드의 호출 스택을 주기적으로 샘플링 (collapsed stack 형식으로 저장)"""
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self._thread_id = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread_id = threading.get_ident()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=1)
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def dump(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class _CProfiler:
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def dump(self, path):
+        self.profile.dump_stats(path)
+
+
+def _dump_path(name, elapsed):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    safe = re.sub(r'[^\w.-]+', '_', name)[:60]
+    ext = 'collapsed' if PROFILE_KIND == 'sample' else 'prof'
+    stamp = time.strftime('%Y%m%d-%H%M%S')
+    return os.path.join(PROFILE_DIR, f"{stamp}_{safe}_{elapsed:.1f}s_{os.getpid()}.{ext}")
+
+
+@contextmanager
+def profile_section(name, threshold=0.0):
+    """구간 프로파일링 - threshold(초) 이상 걸린 경우에만 덤프
+
+    같은 스레드에서 이미 프로파일링 중이면 (예: 실행 프로파일 안의 체크) 바깥 덤프에 포함되므로 건너뛴다.
+    """
+    if getattr(_local, 'active', False):
+        yield
+        return
+
+    profiler = StackSampler() if PROFILE_KIND == 'sample' else _CProfiler()
+    _local.active = True
+    started = time.perf_counter()
+    try:
+        profiler.start()
+    except ValueError:
+        # 다른 프로파일러가 이미 켜져 있음
+        _local.active = False
+        yield
+        return
+    try:
+        yield
+    finally:
+        profiler.stop()
+        _local.active = False
+        elapsed = time.perf_counter() - started
+        if elapsed >= threshold:
+            try:
+                path = _dump_path(name, elapsed)
+                profiler.dump(path)
+                print(f"[프로파일] {name} {elapsed:.1f}초 - {path}")
+            except Exception as e:
+                print(f"[프로파일] 덤프 실패: {e}")
+
+
+def profiled(name, modes=CHECK_MODES, label=None):
+    """함수 프로파일링 데코레이터 - PROFILE_MODE 가 modes 에 없으면 원래 함수 그대로 반환
+
+    label(*args, **kwargs) 로 덤프 파일 이름에 붙일 값(예: 키워드)을 정할 수 있다.
+    체크 단위 모드(slow)에서는 PROFILE_SLOW_SECONDS 넘는 호출만 덤프한다.
+    """
+    def decorator(fn):
+        if PROFILE_MODE not in modes:
+            return fn
+        threshold = PROFILE_SLOW_SECONDS if PROFILE_MODE == 'slow' else 0.0
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            section = f"{name}_{label(*args, **kwargs)}" if label else name
+            with profile_section(section, threshold):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# --- 보고서 ---
+def _collapsed_report(paths, top):
+    own, total = Counter(), Counter()
+    samples = 0
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                stack, _, count = line.rstrip('\n').rpartition(' ')
+                if not stack or not count.isdigit():
+                    continue
+                count = int(count)
+                frames = stack.split(';')
+                samples += count
+                own[frames[-1]] += count
+                for frame in set(frames):
+                    total[frame] += count
+    if not samples:
+        return
+    print(f"\n=== 스택 샘플 {len(paths)}개 파일, {samples}샘플 ===")
+    print(f"{'자체%':>7} {'누적%':>7}  함수")
+    for frame, count in own.most_common(top):
+        print(f"{count / samples:7.1%} {total[frame] / samples:7.1%}  {frame}")
+
+
+def report(directory=PROFILE_DIR, top=30, files=None, sort='cumulative'):
+    """덤프들을 합쳐 가장 오래 걸린 함수 순으로 출력"""
+    if files:
+        paths = list(files)
+    elif os.path.isdir(directory):
+        paths = sorted(os.path.join(directory, f) for f in os.listdir(directory))
+    else:
+        paths = []
+    prof = [p for p in paths if p.endswith('.prof')]
+    collapsed = [p for p in paths if p.endswith('.collapsed')]
+    if not prof and not collapsed:
+        print(f"[프로파일] '{directory}' 에 덤프가 없습니다.")
+        return
+
+    if prof:
+        print(f"=== cProfile {len(prof)}개 파일 ({sort} 순) ===")
+        stats = pstats.Stats(*prof)
+        stats.strip_dirs().sort_stats(sort).print_stats(top)
+    _collapsed_report(collapsed, top)
@@ -1,80 +1,214 @@
 # app/scheduler.py
 
-from datetime import datetime, timezone
-from app.models import db, Keyword, User
-from app.keyword.scraper import run_check
-from app.notification.telegram import send_telegram_message, format_ranking_report
-from app.spreadsheet.sync import sync_to_spreadsheet
+import threading
 import time
-import random
+from contextlib import nullcontext
+from app.models import db, JobLock, CheckRun
+from app.utils import utcnow
+from app.worker.queue import enqueue_run, requeue_owner_tasks, completed_keyword_ids
+from app.worker.runner import run_worker, make_worker_id
+from app.worker.coordinator import finalize_run
+from app.worker.planner import default_deadline, USER_QUOTA
+from app.profiling import profiled, profile_section, PROFILE_MODE, RUN_MODES
+from app.worker.leader import (
+    DAILY_JOB, DUE_JOB, DUE_INTERVAL_HOURS, current_run_key, interval_run_key,
+    acquire_job_lock, set_job_run, release_job_lock, LockKeeper
+)
 
 
-def check_all_keywords_and_notify(app):
-    """전체 키워드 순위 체크 후 텔레그램 알림"""
+def _enqueue(kind, user_id=None, due_only=False, deadline_at=None, quota=0):
+    """실행 등록 - 체크할 작업이 없는 유저는 바로 리포트/완료 처리"""
+    run_id = enqueue_run(kind, user_id=user_id, due_only=due_only, deadline_at=deadline_at, quota=quota).id
+    finalize_run(run_id)
+    return run_id
+
+
+@profiled('scheduled_run', modes=RUN_MODES)
+def check_all_keywords_and_notify(app, enqueue_only=False, run_id=None, owner=None):
+    """전체 키워드 순위 체크 후 텔레그램 알림
+
+    키워드별 작업을 큐에 등록한 뒤 이 프로세스도 워커로 참여한다.
+    별도 워커(worker.py)가 떠 있으면 작업을 나눠 처리하고,
+    유저별 시트 동기화/리포트는 마지막 작업을 끝낸 워커가 발송한다.
+    결과는 키워드마다 커밋되므로, run_id를 주면 기존 실행의 남은 작업만 이어서 처리한다.
+    체크 주기(next_check_at)가 돌아온 키워드만 체크하고, 리포트는 전체 키워드 기준으로 보낸다.
+    우선순위가 높고 오래된 키워드부터 처리하며, 마감(CHECK_RUN_BUDGET_MINUTES, 설정 시) 안에 못 끝낼
+    키워드는 연기하고 리포트에 표시한다. 유저 간에는 라운드로빈으로 섞어 처리하므로
+    키워드가 적은 유저는 큰 계정을 기다리지 않고 자기 작업이 끝나는 즉시 리포트를 받는다.
+    """
+    if run_id is None:
+        with app.app_context():
+            run_id = _enqueue('scheduled', due_only=True, deadline_at=default_deadline(), quota=USER_QUOTA)
+
+    if enqueue_only:
+        return run_id
+
+    run_worker(app, owner=owner, run_id=run_id, exit_when_idle=True)
+    return run_id
+
+
+def _snapshot(name):
+    """lease 획득 전 이전 보유 상태 (status, owner, run_id)"""
+    lock = db.session.get(JobLock, name)
+    if not lock:
+        return None
+    return lock.status, lock.owner, lock.run_id
+
+
+def _interrupted(prev, run_id):
+    """이전 보유자가 실행 중 죽었는지 (running 상태로 lease 만료 + 실행도 진행 중)"""
+    if not prev or not run_id or prev[0] != 'running':
+        return False
+    run = db.session.get(CheckRun, run_id)
+    return bool(run and run.status == 'running')
+
+
+def _resume_run(prev, run_id):
+    """중단된 실행 이어받기 - 이전 보유자가 잡고 있던 작업을 되돌리고 장부 현황 출력
+
+    이전 보유자가 실행 중 죽은 경우(running 상태로 lease 만료)에만 run_id를 반환한다.
+    """
+    if not _interrupted(prev, run_id):
+        return None
+    prev_owner = prev[1]
+    run = db.session.get(CheckRun, run_id)
+    requeued = requeue_owner_tasks(prev_owner, run_id)
+    done = len(completed_keyword_ids(run_id))
+    print(f"[스케줄러] run #{run_id} 이어서 처리 - 완료 {done}/{run.total_tasks}개, 회수 {requeued}개")
+    return run_id
+
+
+def run_scheduled_check(app, takeover_only=False, enqueue_only=False, wait=False):
+    """예정된 일일 체크를 리더 1곳에서만 실행
+
+    gunicorn 워커/cron 등 여러 프로세스가 동시에 호출해도 회차당 한 번만 돈다.
+    takeover_only=True 는 장애 복구용 - 보유자가 죽은 진행 중 회차만 인계받는다.
+    wait=True 면 같은 회차가 진행 중일 때 lease 만료까지 기다렸다가 인계를 시도한다
+    (cron 재시작 직후처럼 이전 프로세스의 lease가 아직 남아 있는 경우).
+    기다리는 동안 보유자가 lease를 연장했으면 살아 있는 것이므로 기다리지 않고 건너뛴다
+    (최대 lease 1회분만 기다림 - 정상 실행이 끝날 때까지 cron 이 붙잡혀 있지 않도록).
+    """
+    owner = make_worker_id()
+    run_key = current_run_key()
+
+    with app.app_context():
+        waited_until = None
+        while True:
+            prev = _snapshot(DAILY_JOB)
+            lock = acquire_job_lock(DAILY_JOB, owner, run_key, takeover_only=takeover_only)
+            if lock:
+                break
+            current = db.session.get(JobLock, DAILY_JOB)
+            if not (wait and current and current.status == 'running' and current.run_key == run_key):
+                if not takeover_only:
+                    print(f"[스케줄러] {run_key} 회차는 다른 프로세스가 실행 중이거나 완료됨 - 건너뜀")
+                return None
+            if waited_until is not None and current.expires_at and current.expires_at > waited_until:
+                print(f"[스케줄러] {run_key} 회차 보유자가 lease 연장 중 (정상 실행) - 건너뜀")
+                return None
+            waited_until = current.expires_at
+            remaining = (current.expires_at - utcnow()).total_seconds() if current.expires_at else 0
+            print(f"[스케줄러] {run_key} 회차 진행 중 - {max(remaining, 0):.0f}초 후 인계 시도")
+            db.session.rollback()
+            time.sleep(max(remaining, 0) + 1)
+            takeover_only = True
+
+        run_id = _resume_run(prev, lock.run_id)
+        if not run_id:
+            run_id = _enqueue('scheduled', due_only=True, deadline_at=default_deadline(), quota=USER_QUOTA)
+            set_job_run(DAILY_JOB, owner, run_id)
+
+    keeper = LockKeeper(app, DAILY_JOB, owner).start()
+    try:
+        check_all_keywords_and_notify(app, enqueue_only=enqueue_only, run_id=run_id, owner=owner)
+    except Exception as e:
+        keeper.stop()
+        with app.app_context():
+            release_job_lock(DAILY_JOB, owner, status='failed', error=str(e)[:1000])
+        raise
+    keeper.stop()
     with app.app_context():
-        users = User.query.all()
-
-        for user in users:
-            keywords = Keyword.query.filter_by(user_id=user.id).all()
-            if not keywords:
-                continue
-
-            print(f"[스케줄러] {user.email} - {len(keywords)}개 키워드 체크 시작")
-
-            results = []
-            for kw in keywords:
-                try:
-                    status, rank, section = run_check(kw.keyword_text, kw.post_url, kw.post_title)
-
-                    # 이전 값 저장
-                    kw.prev_ranking = kw.ranking
-                    kw.prev_section = kw.section
-                    kw.prev_ranking_status = kw.ranking_status
-
-                    # 새 값 업데이트
-                    kw.ranking_status = status
-                    kw.ranking = rank
-                    kw.section = section
-                    kw.last_checked_at = datetime.now(timezone.utc)
-
-                    results.append({
-                        'keyword_text': kw.keyword_text,
-                        'status': status,
-                        'ranking': rank,
-                        'section': section,
-                        'prev_ranking': kw.prev_ranking,
-                        'priority': kw.priority
-                    })
-
-                    # 네이버 차단 방지 딜레이
-                    time.sleep(random.uniform(3, 6))
-
-                except Exception as e:
-                    print(f"[스케줄러] '{kw.keyword_text}' 체크 실패: {e}")
-                    results.append({
-                        'keyword_text': kw.keyword_text,
-                        'status': '확인 실패',
-                        'ranking': 999,
-                        'section': None,
-                        'prev_ranking': kw.prev_ranking,
-                        'priority': kw.priority
-                    })
-
-            db.session.commit()
-
-            # 스프레드시트 동기화
-            if results:
-                kw_data = [{
-                    'priority': kw.priority, 'keyword_text': kw.keyword_text,
-                    'post_title': kw.post_title, 'post_url': kw.post_url,
-                    'ranking_status': kw.ranking_status, 'ranking': kw.ranking,
-                    'section': kw.section, 'prev_ranking': kw.prev_ranking,
-                    'prev_section': kw.prev_section, 'prev_ranking_status': kw.prev_ranking_status
-                } for kw in keywords]
-                sync_to_spreadsheet(kw_data, user.email)
-
-            # 텔레그램 발송
-            if results:
-                report = format_ranking_report(results)
-                send_telegram_message(report)
-                print(f"[스케줄러] {user.email} - 리포트 발송 완료")
+        release_job_lock(DAILY_JOB, owner, status='finished')
+    return run_id
+
+
+def run_due_check(app):
+    """중간 실행 - 체크 주기가 돌아온 키워드만 체크 (텔레그램 리포트 없음)
+
+    '상'/변동 큰 키워드를 하루 여러 번 보기 위한 실행으로, 일일 체크가 도는 중이면 건너뛴다.
+    리더가 중간에 죽어도 남은 키워드는 주기가 지난 상태로 남아 다음 회차에 다시 잡힌다.
+    """
+    owner = make_worker_id()
+    run_key = interval_run_key(DUE_INTERVAL_HOURS)
+
+    with app.app_context():
+        daily = db.session.get(JobLock, DAILY_JOB)
+        if daily and daily.status == 'running' and daily.expires_at and daily.expires_at > utcnow():
+            return None
+        if not acquire_job_lock(DUE_JOB, owner, run_key):
+            return None
+        run_id = _enqueue('due', due_only=True)
+        set_job_run(DUE_JOB, owner, run_id)
+
+    keeper = LockKeeper(app, DUE_JOB, owner).start()
+    status, error = 'finished', None
+    try:
+        run_worker(app, owner=owner, run_id=run_id, exit_when_idle=True)
+    except Exception as e:
+        status, error = 'failed', str(e)[:1000]
+        print(f"[스케줄러] 중간 실행 run #{run_id} 실패: {e}")
+    finally:
+        keeper.stop()
+        with app.app_context():
+            release_job_lock(DUE_JOB, owner, status=status, error=error)
+    return run_id
+
+
+def _manual_job_name(user_id):
+    return f"manual_report:{user_id if user_id is not None else 'all'}"
+
+
+def start_manual_check(app, user_id=None, profile=False):
+    """수동 체크를 백그라운드로 시작 (single-flight)
+
+    같은 범위(유저별 또는 전체)의 실행이 이미 진행 중이면 새로 시작하지 않고 그 실행에 붙는다.
+    이전 실행이 서버 재시작 등으로 중단됐으면 새로 만들지 않고 남은 작업부터 이어서 처리한다.
+    profile=True (또는 PROFILE_MODE=run/all) 면 실행 전체를 프로파일링해 덤프를 남긴다.
+    반환: (run_id, attached)
+    """
+    name = _manual_job_name(user_id)
+    owner = make_worker_id()
+
+    with app.app_context():
+        prev = _snapshot(name)
+        # lease 와 run_id 를 한 트랜잭션으로 기록 - 동시에 누른 요청이 run_id 없는 lease에 붙지 않도록
+        lock = acquire_job_lock(name, owner, run_key=utcnow().isoformat(), commit=False)
+        if not lock:
+            current = db.session.get(JobLock, name)
+            return (current.run_id if current else None), True
+        prev_run_id = prev[2] if prev else None
+        resume = _interrupted(prev, prev_run_id)
+        run_id = prev_run_id if resume else enqueue_run('manual', user_id=user_id, commit=False).id
+        set_job_run(name, owner, run_id)
+        if resume:
+            _resume_run(prev, run_id)
+        else:
+            finalize_run(run_id)
+
+    def _run():
+        keeper = LockKeeper(app, name, owner).start()
+        status, error = 'finished', None
+        profiling = profile or PROFILE_MODE in RUN_MODES
+        try:
+            with profile_section(f"manual_run_{run_id}") if profiling else nullcontext():
+                run_worker(app, owner=owner, run_id=run_id, exit_when_idle=True)
+        except Exception as e:
+            status, error = 'failed', str(e)[:1000]
+            print(f"[수동 체크] run #{run_id} 실패: {e}")
+        finally:
+            keeper.stop()
+            with app.app_context():
+                release_job_lock(name, owner, status=status, error=error)
+
+    threading.Thread(target=_run, daemon=True).start()
+    return run_id, False
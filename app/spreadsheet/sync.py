@@ -6,6 +6,7 @@ import json
 import gspread
 from google.oauth2.service_account import Credentials
 from datetime import datetime
+from app.metrics import SHEET_SYNCS, SHEET_HISTORY_APPENDS, phase, record_result
 
 SCOPES = [
     'https://www.googleapis.com/auth/spreadsheets',
@@ -15,6 +16,14 @@ SCOPES = [
 # 우선순위 정렬 순서
 PRIORITY_ORDER = {'상': 0, '중': 1, '하': 2}
 
+# 이력 탭 (선택) - 실행마다 체크한 키워드의 날짜/키워드/섹션/순위를 '<시트 이름> 이력' 탭에 이어 붙임
+SHEET_HISTORY = bool(os.environ.get('SHEET_HISTORY'))
+# 이력 탭 1개당 최대 행 수 - 넘기 전에 다음 탭('... 이력 2')으로 넘어감
+SHEET_HISTORY_MAX_ROWS = max(int(os.environ.get('SHEET_HISTORY_MAX_ROWS', 100000)), 3)
+# 스프레드시트 전체 셀 한도 (모든 유저의 순위 탭 + 이력 탭 합계) - 넘기 전에 이 유저의 가장 오래된 이력 탭을 지움
+SHEET_CELL_LIMIT = int(os.environ.get('SHEET_CELL_LIMIT', 10000000))
+HISTORY_HEADERS = ['날짜', '키워드', '섹션', '순위']
+
 
 def get_gspread_client():
     """서비스 계정으로 gspread 클라이언트 생성"""
@@ -36,8 +45,113 @@ def get_gspread_client():
         return None
 
 
-def sync_to_spreadsheet(keywords_data, user_email=None):
-    """키워드 순위 데이터를 구글 스프레드시트에 동기화"""
+def sync_to_spreadsheet(keywords_data, user_email=None, history=None):
+    """키워드 순위 데이터를 구글 스프레드시트에 동기화 (결과/소요 시간은 /metrics 지표로 기록)
+
+    history: 이번 실행에서 체크한 결과 목록 (리포트용 결과 형식) - SHEET_HISTORY 설정 시 이력 탭에 추가
+    """
+    with phase('sheet_sync'):
+        ok = _sync_to_spreadsheet(keywords_data, user_email, history if SHEET_HISTORY else None)
+    record_result(SHEET_SYNCS, ok)
+    return ok
+
+
+def history_rows(results, date_str):
+    """체크 결과 -> 이력 탭 행 [날짜, 키워드, 섹션, 순위]"""
+    rows = []
+    for r in results:
+        status, rank = r.get('status'), r.get('ranking')
+        if rank and rank < 999:
+            section = r.get('section') or ''
+        elif status == '노출X':
+            section, rank = '미노출', ''
+        else:
+            section, rank = status or '', ''
+        rows.append([date_str, r.get('keyword_text', ''), section, rank])
+    return rows
+
+
+def _history_tabs(sheets, base_name):
+    """유저의 이력 탭 [(번호, 워크시트), ...] - 오래된 순"""
+    prefix = f'{base_name} 이력'
+    tabs = []
+    for title, worksheet in sheets.items():
+        if title == prefix:
+            tabs.append((1, worksheet))
+        elif title.startswith(prefix + ' ') and title[len(prefix) + 1:].isdigit():
+            tabs.append((int(title[len(prefix) + 1:]), worksheet))
+    return sorted(tabs, key=lambda tab: tab[0])
+
+
+def _history_plan(tabs, base_name, rows):
+    """이어 쓸 탭별 행 나누기 [(워크시트 또는 새 탭 이름, 행 목록), ...]
+
+    마지막 탭에 남은 만큼 채우고, 나머지는 탭당 SHEET_HISTORY_MAX_ROWS 를 넘지 않게 새 탭으로 나눈다.
+    """
+    prefix = f'{base_name} 이력'
+    last, worksheet = tabs[-1] if tabs else (0, None)
+    plan, start = [], 0
+    if worksheet is not None and worksheet.row_count < SHEET_HISTORY_MAX_ROWS:
+        start = SHEET_HISTORY_MAX_ROWS - worksheet.row_count
+        plan.append((worksheet, rows[:start]))
+    # 새 탭은 빈 1행 + 헤더 1행으로 시작
+    per_tab = SHEET_HISTORY_MAX_ROWS - 2
+    while start < len(rows):
+        last += 1
+        plan.append((prefix if last == 1 else f'{prefix} {last}', rows[start:start + per_tab]))
+        start += per_tab
+    return plan
+
+
+def _make_room(spreadsheet, sheets, tabs, needed, keep):
+    """스프레드시트 전체 셀이 한도를 넘지 않도록 이 유저의 오래된 이력 탭부터 삭제 - 확보 못 하면 False"""
+    total = sum(ws.row_count * ws.col_count for ws in sheets.values())
+    for _, worksheet in tabs:
+        if total + needed <= SHEET_CELL_LIMIT:
+            break
+        if worksheet is keep:
+            continue
+        spreadsheet.del_worksheet(worksheet)
+        sheets.pop(worksheet.title, None)
+        total -= worksheet.row_count * worksheet.col_count
+        print(f"[스프레드시트] 셀 한도 때문에 오래된 이력 탭 '{worksheet.title}' 삭제")
+    return total + needed <= SHEET_CELL_LIMIT
+
+
+def _append_history(spreadsheet, sheets, base_name, results):
+    """이력 탭에 이번 실행 결과를 append_rows 로 추가 (탭 한도를 넘지 않으면 API 쓰기 1회)"""
+    rows = history_rows(results, datetime.now().strftime('%Y-%m-%d %H:%M'))
+    if not rows:
+        return True
+    cols = len(HISTORY_HEADERS)
+    try:
+        with phase('sheet_history'):
+            tabs = _history_tabs(sheets, base_name)
+            plan = _history_plan(tabs, base_name, rows)
+            new_tabs = sum(1 for target, _ in plan if isinstance(target, str))
+            keep = plan[0][0] if not isinstance(plan[0][0], str) else None
+            if not _make_room(spreadsheet, sheets, tabs, (len(rows) + 2 * new_tabs) * cols, keep):
+                raise RuntimeError(f'스프레드시트 셀 한도({SHEET_CELL_LIMIT}) 초과')
+            for target, chunk in plan:
+                if isinstance(target, str):
+                    # 새 탭이면 헤더도 같은 호출로
+                    worksheet = spreadsheet.add_worksheet(title=target, rows=1, cols=cols)
+                    sheets[target] = worksheet
+                    chunk = [HISTORY_HEADERS] + chunk
+                else:
+                    worksheet = target
+                worksheet.append_rows(chunk, value_input_option='RAW', insert_data_option='INSERT_ROWS',
+                                      table_range='A1')
+        print(f"[스프레드시트] '{worksheet.title}' 탭에 이력 {len(rows)}행 추가")
+        ok = True
+    except Exception as e:
+        print(f"[스프레드시트] 이력 추가 실패: {e}")
+        ok = False
+    record_result(SHEET_HISTORY_APPENDS, ok)
+    return ok
+
+
+def _sync_to_spreadsheet(keywords_data, user_email, history=None):
     spreadsheet_id = os.environ.get('GOOGLE_SPREADSHEET_ID')
     if not spreadsheet_id:
         print("[스프레드시트] GOOGLE_SPREADSHEET_ID 환경변수가 설정되지 않았습니다.")
@@ -52,17 +166,18 @@ def sync_to_spreadsheet(keywords_data, user_email=None):
 
         # 시트 이름: 사용자 이메일 또는 '키워드 순위'
         sheet_name = user_email or '키워드 순위'
-        try:
-            worksheet = spreadsheet.worksheet(sheet_name)
-        except gspread.exceptions.WorksheetNotFound:
-            worksheet = spreadsheet.add_worksheet(title=sheet_name, rows=500, cols=10)
+        # 탭 목록은 한 번만 조회 (현재 순위 탭 + 이력 탭)
+        sheets = {ws.title: ws for ws in spreadsheet.worksheets()}
+        worksheet = sheets.get(sheet_name)
+        if worksheet is None:
+            worksheet = spreadsheet.add_worksheet(title=sheet_name, rows=500, cols=12)
 
         # 우선순위 순으로 정렬
         sorted_data = sorted(keywords_data, key=lambda x: PRIORITY_ORDER.get(x.get('priority', '중'), 1))
 
         # 헤더
         now_str = datetime.now().strftime('%Y-%m-%d %H:%M')
-        headers = ['우선순위', '키워드', '글 제목', 'URL', '이전 상태', '이전 순위', '현재 상태', '현재 순위', '변동', f'마지막 확인: {now_str}']
+        headers = ['우선순위', '키워드', '글 제목', 'URL', '이전 상태', '이전 순위', '현재 상태', '현재 순위', '변동', '모바일 순위', '탭 순위', f'마지막 확인: {now_str}']
 
         # 데이터 행 생성
         rows = [headers]
@@ -92,6 +207,23 @@ def sync_to_spreadsheet(keywords_data, user_email=None):
             else:
                 prev_display = '-'
 
+            # 모바일 순위 (모바일 체크 키워드만)
+            mobile_display = ''
+            if kw.get('engine') in ('mobile', 'both'):
+                m_status, m_rank = kw.get('mobile_status'), kw.get('mobile_ranking')
+                if m_status == '노출X':
+                    mobile_display = '미노출'
+                elif m_rank and m_rank < 999:
+                    mobile_display = f"{kw.get('mobile_section', '')} {m_rank}위"
+                else:
+                    mobile_display = m_status or '확인 대기'
+
+            # 블로그/카페 탭 순위 (심층 확인 키워드만)
+            vertical_display = ''
+            if kw.get('vertical_section'):
+                v_rank = kw.get('vertical_ranking')
+                vertical_display = f"{kw['vertical_section']} {f'{v_rank}위' if v_rank and v_rank < 999 else '순위 밖'}"
+
             # 변동 계산
             change = ''
             if prev_rank and rank and prev_rank < 999 and rank < 999:
@@ -113,15 +245,21 @@ def sync_to_spreadsheet(keywords_data, user_email=None):
                 current_display,
                 rank if rank and rank < 999 else '',
                 change,
+                mobile_display,
+                vertical_display,
                 ''
             ])
 
+        # 열이 부족한 기존 시트는 확장
+        if worksheet.col_count < len(headers):
+            worksheet.add_cols(len(headers) - worksheet.col_count)
+
         # 시트 전체 업데이트 (기존 내용 덮어쓰기)
         worksheet.clear()
         worksheet.update(range_name='A1', values=rows)
 
         # 헤더 서식 (볼드 + 배경색)
-        worksheet.format('A1:J1', {
+        worksheet.format('A1:L1', {
             'textFormat': {'bold': True},
             'backgroundColor': {'red': 0.9, 'green': 0.9, 'blue': 0.95}
         })
@@ -129,6 +267,10 @@ def sync_to_spreadsheet(keywords_data, user_email=None):
         # 열 너비 자동 조정은 API 미지원이므로 패스
 
         print(f"[스프레드시트] '{sheet_name}' 시트에 {len(rows) - 1}개 키워드 동기화 완료")
+
+        # 이력 탭 실패는 현재 순위 동기화 결과와 별도로 기록
+        if history:
+            _append_history(spreadsheet, sheets, sheet_name, history)
         return True
 
     except Exception as e:
@@ -1,5 +1,6 @@
 # app/utils.py
 import json
+from datetime import datetime, timezone
 from flask import Response
 
 def json_response(data, status=200):
@@ -10,4 +11,8 @@ def json_response(data, status=200):
         json.dumps(data, ensure_ascii=False),
         status=status,
         mimetype='application/json; charset=utf-8'
-    )
\ No newline at end of file
+    )
+
+def utcnow():
+    """UTC 현재 시각 (DB DateTime 컬럼 비교용 naive 값)"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
@@ -0,0 +1,164 @@
+# app/worker/coordinator.py
+# 실행 코디네이터 - 유저별 작업 완료 집계 후 시트 동기화/텔레그램 발송
+
+from sqlalchemy import update, select, and_, func
+from app.models import db, Keyword, User, CheckRun, CheckTask, CheckRunUser
+from app.keyword.results import keyword_sheet_row
+from app.keyword.engines import PC, MOBILE, BOTH, primary_engine
+from app.keyword.progress import progress_bus
+from app.notification.telegram import send_telegram_message, format_ranking_report
+from app.spreadsheet.sync import sync_to_spreadsheet
+from app.utils import utcnow
+from .queue import open_task_count, REPORT_KINDS, OPEN_STATUSES
+
+
+def _claim_report(run_id, user_id):
+    """유저 리포트 발송권 선점 - 여러 워커 중 한 곳에서만 발송"""
+    claimed = db.session.execute(
+        update(CheckRunUser)
+        .where(CheckRunUser.run_id == run_id, CheckRunUser.user_id == user_id,
+               CheckRunUser.status == 'pending')
+        .values(status='reporting')
+        .execution_options(synchronize_session=False)
+    ).rowcount == 1
+    db.session.commit()
+    return claimed
+
+
+# 유저 결과 집계 시 한 번에 가져오는 행 수 (키워드가 수만 개여도 메모리 일정)
+RESULT_FETCH_SIZE = 1000
+
+
+def _user_result_rows(run_id, user_id):
+    """유저 키워드 + 이번 실행 작업 결과 - 외부 조인 1번으로 스트리밍 (ORM 객체 없이 행 단위)"""
+    task = CheckTask.__table__
+    query = (
+        select(*Keyword.__table__.c,
+               task.c.status.label('task_status'), task.c.retries.label('task_retries'),
+               task.c.result_status, task.c.result_ranking, task.c.result_section,
+               task.c.result_mobile_status, task.c.result_mobile_ranking, task.c.result_mobile_section)
+        .outerjoin(task, and_(task.c.keyword_id == Keyword.id, task.c.run_id == run_id))
+        .where(Keyword.user_id == user_id)
+        .order_by(Keyword.id)
+        .execution_options(yield_per=RESULT_FETCH_SIZE)
+    )
+    return db.session.execute(query)
+
+
+def build_results(run_id, user_id):
+    """실행 내 유저 결과 -> (리포트용 결과 목록, 시트용 키워드 목록)
+
+    이번 실행에서 체크한 키워드는 작업 결과를, 주기가 안 돼 건너뛰었거나 마감 때문에
+    연기된 키워드는 마지막으로 저장된 결과를 사용한다 (연기된 항목은 deferred 표시).
+    """
+    results, sheet_rows = [], []
+    for kw in _user_result_rows(run_id, user_id):
+        task_status = kw.task_status
+        stored = {PC: (kw.ranking_status, kw.ranking, kw.section),
+                  MOBILE: (kw.mobile_status, kw.mobile_ranking, kw.mobile_section)}
+        if task_status is None or task_status == 'deferred':
+            checked = stored
+        elif task_status == 'done':
+            checked = {PC: (kw.result_status, kw.result_ranking, kw.result_section),
+                       MOBILE: (kw.result_mobile_status, kw.result_mobile_ranking,
+                                kw.result_mobile_section)}
+        else:
+            checked = {PC: ('확인 실패', 999, None), MOBILE: ('확인 실패', 999, None)}
+
+        # 체크 도중 엔진 설정이 바뀌어 결과가 없는 엔진은 저장된 값 사용
+        checked = {e: r if r[0] is not None else stored[e] for e, r in checked.items()}
+        primary = primary_engine(kw.engine)
+        status, rank, section = checked[primary]
+        item = {
+            'keyword_text': kw.keyword_text,
+            'status': status,
+            'ranking': rank,
+            'section': section,
+            'prev_ranking': kw.prev_mobile_ranking if primary == MOBILE else kw.prev_ranking,
+            'priority': kw.priority,
+            'engine': kw.engine,
+            'deferred': task_status == 'deferred',
+            'checked': task_status == 'done',
+            'retries': kw.task_retries or 0
+        }
+        if kw.engine == BOTH:
+            item['mobile_status'], item['mobile_ranking'], item['mobile_section'] = checked[MOBILE]
+        if kw.deep_check and kw.vertical_section:
+            item['vertical_section'], item['vertical_ranking'] = kw.vertical_section, kw.vertical_ranking
+        results.append(item)
+        sheet_rows.append(keyword_sheet_row(kw))
+
+    return results, sheet_rows
+
+
+def finalize_user_if_done(run_id, user_id):
+    """유저의 작업이 모두 끝났으면 시트 동기화 + 텔레그램 리포트 (1회)"""
+    if open_task_count(run_id, user_id):
+        return False
+    if not _claim_report(run_id, user_id):
+        return False
+
+    run = db.session.get(CheckRun, run_id)
+    user = db.session.get(User, user_id)
+    results, kw_data = build_results(run_id, user_id)
+
+    # 스프레드시트 동기화
+    if results:
+        sync_to_spreadsheet(kw_data, user.email if user else None,
+                            history=[r for r in results if r['checked']])
+
+    # 텔레그램 발송 (주기 도래분만 도는 중간 실행은 제외)
+    if results and run.kind in REPORT_KINDS:
+        report = format_ranking_report(results)
+        send_telegram_message(report)
+        print(f"[스케줄러] {user.email if user else user_id} - 리포트 발송 완료")
+
+    db.session.execute(
+        update(CheckRunUser)
+        .where(CheckRunUser.run_id == run_id, CheckRunUser.user_id == user_id)
+        .values(status='reported', reported_at=utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    progress_bus.publish(user_id, 'run', {'run_id': run_id, 'kind': run.kind, 'status': 'reported'})
+    return True
+
+
+def finalize_run_if_done(run_id):
+    """실행의 모든 작업이 끝났으면 실행 종료 처리"""
+    if open_task_count(run_id):
+        return False
+    finished = db.session.execute(
+        update(CheckRun)
+        .where(CheckRun.id == run_id, CheckRun.status == 'running')
+        .values(status='finished', finished_at=utcnow())
+        .execution_options(synchronize_session=False)
+    ).rowcount == 1
+    db.session.commit()
+    if finished:
+        print(f"[작업큐] run #{run_id} 완료")
+    return finished
+
+
+def on_task_finished(run_id, user_id):
+    """작업 1개 종료 후 코디네이터 처리"""
+    finalize_user_if_done(run_id, user_id)
+    finalize_run_if_done(run_id)
+
+
+def finalize_run(run_id):
+    """체크할 작업이 없는 유저/실행까지 포함해 완료 처리 (등록 직후 호출)
+
+    남은 작업 수는 유저별로 한 번에 집계해 이미 끝난 유저만 마무리한다.
+    """
+    open_by_user = dict(
+        db.session.query(CheckTask.user_id, func.count(CheckTask.id))
+        .filter(CheckTask.run_id == run_id, CheckTask.status.in_(OPEN_STATUSES))
+        .group_by(CheckTask.user_id).all()
+    )
+    pending = [uid for (uid,) in db.session.query(CheckRunUser.user_id)
+               .filter_by(run_id=run_id, status='pending').all()]
+    for user_id in pending:
+        if not open_by_user.get(user_id):
+            finalize_user_if_done(run_id, user_id)
+    finalize_run_if_done(run_id)
@@ -0,0 +1,167 @@
+# app/worker/leader.py
+# 스케줄 작업 리더 선출 - DB lease로 회차당 한 프로세스만 실행, 보유자 다운 시 인계
+
+import os
+import threading
+from datetime import timedelta
+from sqlalchemy import and_, or_, update, case
+from sqlalchemy.exc import IntegrityError
+from app.models import db, JobLock
+from app.utils import utcnow
+
+LOCK_TTL_SECONDS = int(os.environ.get('SCHEDULER_LOCK_TTL_SECONDS', 120))
+
+DAILY_JOB = 'daily_ranking_check'
+DAILY_HOUR_UTC = 23  # UTC 23시 = KST 08시
+
+# 체크 주기가 돌아온 키워드만 도는 중간 실행
+DUE_JOB = 'due_ranking_check'
+DUE_INTERVAL_HOURS = int(os.environ.get('CHECK_DUE_INTERVAL_HOURS', 3))
+
+
+def current_run_key(now=None, hour=DAILY_HOUR_UTC):
+    """가장 최근 예정 시각(UTC) - 같은 회차를 구분하는 키"""
+    now = now or utcnow()
+    due = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+    if now < due:
+        due -= timedelta(days=1)
+    return due.strftime('%Y-%m-%dT%H:%M')
+
+
+def interval_run_key(hours, now=None):
+    """N시간 간격 실행의 회차 키 (UTC 기준 슬롯 시작 시각)"""
+    now = now or utcnow()
+    slot = now.replace(hour=(now.hour // hours) * hours, minute=0, second=0, microsecond=0)
+    return slot.strftime('%Y-%m-%dT%H:%M')
+
+
+def acquire_job_lock(name, owner, run_key, takeover_only=False, ttl=LOCK_TTL_SECONDS, commit=True):
+    """리더 lease 획득 - 성공 시 JobLock 반환, 실패 시 None
+
+    - 새 회차: 이전 회차가 끝났거나(running 아님) lease가 만료됐으면 획득
+    - 같은 회차 인계: running 상태인데 lease가 만료(보유자 다운)됐으면 획득, run_id 유지
+    - 같은 회차가 이미 끝났으면 다시 실행하지 않음
+    commit=False 면 획득한 lease를 커밋하지 않는다 - 호출측이 run_id 까지 기록한 뒤 함께 커밋
+    (그 사이 다른 프로세스는 행 잠금에서 기다리므로 run_id 없는 lease를 보지 않음)
+    """
+    now = utcnow()
+    expired = and_(JobLock.status == 'running', JobLock.expires_at < now)
+    same_run = JobLock.run_key == run_key
+    if takeover_only:
+        cond = and_(expired, same_run)
+    else:
+        new_run = and_(JobLock.status != 'running', or_(JobLock.run_key.is_(None), JobLock.run_key != run_key))
+        cond = or_(new_run, expired)
+
+    updated = db.session.execute(
+        update(JobLock)
+        .where(JobLock.name == name, cond)
+        .values(owner=owner, run_key=run_key, status='running', error=None,
+                run_id=case((same_run, JobLock.run_id), else_=None),
+                expires_at=now + timedelta(seconds=ttl), started_at=now, finished_at=None)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if commit or not updated:
+        db.session.commit()
+
+    if not updated:
+        if takeover_only or db.session.get(JobLock, name):
+            return None
+        try:
+            db.session.add(JobLock(name=name, owner=owner, run_key=run_key, status='running',
+                                   expires_at=now + timedelta(seconds=ttl), started_at=now))
+            if commit:
+                db.session.commit()
+            else:
+                db.session.flush()
+        except IntegrityError:
+            db.session.rollback()
+            return None
+
+    lock = db.session.get(JobLock, name)
+    db.session.refresh(lock)
+    return lock
+
+
+def renew_job_lock(name, owner, ttl=LOCK_TTL_SECONDS):
+    """lease 연장 - 보유 중이 아니면 False"""
+    ok = db.session.execute(
+        update(JobLock)
+        .where(JobLock.name == name, JobLock.owner == owner, JobLock.status == 'running')
+        .values(expires_at=utcnow() + timedelta(seconds=ttl))
+        .execution_options(synchronize_session=False)
+    ).rowcount == 1
+    db.session.commit()
+    return ok
+
+
+def set_job_run(name, owner, run_id):
+    """lease에 실행(run) id 기록 - 인계받은 프로세스가 이어서 처리"""
+    db.session.execute(
+        update(JobLock)
+        .where(JobLock.name == name, JobLock.owner == owner)
+        .values(run_id=run_id)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+
+
+def release_job_lock(name, owner, status='finished', error=None):
+    """lease 반납 - 회차 상태(finished/failed) 기록"""
+    db.session.execute(
+        update(JobLock)
+        .where(JobLock.name == name, JobLock.owner == owner)
+        .values(status=status, error=error, expires_at=None, finished_at=utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+
+
+def job_state(name):
+    """작업 상태 조회용 dict"""
+    lock = db.session.get(JobLock, name)
+    if not lock:
+        return {'name': name, 'status': 'idle'}
+    return {
+        'name': lock.name,
+        'status': lock.status,
+        'owner': lock.owner,
+        'run_key': lock.run_key,
+        'run_id': lock.run_id,
+        'started_at': lock.started_at.isoformat() if lock.started_at else None,
+        'finished_at': lock.finished_at.isoformat() if lock.finished_at else None,
+        'expires_at': lock.expires_at.isoformat() if lock.expires_at else None,
+        'error': lock.error
+    }
+
+
+class LockKeeper:
+    """리더 lease를 주기적으로 연장하는 백그라운드 스레드"""
+
+    def __init__(self, app, name, owner, ttl=LOCK_TTL_SECONDS):
+        self.app = app
+        self.name = name
+        self.owner = owner
+        self.ttl = ttl
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _loop(self):
+        while not self._stop.wait(max(self.ttl // 3, 1)):
+            try:
+                with self.app.app_context():
+                    if not renew_job_lock(self.name, self.owner, self.ttl):
+                        print(f"[리더] '{self.name}' lease 상실")
+                        return
+            except Exception as e:
+                print(f"[리더] lease 연장 실패: {e}")
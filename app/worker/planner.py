@@ -0,0 +1,102 @@
+# app/worker/planner.py
+# 실행 계획 - 과거 소요 시간으로 체크 비용을 추정하고, 마감 시각 안에 끝낼 순서/연기 대상을 결정
+
+import os
+from datetime import timedelta
+from app.models import db, CheckTask
+from app.utils import utcnow
+
+# 일일 체크 마감 (실행 시작 후 N분 안에 리포트까지 끝내기, 0 이면 마감 없이 전부 체크)
+# 켜면 추정 처리량을 넘는 키워드는 연기되므로 키워드 수/워커 수에 맞춰 설정할 것
+RUN_BUDGET_MINUTES = int(os.environ.get('CHECK_RUN_BUDGET_MINUTES', 0))
+# 동시에 처리하는 워커 수 (worker.py 개수 + 스케줄러 자신)
+PARALLEL_WORKERS = int(os.environ.get('CHECK_PARALLEL_WORKERS', 1))
+
+# 유저별 실행당 최대 체크 수 (0 이면 제한 없음) - 초과분은 연기
+USER_QUOTA = int(os.environ.get('CHECK_USER_QUOTA', 0))
+
+# 이력이 없을 때 기본값 (브라우저 기동 + 로딩 + 스크롤 + 차단 방지 딜레이)
+DEFAULT_CHECK_SECONDS = 25.0
+# 작업 사이 차단 방지 딜레이 평균 (runner의 3~6초)
+INTER_CHECK_DELAY = 4.5
+TIMING_SAMPLE = 200
+
+PRIORITY_WEIGHT = {'상': 3.0, '중': 2.0, '하': 1.0}
+# 체크한 적 없는 키워드의 경과 시간으로 간주할 값
+MAX_STALENESS_HOURS = 24 * 7
+
+
+def estimate_check_seconds():
+    """최근 완료 작업들의 평균 소요 시간 (+작업 간 딜레이)"""
+    rows = (db.session.query(CheckTask.started_at, CheckTask.finished_at)
+            .filter(CheckTask.status == 'done',
+                    CheckTask.started_at.isnot(None), CheckTask.finished_at.isnot(None))
+            .order_by(CheckTask.id.desc())
+            .limit(TIMING_SAMPLE)
+            .all())
+    durations = [(f - s).total_seconds() for s, f in rows if f >= s]
+    if not durations:
+        return DEFAULT_CHECK_SECONDS
+    return sum(durations) / len(durations) + INTER_CHECK_DELAY
+
+
+def urgency(priority, last_checked_at, now):
+    """우선순위가 높고 오래 체크 안 한 키워드일수록 큰 값"""
+    if last_checked_at is None:
+        hours = MAX_STALENESS_HOURS
+    else:
+        checked = last_checked_at.replace(tzinfo=None)
+        hours = min(max((now - checked).total_seconds() / 3600, 0), MAX_STALENESS_HOURS)
+    return PRIORITY_WEIGHT.get(priority, PRIORITY_WEIGHT['중']) * (1 + hours / 24)
+
+
+def interleave_users(rows, now, quota=0):
+    """유저 간 라운드로빈 순서 - 한 라운드에 유저마다 가장 급한 키워드 1개씩
+
+    키워드가 많은 유저 하나가 다른 유저들의 체크/리포트를 밀어내지 않도록 섞는다.
+    라운드 안에서는 급한 순으로 정렬한다. quota를 넘는 유저별 작업은 두 번째 값으로 반환.
+    반환: (섞인 rows, quota 초과 rows)
+    """
+    queues = {}
+    for row in sorted(rows, key=lambda r: -urgency(r[2], r[3], now)):
+        queues.setdefault(row[1], []).append(row)
+
+    over = []
+    if quota > 0:
+        for uid, queue in queues.items():
+            over.extend(queue[quota:])
+            del queue[quota:]
+
+    ordered = []
+    depth = max((len(q) for q in queues.values()), default=0)
+    for i in range(depth):
+        batch = [q[i] for q in queues.values() if i < len(q)]
+        batch.sort(key=lambda r: -urgency(r[2], r[3], now))
+        ordered.extend(batch)
+    return ordered, over
+
+
+def plan_run(rows, deadline_at=None, est_seconds=None, now=None, quota=0):
+    """작업 순서/연기 결정
+
+    rows: [(keyword_id, user_id, priority, last_checked_at), ...]
+    유저 간에는 라운드로빈, 유저 안에서는 급한 순으로 섞은 뒤 마감 안에 끝낼 수 있는
+    만큼만 남긴다 (연기 대상도 유저별로 고르게 나뉨). quota는 유저별 실행당 최대 체크 수.
+    반환: (순서대로 정렬된 rows, 연기할 rows)
+    """
+    now = now or utcnow()
+    ordered, deferred = interleave_users(rows, now, quota)
+    if deadline_at is None:
+        return ordered, deferred
+
+    est = est_seconds or DEFAULT_CHECK_SECONDS
+    budget = max((deadline_at - now).total_seconds(), 0)
+    capacity = int(budget / est) * max(PARALLEL_WORKERS, 1)
+    return ordered[:capacity], ordered[capacity:] + deferred
+
+
+def default_deadline(now=None):
+    """일일 체크 마감 시각 (CHECK_RUN_BUDGET_MINUTES 가 0 이면 None - 마감 없음)"""
+    if RUN_BUDGET_MINUTES <= 0:
+        return None
+    return (now or utcnow()) + timedelta(minutes=RUN_BUDGET_MINUTES)
@@ -0,0 +1,418 @@
+# app/worker/queue.py
+# 순위 체크 작업 큐 - DB lease 기반 (PostgreSQL: SKIP LOCKED, SQLite: 조건부 UPDATE)
+
+import os
+from datetime import timedelta
+from types import SimpleNamespace
+from sqlalchemy import and_, or_, select, update, insert, func, exists, bindparam
+from sqlalchemy.orm import aliased
+from app.models import db, Keyword, CheckRun, CheckTask, CheckRunUser
+from app.keyword.progress import progress_bus, QUEUED
+from app.keyword.policy import due_cutoff
+from app.utils import utcnow
+
+LEASE_SECONDS = int(os.environ.get('CHECK_LEASE_SECONDS', 300))
+MAX_ATTEMPTS = int(os.environ.get('CHECK_MAX_ATTEMPTS', 3))
+# '확인 실패' 재시도 - 실행 끝에 새 세션으로 지수 백오프 (30초, 60초, ...)
+MAX_RETRIES = int(os.environ.get('CHECK_MAX_RETRIES', 2))
+RETRY_BASE_SECONDS = int(os.environ.get('CHECK_RETRY_BASE_SECONDS', 30))
+# 결과 일괄 기록 시 한 트랜잭션(UPDATE 1문장)에 넣는 작업 수
+RESULT_CHUNK = int(os.environ.get('CHECK_RESULT_CHUNK', 500))
+
+OPEN_STATUSES = ('queued', 'leased', 'retry')
+# 유저별 텔레그램 리포트를 보내는 실행 종류 (due: 주기 도래분만 체크하는 중간 실행)
+REPORT_KINDS = ('scheduled', 'manual')
+
+
+def _dialect():
+    return db.session.get_bind().dialect.name
+
+
+def enqueue_run(kind='scheduled', user_id=None, due_only=False, deadline_at=None, quota=0, commit=True):
+    """실행(run) 생성 후 대상 키워드를 작업으로 등록
+
+    due_only=True 면 다음 체크 시각(next_check_at)이 지난 키워드만 등록한다. 리포트 대상 실행은
+    실행 마감 안에 돌아올 키워드까지 포함한다 (policy.DUE_TOLERANCE_MINUTES).
+    작업은 유저 간 라운드로빈 + 우선순위/경과 시간 순으로 정렬되며, deadline_at 이 있으면
+    추정 소요 시간으로 마감 안에 못 끝낼 작업과 유저별 quota 초과분은 처음부터
+    연기(deferred) 상태로 등록한다.
+    리포트 대상 실행(REPORT_KINDS)은 체크할 키워드가 없는 유저도 집계 대상에 넣어
+    리포트를 받도록 한다.
+    commit=False 면 커밋은 호출측이 한다 (리더 lease 와 같은 트랜잭션으로 기록할 때).
+    """
+    from .planner import plan_run, estimate_check_seconds
+
+    query = db.session.query(Keyword.id, Keyword.user_id, Keyword.priority, Keyword.last_checked_at)
+    if user_id is not None:
+        query = query.filter(Keyword.user_id == user_id)
+    if due_only:
+        cutoff = due_cutoff(utcnow(), tolerance=kind in REPORT_KINDS)
+        query = query.filter(or_(Keyword.next_check_at.is_(None), Keyword.next_check_at <= cutoff))
+    rows = query.order_by(Keyword.user_id, Keyword.id).all()
+
+    est = estimate_check_seconds()
+    planned, deferred = plan_run(rows, deadline_at=deadline_at, est_seconds=est, quota=quota)
+
+    user_ids = {r[1] for r in rows}
+    if kind in REPORT_KINDS:
+        owners = db.session.query(Keyword.user_id).distinct()
+        if user_id is not None:
+            owners = owners.filter(Keyword.user_id == user_id)
+        user_ids |= {uid for (uid,) in owners.all()}
+
+    run = CheckRun(kind=kind, user_id=user_id, status='running', total_tasks=len(rows),
+                   deadline_at=deadline_at, est_check_seconds=est, created_at=utcnow())
+    db.session.add(run)
+    db.session.flush()
+
+    tasks = [{'run_id': run.id, 'user_id': r[1], 'keyword_id': r[0], 'status': 'queued',
+              'seq': seq, 'attempts': 0} for seq, r in enumerate(planned)]
+    tasks += [{'run_id': run.id, 'user_id': r[1], 'keyword_id': r[0], 'status': 'deferred',
+               'seq': len(planned) + seq, 'attempts': 0} for seq, r in enumerate(deferred)]
+    if tasks:
+        db.session.execute(insert(CheckTask), tasks)
+    if user_ids:
+        db.session.execute(insert(CheckRunUser), [
+            {'run_id': run.id, 'user_id': uid, 'status': 'pending'}
+            for uid in sorted(user_ids)
+        ])
+
+    if commit:
+        db.session.commit()
+    _publish_queued(run, planned)
+    print(f"[작업큐] run #{run.id} ({kind}) - {len(planned)}개 작업 등록 (체크당 약 {est:.0f}초)")
+    if deferred:
+        print(f"[작업큐] 경고: run #{run.id} - 마감/할당량 초과로 {len(deferred)}개 키워드 연기 "
+              f"(CHECK_RUN_BUDGET_MINUTES / CHECK_USER_QUOTA 확인)")
+    return run
+
+
+def _publish_queued(run, planned):
+    """진행 스트림 구독 중인 유저에게 실행 시작 + 등록된 키워드 알림"""
+    by_user = {}
+    for r in planned:
+        if progress_bus.has_subscribers(r[1]):
+            by_user.setdefault(r[1], []).append(r[0])
+    for uid, keyword_ids in by_user.items():
+        progress_bus.publish(uid, 'run', {'run_id': run.id, 'kind': run.kind, 'status': 'started',
+                                          'total': len(keyword_ids)})
+        progress_bus.publish_many(uid, QUEUED, ({'run_id': run.id, 'keyword_id': kid} for kid in keyword_ids))
+
+
+def defer_past_deadline():
+    """마감 전에 끝낼 수 없는 대기 작업을 연기 처리 - 실행이 마감을 넘기지 않도록
+
+    반환: 작업이 연기된 run_id 목록 (코디네이터 마무리용)
+    """
+    now = utcnow()
+    runs = CheckRun.query.filter(CheckRun.status == 'running', CheckRun.deadline_at.isnot(None)).all()
+    affected = []
+    for run in runs:
+        est = timedelta(seconds=run.est_check_seconds or 0)
+        if now + est < run.deadline_at:
+            continue
+        count = db.session.execute(
+            update(CheckTask)
+            .where(CheckTask.run_id == run.id, CheckTask.status.in_(('queued', 'retry')))
+            .values(status='deferred', finished_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if count:
+            print(f"[작업큐] 경고: run #{run.id} 마감 임박 - 남은 {count}개 작업 연기")
+            affected.append(run.id)
+    db.session.commit()
+    return affected
+
+
+def _available(now):
+    """lease 가능한 작업 조건
+
+    - 대기 중이거나 lease가 만료된 작업
+    - 재시도 작업은 백오프 시각이 지났고 같은 실행의 대기 작업이 모두 나간 뒤 (실행 끝 재시도 패스)
+    """
+    other = aliased(CheckTask)
+    main_pass_left = exists().where(other.run_id == CheckTask.run_id, other.status == 'queued')
+    return or_(
+        CheckTask.status == 'queued',
+        and_(CheckTask.status == 'leased', CheckTask.lease_expires_at < now),
+        and_(CheckTask.status == 'retry', CheckTask.retry_at <= now, ~main_pass_left)
+    )
+
+
+def reclaim_expired_leases():
+    """만료된 lease 회수 - 재시도 한도를 넘긴 작업은 실패 처리
+
+    반환: 작업이 실패 처리된 (run_id, user_id) 목록 (코디네이터 마무리용 -
+    실행의 마지막 작업이 이렇게 끝나도 리포트/실행 종료가 빠지지 않도록)
+    """
+    now = utcnow()
+    expired = and_(CheckTask.status == 'leased', CheckTask.lease_expires_at < now)
+    exhausted = db.session.execute(
+        select(CheckTask.id, CheckTask.run_id, CheckTask.user_id)
+        .where(expired, CheckTask.attempts >= MAX_ATTEMPTS)
+    ).all()
+    failed = 0
+    if exhausted:
+        failed = db.session.execute(
+            update(CheckTask)
+            .where(CheckTask.id.in_([row.id for row in exhausted]), expired)
+            .values(status='failed', error='lease 만료 (재시도 한도 초과)', finished_at=now, lease_owner=None)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+    requeued = db.session.execute(
+        update(CheckTask)
+        .where(expired)
+        .values(status='queued', lease_owner=None, lease_expires_at=None)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+    if failed or requeued:
+        print(f"[작업큐] 만료 lease 회수 - 재등록 {requeued}개, 실패 {failed}개")
+    return list(dict.fromkeys((row.run_id, row.user_id) for row in exhausted))
+
+
+def lease_tasks(owner, limit=1, run_id=None, lease_seconds=LEASE_SECONDS):
+    """작업 lease 획득 - 다른 워커가 잡은 작업은 건너뜀"""
+    now = utcnow()
+    expires = now + timedelta(seconds=lease_seconds)
+    cond = [_available(now)]
+    if run_id is not None:
+        cond.append(CheckTask.run_id == run_id)
+
+    if _dialect() == 'postgresql':
+        tasks = (CheckTask.query.filter(*cond)
+                 .order_by(CheckTask.seq, CheckTask.id)
+                 .limit(limit)
+                 .with_for_update(skip_locked=True)
+                 .all())
+        for task in tasks:
+            task.status = 'leased'
+            task.lease_owner = owner
+            task.lease_expires_at = expires
+            task.attempts = task.attempts + 1
+            task.started_at = now
+        db.session.commit()
+        return tasks
+
+    # SQLite 등: 단일 UPDATE 문으로 선점 (쓰기 직렬화로 원자성 보장)
+    candidates = select(CheckTask.id).where(*cond).order_by(CheckTask.seq, CheckTask.id).limit(limit)
+    db.session.execute(
+        update(CheckTask)
+        .where(CheckTask.id.in_(candidates.scalar_subquery()), _available(now))
+        .values(status='leased', lease_owner=owner, lease_expires_at=expires,
+                attempts=CheckTask.attempts + 1, started_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return (CheckTask.query
+            .filter_by(lease_owner=owner, status='leased')
+            .filter(CheckTask.lease_expires_at == expires)
+            .order_by(CheckTask.seq, CheckTask.id)
+            .all())
+
+
+def heartbeat(owner, task_ids, lease_seconds=LEASE_SECONDS):
+    """처리 중인 작업의 lease 연장 - 연장된 작업 수 반환"""
+    if not task_ids:
+        return 0
+    count = db.session.execute(
+        update(CheckTask)
+        .where(CheckTask.id.in_(task_ids), CheckTask.lease_owner == owner, CheckTask.status == 'leased')
+        .values(lease_expires_at=utcnow() + timedelta(seconds=lease_seconds))
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+    return count
+
+
+def _finish(task_id, owner, **values):
+    """lease 보유 중일 때만 작업 종료 처리 - 성공 여부 반환 (커밋은 호출측)"""
+    return db.session.execute(
+        update(CheckTask)
+        .where(CheckTask.id == task_id, CheckTask.lease_owner == owner, CheckTask.status == 'leased')
+        .values(finished_at=utcnow(), **values)
+        .execution_options(synchronize_session=False)
+    ).rowcount == 1
+
+
+def _result_params(task_id, results):
+    pc = results.get('pc') or (None, None, None)
+    mobile = results.get('mobile') or (None, None, None)
+    vertical = results.get('vertical') or (None, None)
+    return {
+        'b_task_id': task_id,
+        'b_status': pc[0], 'b_ranking': pc[1], 'b_section': pc[2],
+        'b_mobile_status': mobile[0], 'b_mobile_ranking': mobile[1], 'b_mobile_section': mobile[2],
+        'b_vertical_section': vertical[0], 'b_vertical_ranking': vertical[1],
+    }
+
+
+def complete_tasks(owner, completions):
+    """작업 여러 개 완료 - 작업 상태와 키워드 결과를 청크당 한 트랜잭션으로 일괄 기록
+
+    completions: [(task_id, results), ...] 또는 [(task_id, results, 체크 끝난 시각), ...]
+    results: {'pc': (상태, 순위, 섹션), 'mobile': (...), 'vertical': (탭, 순위)} - 체크한 것만
+    체크 끝난 시각이 있으면 작업 종료 시각(finished_at)으로 기록한다 - 모아서 기록할 때 기록 시각을 쓰면
+    소요 시간 추정(planner.estimate_check_seconds)이 부풀려지므로.
+    청크마다 작업 종료 UPDATE 1문장(executemany), 키워드 현재 값 SELECT 1번, 키워드 UPDATE 1문장
+    으로 처리하고 ORM 객체를 만들지 않으므로 청크 크기만큼만 메모리를 쓴다.
+    대시보드 요약 집계도 같은 트랜잭션에서 증감으로 반영한다.
+    lease 를 잃은 작업의 결과는 버린다.
+    반환: 기록에 성공한 task_id 집합
+    """
+    from app.keyword.results import result_values, RESULT_COLUMNS, RESULT_INPUT_COLUMNS
+    from app.keyword.summary import record_changes
+
+    tasks = CheckTask.__table__
+    keywords = Keyword.__table__
+    finish_task = (
+        update(tasks)
+        .where(tasks.c.id == bindparam('b_task_id'), tasks.c.lease_owner == owner, tasks.c.status == 'leased')
+        .values(status='done', finished_at=bindparam('b_finished_at'),
+                result_status=bindparam('b_status'), result_ranking=bindparam('b_ranking'),
+                result_section=bindparam('b_section'),
+                result_mobile_status=bindparam('b_mobile_status'),
+                result_mobile_ranking=bindparam('b_mobile_ranking'),
+                result_mobile_section=bindparam('b_mobile_section'),
+                result_vertical_section=bindparam('b_vertical_section'),
+                result_vertical_ranking=bindparam('b_vertical_ranking'))
+    )
+    write_keyword = (
+        update(keywords)
+        .where(keywords.c.id == bindparam('b_keyword_id'))
+        .values({col: bindparam(f'b_{col}') for col in RESULT_COLUMNS})
+    )
+
+    completed = set()
+    for i in range(0, len(completions), RESULT_CHUNK):
+        now = utcnow()
+        chunk, finished = {}, {}
+        for task_id, results, *at in completions[i:i + RESULT_CHUNK]:
+            chunk[task_id] = results
+            finished[task_id] = at[0] if at and at[0] is not None else now
+        try:
+            params = [dict(_result_params(task_id, results), b_finished_at=finished[task_id])
+                      for task_id, results in chunk.items()]
+            db.session.execute(finish_task, params)
+            # 이번에 종료 처리된 작업만 (lease 를 잃은 작업 제외)
+            won = {task_id: keyword_id for task_id, keyword_id, finished_at in db.session.execute(
+                select(tasks.c.id, tasks.c.keyword_id, tasks.c.finished_at)
+                .where(tasks.c.id.in_(list(chunk)), tasks.c.lease_owner == owner, tasks.c.status == 'done')
+            ) if finished_at == finished[task_id]}
+            current = db.session.execute(
+                select(keywords.c.id, keywords.c.user_id, *(keywords.c[col] for col in RESULT_INPUT_COLUMNS))
+                .where(keywords.c.id.in_(set(won.values())))
+            ).all()
+            # 같은 키워드가 한 청크에 두 번 오면 (다른 실행의 작업) 완료 순서대로 이어서 반영
+            by_keyword = {row.id: SimpleNamespace(**row._asdict()) for row in current}
+            for task_id, results in chunk.items():
+                kw = by_keyword.get(won.get(task_id))
+                if kw is not None:
+                    kw.__dict__.update(result_values(kw, results, finished[task_id]))
+            if by_keyword:
+                db.session.execute(write_keyword, [
+                    dict({f'b_{col}': getattr(kw, col) for col in RESULT_COLUMNS}, b_keyword_id=kw.id)
+                    for kw in by_keyword.values()
+                ])
+                record_changes(db.session.connection(), [(row, by_keyword[row.id]) for row in current])
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        lost = set(chunk) - set(won)
+        if lost:
+            print(f"[작업큐] 작업 {sorted(lost)} lease 상실 - 결과 폐기")
+        completed |= set(won)
+    return completed
+
+
+def complete_task(task_id, owner, results, finished_at=None):
+    """작업 1개 완료 - complete_tasks 단건 버전"""
+    return task_id in complete_tasks(owner, [(task_id, results, finished_at)])
+
+
+def retry_backoff(retries):
+    """n번째 재시도까지 대기 시간 (초)"""
+    return RETRY_BASE_SECONDS * (2 ** retries)
+
+
+def schedule_retry(task_id, owner, retries):
+    """'확인 실패' 작업을 재시도 패스로 넘김 - 키워드 결과는 최종 결과가 나올 때까지 유지"""
+    ok = db.session.execute(
+        update(CheckTask)
+        .where(CheckTask.id == task_id, CheckTask.lease_owner == owner, CheckTask.status == 'leased')
+        .values(status='retry', retries=retries + 1, error='확인 실패',
+                retry_at=utcnow() + timedelta(seconds=retry_backoff(retries)),
+                lease_owner=None, lease_expires_at=None)
+        .execution_options(synchronize_session=False)
+    ).rowcount == 1
+    db.session.commit()
+    return ok
+
+
+def fail_task(task_id, owner, error):
+    """작업 실패 기록"""
+    ok = _finish(task_id, owner, status='failed', error=str(error)[:1000])
+    db.session.commit()
+    return ok
+
+
+def requeue_owner_tasks(owner, run_id=None):
+    """죽은 워커가 잡고 있던 작업을 즉시 대기열로 되돌림 (lease 만료를 기다리지 않음)"""
+    if not owner:
+        return 0
+    query = update(CheckTask).where(CheckTask.lease_owner == owner, CheckTask.status == 'leased')
+    if run_id is not None:
+        query = query.where(CheckTask.run_id == run_id)
+    count = db.session.execute(
+        query.values(status='queued', lease_owner=None, lease_expires_at=None)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+    return count
+
+
+def completed_keyword_ids(run_id):
+    """실행 장부 - 이미 끝난(done/failed) 키워드 id 집합"""
+    rows = (db.session.query(CheckTask.keyword_id)
+            .filter(CheckTask.run_id == run_id, ~CheckTask.status.in_(OPEN_STATUSES))
+            .all())
+    return {kid for (kid,) in rows}
+
+
+def open_task_count(run_id, user_id=None):
+    """아직 끝나지 않은 작업 수"""
+    query = db.session.query(func.count(CheckTask.id)).filter(
+        CheckTask.run_id == run_id, CheckTask.status.in_(OPEN_STATUSES))
+    if user_id is not None:
+        query = query.filter(CheckTask.user_id == user_id)
+    return query.scalar()
+
+
+def run_progress(run_id):
+    """실행 진행 현황 {status: count}"""
+    rows = (db.session.query(CheckTask.status, func.count(CheckTask.id))
+            .filter(CheckTask.run_id == run_id)
+            .group_by(CheckTask.status).all())
+    return {status: count for status, count in rows}
+
+
+def user_run_progress(user_id):
+    """유저가 포함된 진행 중 실행별 유저 작업 현황 [{run_id, kind, total, completed, progress}]"""
+    runs = dict(db.session.query(CheckRun.id, CheckRun.kind).filter(CheckRun.status == 'running').all())
+    if not runs:
+        return []
+    rows = (db.session.query(CheckTask.run_id, CheckTask.status, func.count(CheckTask.id))
+            .filter(CheckTask.run_id.in_(list(runs)), CheckTask.user_id == user_id)
+            .group_by(CheckTask.run_id, CheckTask.status).all())
+    by_run = {}
+    for run_id, status, count in rows:
+        by_run.setdefault(run_id, {})[status] = count
+    return [{
+        'run_id': run_id,
+        'kind': runs[run_id],
+        'status': 'running',
+        'total': sum(progress.values()),
+        'completed': progress.get('done', 0) + progress.get('failed', 0),
+        'progress': progress,
+    } for run_id, progress in sorted(by_run.items())]
@@ -0,0 +1,227 @@
+# app/worker/runner.py
+# 작업 큐 워커 루프 - 여러 프로세스/서버에서 동시에 실행 가능
+
+import os
+import socket
+import threading
+import time
+import random
+import uuid
+import traceback
+from app.models import db, Keyword
+from app.utils import utcnow
+from app.keyword.engines import check_keyword, any_failed
+from app.keyword.egress import egress_pool
+from app.keyword.progress import progress_bus, result_payload, QUEUED, RUNNING, RESULT, FAILED
+from .queue import (
+    lease_tasks, heartbeat, complete_task, complete_tasks, fail_task, reclaim_expired_leases,
+    defer_past_deadline, schedule_retry, retry_backoff, open_task_count, LEASE_SECONDS, MAX_RETRIES
+)
+from .coordinator import on_task_finished, finalize_user_if_done, finalize_run_if_done, finalize_run
+
+POLL_INTERVAL = int(os.environ.get('CHECK_WORKER_POLL_SECONDS', 10))
+# 결과 일괄 기록 - 이 개수가 모이거나 첫 결과 후 이 시간(초)이 지나면 한 번에 기록 (1 이면 건별 기록)
+RESULT_BATCH = int(os.environ.get('CHECK_RESULT_BATCH', 20))
+RESULT_FLUSH_SECONDS = float(os.environ.get('CHECK_RESULT_FLUSH_SECONDS', 30))
+
+
+def make_worker_id():
+    """워커 식별자 (호스트:PID:난수)"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class LeaseHeartbeat:
+    """처리 중인 작업의 lease를 주기적으로 연장하는 백그라운드 스레드"""
+
+    def __init__(self, app, owner, lease_seconds=LEASE_SECONDS):
+        self.app = app
+        self.owner = owner
+        self.lease_seconds = lease_seconds
+        self.task_ids = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _loop(self):
+        interval = max(self.lease_seconds // 3, 1)
+        while not self._stop.wait(interval):
+            try:
+                with self.app.app_context():
+                    heartbeat(self.owner, list(self.task_ids), self.lease_seconds)
+            except Exception as e:
+                print(f"[워커] heartbeat 실패: {e}")
+
+
+class ResultBuffer:
+    """완료된 체크 결과를 모았다가 complete_tasks 로 일괄 기록한 뒤 코디네이터 처리
+
+    기록 전까지 작업은 lease 상태로 남으므로 (heartbeat 로 연장) 유저 리포트/실행 종료가
+    기록보다 먼저 나가지 않는다.
+    """
+
+    def __init__(self, owner, size=RESULT_BATCH, max_age=RESULT_FLUSH_SECONDS, clock=time.monotonic):
+        self.owner = owner
+        self.size = max(size, 1)
+        self.max_age = max_age
+        self.clock = clock
+        self.items = []  # (task_id, run_id, user_id, keyword_id, results, 체크 끝난 시각)
+        self._since = None
+
+    @property
+    def task_ids(self):
+        return [item[0] for item in self.items]
+
+    def add(self, task_id, run_id, user_id, keyword_id, results, finished_at=None):
+        if not self.items:
+            self._since = self.clock()
+        self.items.append((task_id, run_id, user_id, keyword_id, results, finished_at or utcnow()))
+
+    def due(self):
+        return len(self.items) >= self.size or (
+            bool(self.items) and self.clock() - self._since >= self.max_age)
+
+    def flush(self):
+        """모인 결과 기록 - 기록된 작업 수 반환
+
+        기록에 실패하면 결과를 버린다 (작업은 lease 만료 후 다시 체크됨).
+        """
+        if not self.items:
+            return 0
+        items, self.items = self.items, []
+        try:
+            done = complete_tasks(self.owner, [(task_id, results, finished_at)
+                                               for task_id, _, _, _, results, finished_at in items])
+        except Exception as e:
+            print(f"[워커] 결과 {len(items)}개 일괄 기록 실패 (lease 만료 후 재처리): {e}")
+            traceback.print_exc()
+            return 0
+        for task_id, run_id, user_id, keyword_id, results, _ in items:
+            if task_id in done:
+                _publish_result(run_id, user_id, keyword_id, results)
+        # 유저/실행별로 한 번씩만 마무리 확인
+        users = dict.fromkeys((run_id, user_id) for _, run_id, user_id, *_ in items)
+        for run_id, user_id in users:
+            finalize_user_if_done(run_id, user_id)
+        for run_id in dict.fromkeys(run_id for run_id, _ in users):
+            finalize_run_if_done(run_id)
+        return len(done)
+
+
+def _publish_result(run_id, user_id, keyword_id, results):
+    progress_bus.publish(user_id, RESULT, {'run_id': run_id, 'keyword_id': keyword_id,
+                                           'results': result_payload(results)})
+
+
+def process_task(task, owner, buffer=None):
+    """작업 1개 처리 - 순위 체크 후 결과 기록
+
+    '확인 실패'는 바로 기록하지 않고 재시도 패스로 넘기며, 재시도 한도를 넘기면 그때 기록한다.
+    buffer 가 있으면 결과를 모아 두고 buffer.flush() 때 일괄 기록한다.
+    """
+    task_id, run_id, user_id, keyword_id = task.id, task.run_id, task.user_id, task.keyword_id
+    event = {'run_id': run_id, 'keyword_id': keyword_id}
+    kw = db.session.get(Keyword, keyword_id)
+    if not kw:
+        fail_task(task_id, owner, '키워드가 삭제됨')
+        progress_bus.publish(user_id, FAILED, dict(event, error='키워드가 삭제됨'))
+        on_task_finished(run_id, user_id)
+        return
+
+    try:
+        retries = task.retries or 0
+        progress_bus.publish(user_id, RUNNING, dict(event, keyword_text=kw.keyword_text, retries=retries))
+        # 마지막 재시도는 PC 차단을 피해 모바일 엔진으로 대신 확인
+        results = check_keyword(kw, fresh_session=retries > 0,
+                                mobile_fallback=retries > 0 and retries >= MAX_RETRIES)
+        if any_failed(results) and retries < MAX_RETRIES:
+            # 실행 끝 재시도 패스로 넘김 (새 세션 + 지수 백오프)
+            schedule_retry(task_id, owner, retries)
+            progress_bus.publish(user_id, QUEUED, dict(event, retries=retries + 1))
+            print(f"[워커] '{kw.keyword_text}' 확인 실패 - {retry_backoff(retries)}초 후 재시도 예정")
+            return
+        if buffer is not None:
+            buffer.add(task_id, run_id, user_id, keyword_id, results)
+            return
+        if complete_task(task_id, owner, results):
+            _publish_result(run_id, user_id, keyword_id, results)
+    except Exception as e:
+        db.session.rollback()
+        print(f"[워커] '{kw.keyword_text}' 체크 실패: {e}")
+        traceback.print_exc()
+        fail_task(task_id, owner, e)
+        progress_bus.publish(user_id, FAILED, dict(event, error=str(e)[:200]))
+
+    on_task_finished(run_id, user_id)
+
+
+def run_worker(app, owner=None, run_id=None, batch_size=1, exit_when_idle=False):
+    """작업 큐에서 lease를 잡아 순위 체크 수행
+
+    exit_when_idle=True 이면 잡을 작업이 없을 때 종료 (cron/스케줄러용),
+    아니면 POLL_INTERVAL 간격으로 계속 대기 (상주 워커용).
+    run_id 지정 시 다른 워커가 잡은 작업이 남아 있으면 끝나거나 lease가
+    만료돼 회수될 때까지 기다린다 (죽은 워커의 작업이 실행을 멈춰 세우지 않도록).
+    체크 결과는 RESULT_BATCH 개 / RESULT_FLUSH_SECONDS 초 단위로 모아 일괄 기록한다.
+    """
+    owner = owner or make_worker_id()
+    print(f"[워커] {owner} 시작")
+    beat = LeaseHeartbeat(app, owner).start()
+    buffer = ResultBuffer(owner)
+    processed = 0
+    try:
+        with app.app_context():
+            try:
+                while True:
+                    # 모든 출구가 속도 제한/차단 격리 중이면 lease 없이 대기
+                    pause = egress_pool.wait_time()
+                    if pause > 0:
+                        buffer.flush()
+                        beat.task_ids = []
+                        time.sleep(min(pause, POLL_INTERVAL))
+                        continue
+
+                    # 재시도 한도를 넘겨 실패 처리된 작업이 유저/실행의 마지막 작업일 수 있음
+                    reclaimed = reclaim_expired_leases()
+                    for failed_run_id, failed_user_id in reclaimed:
+                        finalize_user_if_done(failed_run_id, failed_user_id)
+                    for failed_run_id in dict.fromkeys(r for r, _ in reclaimed):
+                        finalize_run_if_done(failed_run_id)
+                    for deferred_run_id in defer_past_deadline():
+                        finalize_run(deferred_run_id)
+                    tasks = lease_tasks(owner, limit=batch_size, run_id=run_id)
+                    if not tasks:
+                        # 모아 둔 결과를 먼저 기록해야 남은 작업 수가 맞음
+                        buffer.flush()
+                        beat.task_ids = []
+                        if exit_when_idle and (run_id is None or not open_task_count(run_id)):
+                            break
+                        time.sleep(POLL_INTERVAL)
+                        continue
+
+                    pending = [t.id for t in tasks]
+                    beat.task_ids = buffer.task_ids + pending
+                    for task in tasks:
+                        process_task(task, owner, buffer)
+                        pending.remove(task.id)
+                        if buffer.due():
+                            buffer.flush()
+                        beat.task_ids = buffer.task_ids + pending
+                        processed += 1
+
+                        # 네이버 차단 방지 딜레이 (차단률이 오르면 늘어남)
+                        time.sleep(random.uniform(3, 6) * egress_pool.delay_multiplier())
+            finally:
+                buffer.flush()
+    finally:
+        beat.stop()
+        print(f"[워커] {owner} 종료 - {processed}개 처리")
+    return processed
@@ -0,0 +1,344 @@
+# bench/load_test.py
+# API 부하 테스트 - 가상 테넌트(유저+키워드)를 심고 대시보드 API를 동시 접속으로 호출
+#
+# 예) python bench/load_test.py                                  (임시 SQLite, 5테넌트 x 2000키워드, 동시 20)
+#     python bench/load_test.py --concurrency 50 --duration 60
+#     python bench/load_test.py --database-url postgresql://... --tenants 20 --json load_result.json
+#
+# 순위 체크(check_keyword)와 스프레드시트/텔레그램 호출은 가짜로 바꿔 외부 요청 없이 돈다
+# (--check-latency 로 체크 1건 소요 시간을 흉내). 앱은 같은 프로세스의 멀티스레드 WSGI 서버로 띄우고
+# 실제 HTTP로 호출하므로 라우팅/인증/직렬화/DB 시간이 모두 포함된다.
+# 성능 작업 전후로 같은 옵션으로 돌려 엔드포인트별 p50/p95/p99, 처리량을 비교한다.
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+# 외부 호출이 새지 않도록 앱 임포트 전에 비움
+for _name in ('TELEGRAM_BOT_TOKEN', 'TELEGRAM_CHAT_ID', 'GOOGLE_CREDENTIALS_JSON', 'PROFILE_MODE'):
+    os.environ.pop(_name, None)
+
+PASSWORD = 'loadtest-password'
+POST_HOSTS = ('https://blog.naver.com', 'https://cafe.naver.com')
+STATUSES = (('윗탭', '인기글'), ('아랫탭', '블로그'), ('노출X', None))
+
+# 엔드포인트별 가중치 (가상 사용자가 다음에 호출할 API를 이 비율로 고름)
+DEFAULT_MIX = 'list=6,summary=3,check=2,upload=1,login=1'
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[idx]
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        mix[name.strip()] = float(weight or 1)
+    unknown = set(mix) - set(ENDPOINTS)
+    if unknown:
+        raise SystemExit(f"알 수 없는 엔드포인트: {', '.join(sorted(unknown))} (가능: {', '.join(ENDPOINTS)})")
+    return mix
+
+
+# --- 가짜 외부 호출 ---
+def install_stubs(check_latency):
+    """순위 체크/시트/텔레그램을 가짜로 교체 (라우트 모듈이 이름으로 가져간 참조까지)"""
+    import app.keyword.routes as keyword_routes
+    import app.notification.routes as notification_routes
+    import app.notification.telegram as telegram
+    import app.spreadsheet.sync as sheet_sync
+    from app.keyword.engines import engines_for
+
+    def fake_check_keyword(kw, fresh_session=False, mobile_fallback=False):
+        time.sleep(random.uniform(0.5, 1.5) * check_latency)
+        results = {}
+        for engine in engines_for(kw.engine):
+            status, section = random.choice(STATUSES)
+            rank = random.randint(1, 10) if section else 999
+            results[engine] = (status, rank, section)
+        return results
+
+    def fake_sync(keywords_data, user_email=None, history=None):
+        return True
+
+    def fake_send(text, chat_id=None, bot_token=None):
+        return True
+
+    keyword_routes.check_keyword = fake_check_keyword
+    keyword_routes.sync_to_spreadsheet = fake_sync
+    sheet_sync.sync_to_spreadsheet = fake_sync
+    telegram.send_telegram_message = fake_send
+    notification_routes.send_telegram_message = fake_send
+
+
+# --- 데이터 준비 ---
+def seed(app, tenants, keywords_per_tenant):
+    """가상 테넌트 심기 - 반환: [(user_id, email, [keyword_id, ...]), ...]"""
+    from werkzeug.security import generate_password_hash
+    from sqlalchemy import insert, select
+    from app.models import db, User, Keyword
+
+    # 해시는 한 번만 계산 (pbkdf2 가 느려 수천 건 심기에 부담)
+    hashed = generate_password_hash(PASSWORD, method='pbkdf2:sha256')
+    stamp = int(time.time())
+    out = []
+    with app.app_context():
+        db.create_all()
+        for t in range(tenants):
+            email = f"loadtest-{stamp}-{t}@example.com"
+            user = User(email=email, password=hashed)
+            db.session.add(user)
+            db.session.flush()
+            rows = [{
+                'user_id': user.id,
+                'keyword_text': f"부하테스트 키워드 {t}-{i}",
+                'post_url': f"{random.choice(POST_HOSTS)}/loadtest{t}/{223000000000 + i}",
+                'post_title': f"부하테스트 게시물 제목 {t}-{i}",
+                'priority': random.choice(('상', '중', '하')),
+                'engine': random.choice(('pc', 'pc', 'mobile', 'both')),
+                'ranking_status': '확인 대기',
+                'rank_volatility': 0.0,
+                'deep_check': False,
+            } for i in range(keywords_per_tenant)]
+            if rows:
+                db.session.execute(insert(Keyword), rows)
+            db.session.commit()
+            ids = db.session.scalars(select(Keyword.id).where(Keyword.user_id == user.id)).all()
+            out.append((user.id, email, list(ids)))
+    return out
+
+
+def cleanup(app, tenants):
+    from app.models import db, User, Keyword, KeywordStat
+    with app.app_context():
+        user_ids = [user_id for user_id, _, _ in tenants]
+        # 일괄 삭제는 flush 훅을 거치지 않으므로 요약 집계도 직접 지움 (user 외래 키)
+        KeywordStat.query.filter(KeywordStat.user_id.in_(user_ids)).delete(synchronize_session=False)
+        Keyword.query.filter(Keyword.user_id.in_(user_ids)).delete(synchronize_session=False)
+        User.query.filter(User.id.in_(user_ids)).delete(synchronize_session=False)
+        db.session.commit()
+
+
+# --- 엔드포인트 호출 ---
+class VirtualUser:
+    def __init__(self, base_url, tenant, upload_rows):
+        self.base_url = base_url
+        self.user_id, self.email, self.keyword_ids = tenant
+        self.upload_rows = upload_rows
+        self.http = requests.Session()
+        self.token = None
+
+    def _auth(self):
+        return {'Authorization': f'Bearer {self.token}'}
+
+    def login(self):
+        resp = self.http.post(f'{self.base_url}/auth/login', json={'email': self.email, 'password': PASSWORD})
+        if resp.ok:
+            self.token = resp.json()['token']
+        return resp
+
+    def list(self):
+        return self.http.get(f'{self.base_url}/keyword/keywords', headers=self._auth())
+
+    def summary(self):
+        return self.http.get(f'{self.base_url}/keyword/summary', headers=self._auth())
+
+    def check(self):
+        keyword_id = random.choice(self.keyword_ids)
+        return self.http.post(f'{self.base_url}/keyword/keywords/{keyword_id}/check', headers=self._auth())
+
+    def upload(self):
+        lines = ['키워드,URL,제목,중요도,엔진']
+        for i in range(self.upload_rows):
+            n = random.randint(0, 10 ** 9)
+            lines.append(f"업로드 키워드 {n},https://blog.naver.com/upload/{n},업로드 게시물 {n},중,pc")
+        files = {'file': ('keywords.csv', '\n'.join(lines).encode('utf-8'), 'text/csv')}
+        return self.http.post(f'{self.base_url}/keyword/keywords/upload', headers=self._auth(), files=files)
+
+
+ENDPOINTS = {
+    'login': ('POST /auth/login', VirtualUser.login),
+    'list': ('GET /keyword/keywords', VirtualUser.list),
+    'summary': ('GET /keyword/summary', VirtualUser.summary),
+    'check': ('POST /keyword/keywords/<id>/check', VirtualUser.check),
+    'upload': ('POST /keyword/keywords/upload', VirtualUser.upload),
+}
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    def record(self, name, seconds, status):
+        with self.lock:
+            self.latencies[name].append(seconds)
+            self.statuses[name][status] += 1
+            if not (200 <= status < 300):
+                self.errors[name] += 1
+
+
+def _call(recorder, user, name):
+    method = ENDPOINTS[name][1]
+    started = time.perf_counter()
+    try:
+        status = method(user).status_code
+    except requests.RequestException:
+        status = 0
+    recorder.record(name, time.perf_counter() - started, status)
+    return status
+
+
+def run_user(base_url, tenant, mix, deadline, max_requests, counter, recorder, upload_rows):
+    """가상 사용자 1명 - 로그인 후 deadline 까지 가중치대로 엔드포인트 호출"""
+    user = VirtualUser(base_url, tenant, upload_rows)
+    if _call(recorder, user, 'login') != 200:
+        return
+    names, weights = zip(*mix.items())
+    while time.monotonic() < deadline:
+        with counter['lock']:
+            if max_requests and counter['n'] >= max_requests:
+                return
+            counter['n'] += 1
+        _call(recorder, user, random.choices(names, weights)[0])
+
+
+# --- 실행 ---
+def start_server(app, host='127.0.0.1', port=0):
+    from werkzeug.serving import make_server
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server(host, port, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f'http://{host}:{server.server_port}'
+
+
+def build_report(recorder, elapsed):
+    report = []
+    for name, (label, _) in ENDPOINTS.items():
+        values = recorder.latencies.get(name)
+        if not values:
+            continue
+        report.append({
+            'endpoint': label,
+            'requests': len(values),
+            'errors': recorder.errors.get(name, 0),
+            'statuses': dict(recorder.statuses[name]),
+            'rps': len(values) / elapsed if elapsed else 0.0,
+            'p50_ms': _percentile(values, 50) * 1000,
+            'p95_ms': _percentile(values, 95) * 1000,
+            'p99_ms': _percentile(values, 99) * 1000,
+            'max_ms': max(values) * 1000,
+        })
+    return report
+
+
+def print_report(report, elapsed, options):
+    total = sum(r['requests'] for r in report)
+    print(f"\n=== 부하 테스트 {elapsed:.1f}초, 동시 {options.concurrency}, "
+          f"테넌트 {options.tenants} x 키워드 {options.keywords}, 총 {total}요청 ({total / elapsed:.1f}/초) ===")
+    print(f"{'엔드포인트':<34}{'요청':>7}{'오류':>6}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for r in report:
+        print(f"{r['endpoint']:<34}{r['requests']:>7}{r['errors']:>6}{r['rps']:>8.1f}"
+              f"{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['max_ms']:>9.1f}")
+    for r in report:
+        bad = {s: n for s, n in r['statuses'].items() if not (200 <= s < 300)}
+        if bad:
+            print(f"  {r['endpoint']} 오류 응답: {bad}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='API 부하 테스트 (가짜 스크래퍼/외부 호출)')
+    parser.add_argument('--database-url', help='기본: 임시 SQLite 파일')
+    parser.add_argument('--tenants', type=int, default=5, help='가상 테넌트(유저) 수')
+    parser.add_argument('--keywords', type=int, default=2000, help='테넌트당 키워드 수')
+    parser.add_argument('--concurrency', type=int, default=20, help='동시 가상 사용자 수')
+    parser.add_argument('--duration', type=float, default=30, help='실행 시간 (초)')
+    parser.add_argument('--requests', type=int, default=0, help='총 요청 수 제한 (0 = 시간 기준)')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f'엔드포인트 가중치 (기본 {DEFAULT_MIX})')
+    parser.add_argument('--check-latency', type=float, default=0.05, help='가짜 순위 체크 1건 평균 소요 시간 (초)')
+    parser.add_argument('--upload-rows', type=int, default=20, help='업로드 1회당 행 수')
+    parser.add_argument('--keep-data', action='store_true', help='끝나고 심은 데이터를 지우지 않음')
+    parser.add_argument('--verbose', action='store_true', help='앱 로그 출력')
+    parser.add_argument('--json', help='결과를 JSON 파일로 저장')
+    options = parser.parse_args()
+    mix = parse_mix(options.mix)
+
+    from config import Config, engine_options
+    from app import create_app
+
+    tmp_dir = None
+    database_url = options.database_url
+    if not database_url:
+        tmp_dir = tempfile.mkdtemp(prefix='loadtest-')
+        database_url = f"sqlite:///{os.path.join(tmp_dir, 'loadtest.db')}"
+
+    class LoadTestConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url
+        SQLALCHEMY_ENGINE_OPTIONS = engine_options(database_url)
+
+    app = create_app(LoadTestConfig)
+    install_stubs(options.check_latency)
+
+    print(f"[부하 테스트] 데이터 준비 중... ({database_url.split('@')[-1]})")
+    started = time.perf_counter()
+    tenants = seed(app, options.tenants, options.keywords)
+    print(f"[부하 테스트] 테넌트 {len(tenants)}개 / 키워드 {options.tenants * options.keywords}개 "
+          f"({time.perf_counter() - started:.1f}초)")
+
+    server, base_url = start_server(app)
+    counter = {'lock': threading.Lock(), 'n': 0}
+    recorder = Recorder()
+    quiet = contextlib.nullcontext() if options.verbose else contextlib.redirect_stdout(io.StringIO())
+    try:
+        started = time.perf_counter()
+        deadline = time.monotonic() + options.duration
+        with quiet, ThreadPoolExecutor(max_workers=options.concurrency) as pool:
+            futures = [pool.submit(run_user, base_url, tenants[i % len(tenants)], mix, deadline,
+                                   options.requests, counter, recorder, options.upload_rows)
+                       for i in range(options.concurrency)]
+            for future in futures:
+                future.result()
+        elapsed = time.perf_counter() - started
+    finally:
+        server.shutdown()
+        if not options.keep_data and not tmp_dir:
+            cleanup(app, tenants)
+
+    report = build_report(recorder, elapsed)
+    print_report(report, elapsed, options)
+    if options.json:
+        with open(options.json, 'w', encoding='utf-8') as f:
+            json.dump({'options': vars(options), 'elapsed': elapsed, 'endpoints': report},
+                      f, ensure_ascii=False, indent=2)
+    if tmp_dir and not options.keep_data:
+        import shutil
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
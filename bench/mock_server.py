@@ -0,0 +1,97 @@
+# bench/mock_server.py
+# 녹화된 SERP HTML을 돌려주는 로컬 목 서버 - 실제 네이버 없이 스크래퍼 실행
+#
+# 경로: /pc/search.naver (통합검색/탭), /m/search.naver (모바일)
+# 페이지 키: 통합검색은 "", 탭은 "<where>:<start>" (corpus.json 의 pages)
+# 단독 실행: python bench/mock_server.py --port 8808
+
+import argparse
+import json
+import os
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(BENCH_DIR, 'fixtures')
+CORPUS_PATH = os.path.join(BENCH_DIR, 'corpus.json')
+
+# corpus engine -> 목 서버 경로
+ENGINE_PREFIX = {'pc': 'pc', 'vertical': 'pc', 'mobile': 'm'}
+
+
+def load_corpus(path=CORPUS_PATH):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def build_routes(corpus):
+    """(경로, 검색어, 페이지 키) -> 픽스처 HTML"""
+    routes = {}
+    for case in corpus:
+        prefix = ENGINE_PREFIX[case['engine']]
+        for page_key, fixture in case['pages'].items():
+            with open(os.path.join(FIXTURE_DIR, fixture), encoding='utf-8') as f:
+                routes[(prefix, case['keyword'], page_key)] = f.read().encode('utf-8')
+    return routes
+
+
+class MockSerpServer:
+    """백그라운드 스레드에서 도는 목 서버"""
+
+    def __init__(self, corpus, host='127.0.0.1', port=0):
+        routes = build_routes(corpus)
+        self.hits = 0
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parsed = urllib.parse.urlparse(self.path)
+                prefix = parsed.path.strip('/').split('/')[0]
+                qs = urllib.parse.parse_qs(parsed.query)
+                query = qs.get('query', [''])[0]
+                where = qs.get('where', [''])[0]
+                page_key = f"{where}:{qs.get('start', ['1'])[0]}" if where else ''
+                body = routes.get((prefix, query, page_key))
+                server.hits += 1
+                if body is None:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='SERP 목 서버')
+    parser.add_argument('--port', type=int, default=8808)
+    args = parser.parse_args()
+    server = MockSerpServer(load_corpus(), port=args.port)
+    print(f"목 서버: {server.base_url}")
+    print(f"NAVER_SEARCH_BASE_URL={server.base_url}/pc NAVER_MOBILE_SEARCH_BASE_URL={server.base_url}/m")
+    server.httpd.serve_forever()
@@ -0,0 +1,184 @@
+# bench/run_bench.py
+# 오프라인 스크래퍼 벤치마크 - 녹화된 SERP를 로컬 목 서버로 돌려 성능/순위 결과 확인
+#
+# 예) python bench/run_bench.py                       (전체 엔진, 브라우저 프로필 default/lite)
+#     python bench/run_bench.py --engines mobile,vertical --repeat 20
+#     python bench/run_bench.py --skip-sleeps --json bench_result.json
+#
+# 엔진/브라우저 프로필 조합마다 별도 프로세스로 실행해 최대 RSS를 따로 잰다.
+# 기대 순위와 다른 결과가 하나라도 있으면 종료 코드 1 (속도 개선이 결과를 바꾸지 않았는지 확인용).
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from mock_server import MockSerpServer, load_corpus  # noqa: E402
+
+ENGINES = ('pc', 'mobile', 'vertical')
+# 벤치마크 중에는 출구 속도 제한을 사실상 끔 (목 서버 상대)
+BENCH_ENV = {
+    'SCRAPER_PROXIES': 'direct',
+    'SCRAPER_EGRESS_RATE_PER_MINUTE': '1000000',
+    'SCRAPER_EGRESS_BURST': '1000',
+    'VERTICAL_PAGE_SIZE': '10',
+    'VERTICAL_MAX_PAGES': '3',
+    'PROFILE_MODE': '',
+}
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[idx]
+
+
+def _phase_totals():
+    """지표 레지스트리의 단계별 (합계, 횟수)"""
+    from prometheus_client import REGISTRY
+    totals = {}
+    for metric in REGISTRY.collect():
+        if metric.name != 'keyword_check_phase_seconds':
+            continue
+        for sample in metric.samples:
+            name = sample.labels.get('phase')
+            if sample.name.endswith('_sum'):
+                totals.setdefault(name, [0.0, 0.0])[0] = sample.value
+            elif sample.name.endswith('_count'):
+                totals.setdefault(name, [0.0, 0.0])[1] = sample.value
+    return totals
+
+
+def run_group(engine, profile, repeat, skip_sleeps):
+    """엔진/프로필 조합 1개 실행 (하위 프로세스) - 결과 dict 반환"""
+    from app.keyword import scraper
+    from app.keyword.mobile import run_mobile_check
+    from app.keyword.vertical import run_vertical_check
+
+    if profile != '-':
+        scraper.BROWSER_PROFILE = profile
+    if skip_sleeps:
+        # 사람처럼 보이기 위한 대기만 제거 (스크롤 후 lazy-load 대기 포함)
+        scraper.human_sleep = lambda *a, **k: None
+        scraper.time = type('NoSleep', (), {'sleep': staticmethod(lambda s: None),
+                                            'perf_counter': staticmethod(time.perf_counter)})
+
+    checks = {
+        'pc': lambda c: scraper.run_check(c['keyword'], c['post_url'], c['post_title']),
+        'mobile': lambda c: run_mobile_check(c['keyword'], c['post_url'], c['post_title']),
+        'vertical': lambda c: run_vertical_check(c['keyword'], c['post_url'], c['post_title']),
+    }
+    cases = [c for c in load_corpus() if c['engine'] == engine]
+    before = _phase_totals()
+    durations, mismatches = [], []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for case in cases:
+            t = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = checks[engine](case)
+            durations.append(time.perf_counter() - t)
+            got = list(result) if result is not None else None
+            if got != case['expect']:
+                mismatches.append({'id': case['id'], 'expect': case['expect'], 'got': got})
+    elapsed = time.perf_counter() - started
+
+    after = _phase_totals()
+    phases = {}
+    for name, (total, count) in after.items():
+        prev_total, prev_count = before.get(name, (0.0, 0.0))
+        if count > prev_count:
+            phases[name] = (total - prev_total) / (count - prev_count)
+
+    return {
+        'engine': engine,
+        'profile': profile,
+        'checks': len(durations),
+        'checks_per_sec': len(durations) / elapsed if elapsed else 0.0,
+        'p50': _percentile(durations, 50),
+        'p95': _percentile(durations, 95),
+        'mean': statistics.mean(durations) if durations else 0.0,
+        'phases': phases,
+        # Linux 기준 KB - 브라우저(chromedriver/Chrome)는 자식 프로세스
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'peak_child_rss_kb': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+        'mismatches': mismatches,
+    }
+
+
+def _print_report(results):
+    print(f"\n{'엔진':<9}{'프로필':<9}{'체크':>6}{'체크/초':>9}{'p50':>8}{'p95':>8}{'RSS MB':>9}{'자식 MB':>9}  불일치")
+    for r in results:
+        print(f"{r['engine']:<9}{r['profile']:<9}{r['checks']:>6}{r['checks_per_sec']:>9.2f}"
+              f"{r['p50']:>8.3f}{r['p95']:>8.3f}{r['peak_rss_kb'] / 1024:>9.1f}{r['peak_child_rss_kb'] / 1024:>9.1f}"
+              f"  {len(r['mismatches'])}")
+    for r in results:
+        if r['phases']:
+            print(f"\n[{r['engine']}/{r['profile']}] 단계별 평균 (초)")
+            for name, mean in sorted(r['phases'].items(), key=lambda x: -x[1]):
+                print(f"  {name:<16}{mean:>8.3f}")
+        for m in r['mismatches'][:10]:
+            print(f"  ✗ {m['id']}: 기대 {m['expect']} / 결과 {m['got']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='오프라인 스크래퍼 벤치마크')
+    parser.add_argument('--engines', default=','.join(ENGINES), help='pc,mobile,vertical')
+    parser.add_argument('--profiles', default='default,lite', help='pc 엔진 브라우저 프로필')
+    parser.add_argument('--repeat', type=int, default=3, help='케이스당 반복 횟수')
+    parser.add_argument('--skip-sleeps', action='store_true', help='사람 흉내 대기 제거')
+    parser.add_argument('--json', help='결과를 JSON 파일로 저장')
+    parser.add_argument('--group', nargs=2, metavar=('ENGINE', 'PROFILE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.group:
+        result = run_group(args.group[0], args.group[1], args.repeat, args.skip_sleeps)
+        print(json.dumps(result, ensure_ascii=False))
+        return 0
+
+    server = MockSerpServer(load_corpus()).start()
+    env = dict(os.environ, **BENCH_ENV,
+               NAVER_SEARCH_BASE_URL=f"{server.base_url}/pc",
+               NAVER_MOBILE_SEARCH_BASE_URL=f"{server.base_url}/m")
+    results = []
+    try:
+        for engine in [e.strip() for e in args.engines.split(',') if e.strip()]:
+            profiles = [p.strip() for p in args.profiles.split(',')] if engine == 'pc' else ['-']
+            for profile in profiles:
+                cmd = [sys.executable, os.path.abspath(__file__), '--group', engine, profile,
+                       '--repeat', str(args.repeat)] + (['--skip-sleeps'] if args.skip_sleeps else [])
+                proc = subprocess.run(cmd, env=env, capture_output=True, text=True)
+                lines = proc.stdout.strip().splitlines()
+                if proc.returncode != 0 or not lines:
+                    print(f"[벤치마크] {engine}/{profile} 실패\n{proc.stderr[-2000:]}")
+                    results.append({'engine': engine, 'profile': profile, 'checks': 0, 'checks_per_sec': 0,
+                                    'p50': 0, 'p95': 0, 'mean': 0, 'phases': {}, 'peak_rss_kb': 0,
+                                    'peak_child_rss_kb': 0, 'mismatches': [{'id': '*', 'expect': None,
+                                                                            'got': 'crashed'}]})
+                    continue
+                results.append(json.loads(lines[-1]))
+    finally:
+        server.stop()
+
+    _print_report(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 1 if any(r['mismatches'] for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
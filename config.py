@@ -1,6 +1,57 @@
 # config.py
 import os
 
+
+def _int_env(name, default):
+    return int(os.environ.get(name, default))
+
+
+def engine_options(database_url):
+    """DB 종류별 SQLAlchemy 엔진 설정 (SQLALCHEMY_ENGINE_OPTIONS)
+
+    PostgreSQL: 커넥션 풀 크기/재활용, 끊긴 연결 사전 확인(pre-ping), 쿼리 시간 제한
+    SQLite: 여러 스레드(스케줄러 워커 + API) 공유 - PRAGMA 는 create_app 에서 연결마다 적용
+    """
+    if database_url.startswith('postgresql'):
+        options = {
+            'pool_size': _int_env('DB_POOL_SIZE', 5),
+            'max_overflow': _int_env('DB_MAX_OVERFLOW', 10),
+            'pool_recycle': _int_env('DB_POOL_RECYCLE', 1800),
+            'pool_timeout': _int_env('DB_POOL_TIMEOUT', 30),
+            'pool_pre_ping': True,
+        }
+        # 서버 쪽 제한 (밀리초, 0 이면 제한 없음) - 막힌 쿼리가 커넥션을 붙잡고 있지 않게
+        timeouts = {
+            'statement_timeout': _int_env('DB_STATEMENT_TIMEOUT_MS', 30000),
+            'lock_timeout': _int_env('DB_LOCK_TIMEOUT_MS', 10000),
+            # 기본 0 - 단건 체크/워커/시트 동기화는 트랜잭션을 연 채 Selenium/외부 API 를 기다리고,
+            # 내보내기 스트림은 느린 클라이언트가 읽는 동안 트랜잭션이 열려 있으므로
+            'idle_in_transaction_session_timeout': _int_env('DB_IDLE_IN_TRANSACTION_TIMEOUT_MS', 0),
+        }
+        pg_options = ' '.join(f'-c {name}={value}' for name, value in timeouts.items() if value > 0)
+        if pg_options:
+            options['connect_args'] = {'options': pg_options}
+        return options
+    if database_url.startswith('sqlite'):
+        return {
+            'connect_args': {
+                'check_same_thread': False,
+                # 쓰기 잠금 대기 (초) - busy_timeout PRAGMA 와 같은 역할
+                'timeout': _int_env('SQLITE_BUSY_TIMEOUT_MS', 5000) / 1000,
+            },
+        }
+    return {}
+
+
+def sqlite_pragmas():
+    """SQLite 연결마다 실행할 PRAGMA - WAL 이면 체크 쓰기 중에도 대시보드 읽기가 막히지 않음"""
+    return {
+        'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+        'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'busy_timeout': _int_env('SQLITE_BUSY_TIMEOUT_MS', 5000),
+    }
+
+
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'super-secret-key-fallback'
     
@@ -12,4 +63,7 @@ class Config:
         database_url = database_url.replace('postgres://', 'postgresql://', 1)
     
     SQLALCHEMY_DATABASE_URI = database_url
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # DB 종류(URL)에 맞는 엔진 설정 자동 선택
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(database_url)
+    SQLITE_PRAGMAS = sqlite_pragmas()
@@ -1,10 +1,14 @@
 # cron_job.py
 # Render Cron Job에서 실행하는 독립 스크립트
 # 매일 아침 순위 체크 + 텔레그램 알림
+# 앱 서버의 스케줄러와 겹쳐도 DB 리더 lease로 한 번만 실행됨
+# 중간에 재시작되면 같은 회차의 남은 키워드부터 이어서 처리
+# CHECK_ENQUEUE_ONLY=1 이면 작업 등록만 하고 처리는 worker.py 들에 맡김
 
+import os
 from app import create_app, db
-from app.scheduler import check_all_keywords_and_notify
+from app.scheduler import run_scheduled_check
 
 app = create_app()
-check_all_keywords_and_notify(app)
+run_scheduled_check(app, enqueue_only=bool(os.environ.get('CHECK_ENQUEUE_ONLY')), wait=True)
 print("Cron job 완료")
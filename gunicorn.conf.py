@@ -0,0 +1,34 @@
+# gunicorn.conf.py
+# 워커 설정 + 워커가 여러 개일 때 Prometheus 지표(/metrics)를 합산하기 위한 설정
+# PROMETHEUS_MULTIPROC_DIR 는 .env 가 아니라 프로세스 환경변수로 지정해야 함 (워커 import 전에 필요)
+
+import os
+import shutil
+
+# 진행 스트림(GET /keyword/events, SSE)은 연결 동안 요청 스레드 1개를 계속 점유하므로 스레드 워커 사용
+# (기본 sync 워커 1개면 대시보드 하나가 다른 요청을 모두 막고, timeout 에 걸려 스케줄러째 죽음)
+_stream_clients = int(os.environ.get('PROGRESS_MAX_CLIENTS', 3))
+_stream_seconds = int(os.environ.get('PROGRESS_MAX_SECONDS', 300))
+
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+worker_class = 'gthread'
+# 대시보드를 동시에 여는 유저 수 x 유저당 스트림 수 + 일반 요청용
+threads = int(os.environ.get('GUNICORN_THREADS')
+              or int(os.environ.get('GUNICORN_STREAM_USERS', 4)) * _stream_clients + 4)
+# 스트림 최대 유지 시간보다 길게
+timeout = max(int(os.environ.get('GUNICORN_TIMEOUT', 30)), _stream_seconds + 30)
+
+
+def on_starting(server):
+    """이전 실행의 지표 파일 정리"""
+    path = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    """종료된 워커의 지표 파일 정리"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,16 @@
+# profile_report.py
+# 프로파일 덤프(PROFILE_DIR) 보고서 - 가장 오래 걸린 함수 순위
+# 예) python profile_report.py --top 40
+#     python profile_report.py --sort tottime profiles/20261019-230512_run_check_*.prof
+
+import argparse
+from app.profiling import report, PROFILE_DIR
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='프로파일 덤프 보고서')
+    parser.add_argument('files', nargs='*', help='덤프 파일 (생략 시 --dir 전체)')
+    parser.add_argument('--dir', default=PROFILE_DIR, help='덤프 디렉터리')
+    parser.add_argument('--top', type=int, default=30, help='표시할 함수 수')
+    parser.add_argument('--sort', default='cumulative', help='cProfile 정렬 기준 (cumulative / tottime / ncalls)')
+    args = parser.parse_args()
+    report(args.dir, top=args.top, files=args.files, sort=args.sort)
@@ -8,20 +8,39 @@ with app.app_context():
     db.create_all()
 
 # APScheduler 설정 (매일 아침 8시 한국시간 = UTC 23시 전날)
+# gunicorn 워커마다 등록되지만 DB 리더 lease로 회차당 한 프로세스만 실행됨
 def start_scheduler():
     try:
         from apscheduler.schedulers.background import BackgroundScheduler
-        from app.scheduler import check_all_keywords_and_notify
+        from app.scheduler import run_scheduled_check, run_due_check
+        from app.worker.leader import LOCK_TTL_SECONDS, DUE_INTERVAL_HOURS
 
         scheduler = BackgroundScheduler()
         scheduler.add_job(
-            func=lambda: check_all_keywords_and_notify(app),
+            func=lambda: run_scheduled_check(app),
             trigger='cron',
             hour=23,  # UTC 23시 = KST 08시
             minute=0,
             id='daily_ranking_check',
             replace_existing=True
         )
+        # 체크 주기가 돌아온 키워드('상'/변동 큰 키워드)만 중간에 추가 체크
+        scheduler.add_job(
+            func=lambda: run_due_check(app),
+            trigger='cron',
+            hour=f'*/{DUE_INTERVAL_HOURS}',
+            minute=30,
+            id='due_ranking_check',
+            replace_existing=True
+        )
+        # 실행 중이던 리더가 죽으면 다른 프로세스가 회차를 인계
+        scheduler.add_job(
+            func=lambda: run_scheduled_check(app, takeover_only=True),
+            trigger='interval',
+            seconds=LOCK_TTL_SECONDS,
+            id='daily_ranking_check_failover',
+            replace_existing=True
+        )
         scheduler.start()
         print("✅ 스케줄러 시작됨 - 매일 KST 08:00 순위 체크")
     except ImportError:
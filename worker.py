@@ -0,0 +1,12 @@
+# worker.py
+# 순위 체크 작업 큐 워커 - 서버/프로세스 수만큼 띄워 처리량 확장
+# 예) python worker.py  (여러 개 실행 가능)
+
+import os
+from app import create_app
+from app.worker.runner import run_worker
+
+app = create_app()
+
+if __name__ == '__main__':
+    run_worker(app, batch_size=int(os.environ.get('CHECK_WORKER_BATCH', 1)))